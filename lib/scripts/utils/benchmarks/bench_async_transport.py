@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: serial smtplib sends vs AsyncSMTPTransport against a local SMTP sink.
+
+The serial path mirrors QuikAppEmailNotifier._send_email (one connection, login and QUIT per
+message). STARTTLS is skipped on both paths because the sink speaks plain SMTP.
+
+Usage:
+    bench_async_transport.py [--messages 200] [--sessions 1,4,8,16] [--latency 0.005] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import smtplib
+import argparse
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quikapp_notify.smtp_sink import SMTPSink
+from quikapp_notify.async_transport import AsyncSMTPTransport, render_messages
+from quikapp_notify.send_email import QuikAppEmailNotifier
+
+
+def build_messages(count):
+    """Render realistic build_success messages"""
+    env = dict(os.environ, EMAIL_SMTP_USER="bench@quikapp.co", EMAIL_SMTP_PASS="bench",
+               EMAIL_ID="client@example.com")
+    jobs = []
+    for i in range(count):
+        notifier = QuikAppEmailNotifier(env=dict(env, APP_NAME=f"White Label App {i}"))
+        jobs.append((notifier, "build_success", "android", f"build-{i}", ""))
+    return render_messages(jobs)
+
+
+def run_serial(port, messages):
+    for msg, from_addr, to_addrs in messages:
+        with smtplib.SMTP("127.0.0.1", port) as server:
+            server.login("bench@quikapp.co", "bench")
+            server.sendmail(from_addr, to_addrs, msg.as_string())
+
+
+def run_async(port, messages, sessions):
+    transport = AsyncSMTPTransport("127.0.0.1", port, "bench@quikapp.co", "bench",
+                                   sessions=sessions, starttls=False)
+    results = transport.send_messages(messages)
+    failed = [r for r in results if not r['ok']]
+    if failed:
+        raise RuntimeError(f"{len(failed)} messages failed: {failed[0]['error']}")
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--sessions", default="1,4,8,16")
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated relay delay per reply (s)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    messages = build_messages(args.messages)
+    sink = SMTPSink(latency=args.latency)
+    port = sink.start_in_thread()
+
+    rows = [{"path": "serial smtplib", "sessions": 1, "seconds": timed(run_serial, port, messages)}]
+    for sessions in (int(s) for s in args.sessions.split(",")):
+        rows.append({"path": "async transport", "sessions": sessions,
+                     "seconds": timed(run_async, port, messages, sessions)})
+    sink.stop()
+
+    for row in rows:
+        row["messages_per_second"] = round(args.messages / row["seconds"], 1)
+        row["seconds"] = round(row["seconds"], 3)
+
+    if args.json:
+        print(json.dumps({"messages": args.messages, "latency": args.latency, "results": rows}, indent=2))
+        return 0
+
+    print(f"{args.messages} messages, {args.latency * 1000:.1f} ms simulated relay latency")
+    print(f"{'path':<18}{'sessions':>9}{'seconds':>10}{'msg/s':>10}")
+    for row in rows:
+        print(f"{row['path']:<18}{row['sessions']:>9}{row['seconds']:>10.3f}{row['messages_per_second']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for quikapp_notify: interpreter wall time and -X importtime import cost
+of send_email, run the ways a CI runner can run it.
+
+    package, cold    fresh copy of the package without __pycache__ (first call on a new runner)
+    package, warm    same copy with the bytecode the cold run wrote
+    eager imports    cold, also importing the modules send_email now defers (the old import set)
+    zipapp           quikapp-notify.pyz built by build_zipapp (precompiled, nothing written)
+
+Import cost is the summed cumulative -X importtime of every top-level import that a bare
+interpreter does not already make. Figures are the best of --runs, with the median wall time.
+
+Usage:
+    bench_importtime.py [--runs 10] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+UTILS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, UTILS_DIR)
+
+from quikapp_notify import build_zipapp
+
+TARGET = "import quikapp_notify.send_email"
+# What send_email imported at the top before its heavy imports were deferred
+EAGER = TARGET + (", quikapp_notify.smtp_session, quikapp_notify.artifact_inspector, quikapp_notify.checksums,"
+                  " quikapp_notify.artifact_links, quikapp_notify.link_check, smtplib, statistics")
+
+
+def top_level_imports(stderr):
+    """{module: cumulative microseconds} for the depth-0 lines of -X importtime output"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def run(code, pythonpath, baseline=()):
+    """(wall ms, import ms) of one interpreter running code"""
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            env=env, capture_output=True, text=True, check=True)
+    wall = (time.perf_counter() - started) * 1000
+    imports = top_level_imports(result.stderr)
+    return wall, sum(us for name, us in imports.items() if name not in baseline) / 1000
+
+
+def fresh_copy(work_dir):
+    """Copy of the package with no bytecode, as a new checkout has it"""
+    path = tempfile.mkdtemp(dir=work_dir)
+    shutil.copytree(os.path.join(UTILS_DIR, "quikapp_notify"), os.path.join(path, "quikapp_notify"),
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="quikapp-importtime-")
+    samples = {"interpreter": [], "package, cold": [], "package, warm": [], "eager imports": [], "zipapp": []}
+    try:
+        pyz = os.path.join(work_dir, "quikapp-notify.pyz")
+        build_zipapp.build(pyz)
+        baseline = set(top_level_imports(subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True).stderr))
+        for _ in range(args.runs):
+            samples["interpreter"].append(run("pass", work_dir, baseline))
+            path = fresh_copy(work_dir)
+            samples["package, cold"].append(run(TARGET, path, baseline))
+            samples["package, warm"].append(run(TARGET, path, baseline))
+            samples["eager imports"].append(run(EAGER, fresh_copy(work_dir), baseline))
+            samples["zipapp"].append(run(TARGET, pyz, baseline))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Startup noise only ever adds time, so the best run is the steadiest figure
+    rows = [{"variant": variant,
+             "wall_ms": round(min(wall for wall, _ in runs), 1),
+             "wall_median_ms": round(statistics.median(wall for wall, _ in runs), 1),
+             "import_ms": round(min(imported for _, imported in runs), 1)}
+            for variant, runs in samples.items()]
+
+    if args.json:
+        print(json.dumps({"runs": args.runs, "python": sys.version.split()[0], "results": rows}, indent=2))
+        return 0
+
+    print(f"best of {args.runs} runs, Python {sys.version.split()[0]}")
+    print(f"{'variant':<16}{'wall ms':>10}{'median':>9}{'import ms':>11}")
+    for row in rows:
+        print(f"{row['variant']:<16}{row['wall_ms']:>10.1f}{row['wall_median_ms']:>9.1f}{row['import_ms']:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+link_check against a local http.server stand-in for a storage host: every outcome the success
+email depends on, and how many connections the checks needed.
+
+    /ok                  HEAD 200                                  live
+    /signed              HEAD 403, ranged GET 206 (signed for GET)  live
+    /no-head             HEAD 405, ranged GET 206                  live
+    /redirect            302 to /ok                                live
+    /redirect-missing    302 to /missing                           dead
+    /loop                302 to itself                             unknown (too many redirects)
+    /missing             404                                       dead
+    bad port, control characters in the path                       dead (invalid URL)
+    /slow                answers after the budget                  unknown (budget exhausted)
+
+Each case is checked --copies times under distinct query strings, so the per-URL cache does
+not hide requests. Exits with 1 when any URL gets another outcome than the one above, when
+the ranged GET fallback did not send "Range: bytes=0-0", or when the checks opened more
+connections than link_check.MAX_PER_HOST plus one per ranged GET (HEADs share keep-alive
+connections; a ranged GET drops its connection instead of reading the body).
+
+Usage:
+    bench_link_check.py [--copies 10] [--budget 2] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quikapp_notify import link_check
+
+# path -> (expected ok, expected detail)
+EXPECTED = {
+    "/ok": (True, "200"),
+    "/signed": (True, "206"),
+    "/no-head": (True, "206"),
+    "/redirect": (True, "200"),
+    "/redirect-missing": (False, "404"),
+    "/loop": (None, "too many redirects"),
+    "/missing": (False, "404"),
+}
+
+
+class StorageHandler(BaseHTTPRequestHandler):
+    """Answers like a storage host: signed URLs, HEAD-less endpoints, redirects and missing files"""
+
+    protocol_version = "HTTP/1.1"
+    # Set by main(): seconds /slow waits, and the shared request log
+    slow_delay = 0.0
+    requests = []
+    connections = set()
+    lock = threading.Lock()
+
+    def _reply(self, status, location=None):
+        self.send_response(status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", "1" if self.command == "GET" else "0")
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(b"x")
+
+    def _route(self):
+        path, _, query = self.path.partition("?")
+        query = "?" + query if query else ""
+        with self.lock:
+            self.requests.append((self.command, path, self.headers.get("Range")))
+            self.connections.add(self.client_address)
+        ranged = self.command == "GET" and self.headers.get("Range") == "bytes=0-0"
+        if path == "/ok":
+            return self._reply(200)
+        if path == "/signed":
+            return self._reply(206 if ranged else 403)
+        if path == "/no-head":
+            return self._reply(206 if ranged else 405)
+        if path == "/redirect":
+            return self._reply(302, "/ok" + query)
+        if path == "/redirect-missing":
+            return self._reply(302, "/missing" + query)
+        if path == "/loop":
+            return self._reply(302, "/loop" + query)
+        if path == "/slow":
+            time.sleep(self.slow_delay)
+            return self._reply(200)
+        return self._reply(404)
+
+    do_HEAD = _route
+    do_GET = _route
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--copies", type=int, default=10, help="URLs per case")
+    parser.add_argument("--budget", type=float, default=2.0, help="link_check time budget (s)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    StorageHandler.slow_delay = args.budget + 1
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StorageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    expected = {}
+    for i in range(args.copies):
+        for path, outcome in EXPECTED.items():
+            expected[f"{base}{path}?copy={i}"] = outcome
+    expected["http://127.0.0.1:99999/app-release.apk"] = (False, "invalid URL")
+    expected["http://127.0.0.1:notaport/app-release.apk"] = (False, "invalid URL")
+    expected[f"{base}/app release\x01.apk"] = (False, "invalid URL")
+
+    started = time.perf_counter()
+    results = link_check.check_urls(list(expected), budget=args.budget)
+    elapsed = time.perf_counter() - started
+    # The slow URL is checked on its own: it holds a connection for the whole budget
+    slow = link_check.check_urls([f"{base}/slow"], budget=args.budget)[f"{base}/slow"]
+    link_check._pool.close()
+    server.shutdown()
+
+    failures = [f"{url!r}: expected {want}, got {results.get(url)}"
+                for url, want in expected.items() if results.get(url) != want]
+    if slow[0] is not None:
+        failures.append(f"/slow: expected unknown, got {slow}")
+    ranged = [r for r in StorageHandler.requests if r[0] == "GET"]
+    if any(r[2] != "bytes=0-0" for r in ranged):
+        failures.append(f"GET without Range: bytes=0-0: {[r for r in ranged if r[2] != 'bytes=0-0']}")
+    if any(path == "/ok" for method, path, _ in ranged):
+        failures.append("/ok was fetched with GET although HEAD succeeded")
+    requests = [r for r in StorageHandler.requests if r[1] != "/slow"]
+    # Less the connection /slow held; HEADs share keep-alive connections, a ranged GET drops its own
+    connections = len(StorageHandler.connections) - 1
+    allowed = link_check.MAX_PER_HOST + len(ranged)
+    if connections > allowed:
+        failures.append(f"{connections} connections, expected at most {allowed}")
+
+    report = {"urls": len(expected), "seconds": round(elapsed, 3), "requests": len(requests),
+              "ranged_gets": len(ranged), "connections": connections, "failures": failures}
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{len(expected)} URLs checked in {elapsed * 1000:.1f} ms with {len(requests)} requests "
+              f"({len(ranged)} ranged GETs) over {connections} connections (slow URL: {slow[1]})")
+        for message in failures:
+            print(f"❌ {message}")
+        if not failures:
+            print("✅ every URL got its expected outcome")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test: concurrent simulated builds sending their notifications through the real
+CLIs (send_email, send_ios_emails, mailer) to a local SMTP sink with STARTTLS, AUTH, latency and
+injected failures. For sizing relays for peak build hours and testing transport changes without
+a real mail account.
+
+Each simulated build is one new interpreter running a CLI, as a workflow step does; --mix picks
+the commands round-robin. Per build the driver records the wall time from spawn to exit and,
+from the timing spans the CLI writes (QUIKAPP_TIMING_FILE), whether the message was accepted
+and how long the SMTP exchange took (connect + starttls + auth + data). A build fails when the
+message was not accepted; injected failures are retried only as far as smtp_session retries.
+
+Reported per command and overall: p50/p95/p99 latency (end to end and SMTP), throughput of
+accepted messages per second, and failure rate. The sink runs in this process, so on a small
+machine its TLS handshakes compete with the builds for CPU.
+
+Usage:
+    bench_load.py [--builds 100] [--concurrency 8] [--mix started,success,failed,ios,mailer]
+                  [--latency 0.02] [--jitter 0.01] [--fail data=0.02] [--seed 1] [--json]
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quikapp_notify import spawn_args
+from quikapp_notify import smtp_sink
+
+USER = "bench@quikapp.co"
+PASSWORD = "bench-password"
+# Simulated build kinds: name -> (module, argv with {i} for the build number)
+BUILDS = {
+    "started": ("send_email", ("build_started", "android", "{i}")),
+    "success": ("send_email", ("build_success", "android", "{i}")),
+    "failed": ("send_email", ("build_failed", "android", "{i}", "Gradle task :app:bundleRelease failed")),
+    "ios": ("send_ios_emails", ("certificates", "Certificate has expired")),
+    "mailer": ("mailer", ("client@example.com", "QuikApp build {i}", "Build {i} finished")),
+}
+SMTP_PHASES = ("connect", "starttls", "auth", "data")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of values, or None for no values"""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def build_env(work_dir, port, certfile):
+    """Environment of every simulated build: the sink as the only relay, everything else local"""
+    env = dict(os.environ)
+    env.update({
+        "EMAIL_SMTP_SERVER": "127.0.0.1", "EMAIL_SMTP_PORT": str(port), "EMAIL_SMTP_RELAYS": "",
+        "EMAIL_SMTP_USER": USER, "EMAIL_SMTP_PASS": PASSWORD, "EMAIL_ID": "client@example.com",
+        "APP_NAME": "Load Test App", "VERSION_NAME": "1.0.0", "VERSION_CODE": "1",
+        "SSL_CERT_FILE": certfile,
+        # A failed delivery must not open the breaker for every build after it
+        "EMAIL_SMTP_BREAKER_FILE": os.path.join(work_dir, "breaker.json"),
+        "EMAIL_SMTP_BREAKER_COOLDOWN": "0",
+        "QUIKAPP_ENV_FILE": os.path.join(work_dir, "no-env.sh"),
+        "QUIKAPP_CONFIG_SNAPSHOT": "false",
+        "QUIKAPP_OUTBOX": "false",
+        "QUIKAPP_LINK_CHECK": "false",
+        "QUIKAPP_HISTORY": "false",
+        "QUIKAPP_CHECKSUM_CACHE": os.path.join(work_dir, "checksums.json"),
+        "QUIKAPP_TIMING_FILE": os.path.join(work_dir, "spans.jsonl"),
+        "QUIKAPP_NOTIFY_PROFILE": "",
+    })
+    env.pop("QUIKAPP_TIMING_PROM", None)
+    return env
+
+
+def write_artifacts(work_dir):
+    """A small APK and mapping file for the success emails to list"""
+    android = os.path.join(work_dir, "output", "android")
+    os.makedirs(android)
+    for name, size in (("app-release.apk", 512 << 10), ("mapping.txt", 64 << 10)):
+        with open(os.path.join(android, name), "wb") as f:
+            f.write(os.urandom(size))
+
+
+def run_build(i, kind, env, work_dir):
+    """Run one simulated build; returns (kind, pid, wall seconds, exit code)"""
+    module, argv = BUILDS[kind]
+    args, env = spawn_args(module, *(arg.format(i=i) for arg in argv), env=env)
+    started = time.perf_counter()
+    process = subprocess.Popen(args, env=env, cwd=work_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    code = process.wait()
+    return kind, process.pid, time.perf_counter() - started, code
+
+
+def read_traces(path):
+    """{pid: {"ok": bool, "smtp_ms": float}} from the span records of the builds"""
+    traces = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                trace = traces.setdefault(record["pid"], {"ok": False, "smtp_ms": 0.0})
+                if record["phase"] == "total":
+                    trace["ok"] = record["ok"]
+                elif record["phase"] in SMTP_PHASES:
+                    trace["smtp_ms"] += record["ms"]
+    except FileNotFoundError:
+        pass
+    return traces
+
+
+def summarize(name, results, traces, elapsed):
+    """Latency percentiles, throughput and failure rate of a group of builds"""
+    ok = [(wall, traces[pid]["smtp_ms"]) for _, pid, wall, _ in results if traces.get(pid, {}).get("ok")]
+    walls = [wall * 1000 for wall, _ in ok]
+    smtp = [smtp_ms for _, smtp_ms in ok]
+    row = {"builds": name, "count": len(results), "accepted": len(ok),
+           "failure_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+           "messages_per_second": round(len(ok) / elapsed, 2)}
+    for p in (50, 95, 99):
+        value = percentile(walls, p)
+        row[f"p{p}_ms"] = round(value, 1) if value is not None else None
+        value = percentile(smtp, p)
+        row[f"smtp_p{p}_ms"] = round(value, 1) if value is not None else None
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--builds", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", default="started,success,failed,ios,mailer", help=f"of {', '.join(BUILDS)}")
+    parser.add_argument("--latency", type=float, default=0.02, help="sink delay per reply (s)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra random sink delay per reply (s)")
+    parser.add_argument("--fail", default="", help="sink failure injection, e.g. connect=0.01,data=0.02")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    mix = [kind.strip() for kind in args.mix.split(",") if kind.strip()]
+    unknown = [kind for kind in mix if kind not in BUILDS]
+    if unknown or not mix:
+        parser.error(f"unknown build kinds: {', '.join(unknown) or '(none)'}")
+
+    logging.disable(logging.INFO)
+    work_dir = tempfile.mkdtemp(prefix="quikapp-load-")
+    try:
+        certfile, keyfile = smtp_sink.self_signed_cert(work_dir)
+        sink = smtp_sink.SMTPSink(latency=args.latency, jitter=args.jitter,
+                                  tls_context=smtp_sink.tls_context(certfile, keyfile),
+                                  credentials=(USER, PASSWORD), failures=smtp_sink.parse_failures(args.fail),
+                                  seed=args.seed)
+        port = sink.start_in_thread()
+        env = build_env(work_dir, port, certfile)
+        write_artifacts(work_dir)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(lambda i: run_build(i, mix[i % len(mix)], env, work_dir), range(args.builds)))
+        elapsed = time.perf_counter() - started
+        sink.stop()
+        traces = read_traces(env["QUIKAPP_TIMING_FILE"])
+    except smtp_sink.SinkError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    rows = [summarize(kind, [r for r in results if r[0] == kind], traces, elapsed) for kind in dict.fromkeys(mix)]
+    rows.append(summarize("all", results, traces, elapsed))
+    report = {"builds": args.builds, "concurrency": args.concurrency, "latency": args.latency,
+              "jitter": args.jitter, "fail": args.fail, "seconds": round(elapsed, 2), "sink": sink.stats(),
+              "results": rows}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{args.builds} builds, {args.concurrency} concurrent, sink latency {args.latency * 1000:g} ms "
+          f"+ up to {args.jitter * 1000:g} ms, failures {args.fail or 'none'}: {elapsed:.1f} s")
+    print(f"sink: {sink.stats()}")
+    print(f"{'builds':<10}{'count':>7}{'failed':>8}{'msg/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'smtp p50':>10}{'smtp p95':>10}{'smtp p99':>10}")
+
+    def ms(value):
+        return "-" if value is None else f"{value:.1f}"
+
+    for row in rows:
+        print(f"{row['builds']:<10}{row['count']:>7}{row['failure_rate'] * 100:>7.1f}%{row['messages_per_second']:>8.2f}"
+              f"{ms(row['p50_ms']):>9}{ms(row['p95_ms']):>9}{ms(row['p99_ms']):>9}"
+              f"{ms(row['smtp_p50_ms']):>10}{ms(row['smtp_p95_ms']):>10}{ms(row['smtp_p99_ms']):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for log_index: time to index a synthetic build log with 1..N scanning processes.
+
+The log is mostly compiler/Gradle progress noise with a handful of real failures (Xcode,
+CocoaPods, Dart, Kotlin, Gradle) near the end, which is where failed builds put them.
+
+Usage:
+    bench_log_index.py [--size-mb 500] [--workers 1,2,4,8] [--keep PATH] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quikapp_notify import log_index
+
+NOISE = (
+    b"CompileSwift normal arm64 /Users/builder/clone/ios/Runner/AppDelegate.swift (in target 'Runner' from project 'Runner')\n"
+    b"    cd /Users/builder/clone/ios && /Applications/Xcode.app/Contents/Developer/usr/bin/swift-frontend -c -primary-file\n"
+    b"> Task :app:compileReleaseJavaWithJavac UP-TO-DATE\n"
+    b"[        ] executing: sysctl hw.optional.arm64 (took 12ms)\n"
+)
+FAILURES = (
+    b"[!] CocoaPods could not find compatible versions for pod \"Firebase/Messaging\"\n"
+    b"/Users/builder/clone/ios/Runner/AppDelegate.swift:42:13: error: cannot find 'FirebaseApp' in scope\n"
+    b"lib/main.dart:12:5: Error: Undefined name 'foo'.\n"
+    b"e: file:///Users/builder/clone/android/app/src/main/kotlin/MainActivity.kt:10:5 Unresolved reference: foo\n"
+    b"FAILURE: Build failed with an exception.\n\n* What went wrong:\n"
+    b"Execution failed for task ':app:compileReleaseKotlin'.\n"
+    b"** ARCHIVE FAILED **\n"
+)
+
+
+def write_log(path, size_mb):
+    block = NOISE * (1024 * 1024 // len(NOISE))
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+        f.write(FAILURES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--keep", help="write the log here and keep it (reused when it exists)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    path = args.keep or os.path.join(tempfile.mkdtemp(prefix="quikapp-log-bench-"), "build.log")
+    if not os.path.exists(path):
+        write_log(path, args.size_mb)
+    log_index.index_log(path, workers=1)  # warm the page cache
+
+    rows = []
+    try:
+        for workers in (int(w) for w in args.workers.split(",")):
+            started = time.perf_counter()
+            sites = log_index.index_log(path, workers=workers)
+            rows.append({"workers": workers, "seconds": round(time.perf_counter() - started, 3),
+                         "sites": len(sites), "top": sites[0]["message"] if sites else None})
+    finally:
+        if not args.keep:
+            os.unlink(path)
+            os.rmdir(os.path.dirname(path))
+
+    if args.json:
+        print(json.dumps({"size_mb": args.size_mb, "cpus": os.cpu_count(), "results": rows}, indent=2))
+        return 0
+
+    print(f"{args.size_mb} MB log, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'seconds':>10}{'sites':>7}  top site")
+    for row in rows:
+        print(f"{row['workers']:>8}{row['seconds']:>10.3f}{row['sites']:>7}  {row['top']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
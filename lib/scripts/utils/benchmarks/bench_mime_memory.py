@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Peak memory of sending and spooling a failure email carrying a large build log, with whole-message
+serialization (the old path) and with mime_stream's streaming generation.
+
+    sendmail, as_string    msg.as_string() passed to SMTPSession.sendmail (str, bytes and DATA copies)
+    send_message, stream   SMTPSession.send_message: BytesGenerator straight into the DATA stream
+    spool, as_bytes        msg.as_bytes() written to an outbox data file
+    spool, stream          outbox.spool: BytesGenerator straight into the file
+
+Each variant runs in its own interpreter, which builds the message (an HTML body plus the log as a
+text/plain part), notes its RSS, sends or spools it to a local STARTTLS SMTP sink and reports its
+peak RSS. "send MB" is the peak minus the RSS once the message was built: the serialization cost.
+On Linux the peak is reset after building (/proc/self/clear_refs); elsewhere it includes building.
+
+Usage:
+    bench_mime_memory.py [--log-mb 20] [--json]
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import resource
+import subprocess
+import logging
+
+UTILS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, UTILS_DIR)
+
+from quikapp_notify import smtp_sink
+
+VARIANTS = ("sendmail, as_string", "send_message, stream", "spool, as_bytes", "spool, stream")
+LOG_LINE = b"> Task :app:compileReleaseKotlin FAILED e: MainActivity.kt:10:5 Unresolved reference: foo\n"
+
+
+def _status_mb(field):
+    """A size field of /proc/self/status in MB, or None off Linux"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 2 ** 10
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak():
+    """Restart peak RSS tracking from the current RSS (Linux); returns whether it could"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def rss_mb():
+    """Current resident set size in MB (the peak where the current figure is unavailable)"""
+    current = _status_mb("VmRSS")
+    return peak_rss_mb() if current is None else current
+
+
+def peak_rss_mb():
+    """Peak resident set size in MB since the last reset_peak() (since start without one)"""
+    peak = _status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def build_message(log_mb):
+    """A build-failed email with log_mb MB of build log attached as text"""
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
+    log = (LOG_LINE * (log_mb * 2 ** 20 // len(LOG_LINE) + 1)).decode("ascii")
+    msg = MIMEMultipart("mixed")
+    msg["Subject"] = "❌ QuikApp Build Failed - Memory Bench"
+    msg["From"] = "bench@quikapp.co"
+    msg["To"] = "client@example.com"
+    msg.attach(MIMEText("<p>Build failed, log attached.</p>", "html", "utf-8"))
+    part = MIMEText(log, "plain", "utf-8")
+    part.add_header("Content-Disposition", "attachment", filename="build.log")
+    msg.attach(part)
+    return msg
+
+
+def child(variant, log_mb, work_dir):
+    """Run one variant in this interpreter and print its figures as JSON"""
+    from quikapp_notify import outbox
+    from quikapp_notify.smtp_session import SMTPSession
+
+    logging.disable(logging.INFO)
+    msg = build_message(log_mb)
+    # Building the message has its own peak (encoding the log); only serialization is measured
+    peak_reset = reset_peak()
+    built = rss_mb()
+    if variant == "sendmail, as_string":
+        with SMTPSession.from_env() as session:
+            session.sendmail(msg["From"], [msg["To"]], msg.as_string())
+    elif variant == "send_message, stream":
+        with SMTPSession.from_env() as session:
+            session.send_message(msg["From"], [msg["To"]], msg)
+    elif variant == "spool, as_bytes":
+        with open(os.path.join(work_dir, "as_bytes.eml"), "wb") as f:
+            f.write(msg.as_bytes())
+    else:
+        outbox.spool(msg, msg["From"], [msg["To"]])
+    peak = peak_rss_mb()
+    print(json.dumps({"variant": variant, "built_mb": round(built, 1), "peak_mb": round(peak, 1),
+                      "send_mb": round(peak - built, 1), "peak_reset": peak_reset}))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--log-mb", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--child", choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.log_mb, args.work_dir)
+
+    logging.disable(logging.INFO)
+    work_dir = tempfile.mkdtemp(prefix="quikapp-mime-memory-")
+    try:
+        certfile, keyfile = smtp_sink.self_signed_cert(work_dir)
+        sink = smtp_sink.SMTPSink(tls_context=smtp_sink.tls_context(certfile, keyfile))
+        port = sink.start_in_thread()
+        env = dict(os.environ, PYTHONPATH=UTILS_DIR, SSL_CERT_FILE=certfile,
+                   EMAIL_SMTP_SERVER="127.0.0.1", EMAIL_SMTP_PORT=str(port), EMAIL_SMTP_RELAYS="",
+                   EMAIL_SMTP_USER="bench@quikapp.co", EMAIL_SMTP_PASS="bench",
+                   EMAIL_SMTP_BREAKER_FILE=os.path.join(work_dir, "breaker.json"),
+                   QUIKAPP_ENV_FILE=os.path.join(work_dir, "no-env.sh"), QUIKAPP_CONFIG_SNAPSHOT="false",
+                   QUIKAPP_OUTBOX_DIR=os.path.join(work_dir, "outbox"))
+        rows = []
+        for variant in VARIANTS:
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", variant,
+                                     "--log-mb", str(args.log_mb), "--work-dir", work_dir],
+                                    env=env, capture_output=True, text=True, check=True)
+            rows.append(json.loads(result.stdout.strip().splitlines()[-1]))
+        sink.stop()
+    except smtp_sink.SinkError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({"log_mb": args.log_mb, "python": sys.version.split()[0], "results": rows}, indent=2))
+        return 0
+
+    print(f"{args.log_mb} MB build log, Python {sys.version.split()[0]}; RSS in MB")
+    print(f"{'variant':<24}{'built':>9}{'peak':>9}{'send':>9}")
+    for row in rows:
+        print(f"{row['variant']:<24}{row['built_mb']:>9.1f}{row['peak_mb']:>9.1f}{row['send_mb']:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
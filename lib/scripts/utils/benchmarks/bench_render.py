@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Render and serialization benchmark for every notification email, with a regression baseline.
+
+Cases, each at realistic input sizes:
+    artifact_cards[n]        QuikAppEmailNotifier.generate_artifact_cards over n artifacts
+    feature_badges           generate_feature_badges
+    build_started            send_build_started_email, rendered into a message sink (no SMTP)
+    build_success[n]         send_build_success_email with n artifacts (scan, inspect, checksums, render)
+    build_failed[size]       send_build_failed_email summarizing a build log of that size
+    ios_certificate[size]    send_ios_emails certificate template with that build log
+    ios_provisioning[size]   send_ios_emails provisioning template with that build log
+    <email>/as_string        MIMEMultipart.as_string() of the message the case above built
+
+Artifacts are small zip files named like APK/AAB/IPA files plus mapping files, in a temporary
+output/ (link checks, history and env.sh are off, so only local work is timed). Checksums are
+cached after the warmup, as they are for repeat notifications. Every case is warmed up, then
+timed --repeat times; the median and best are reported with the output size in bytes.
+
+--baseline compares against a stored run (benchmarks/baselines/render.json by default) and exits
+with 1 when a case's best run got slower than the baseline's by more than --tolerance (and by
+more than --min-delta-us), or its output grew by more than --size-tolerance. Timings depend on
+the machine: save the baseline on the runner type that compares against it.
+
+Usage:
+    bench_render.py [--repeat 20] [--warmup 3] [--json]
+    bench_render.py --save-baseline [PATH]
+    bench_render.py --baseline [PATH] [--tolerance 0.25] [--min-delta-us 100] [--size-tolerance 0.02]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+import statistics
+import logging
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "render.json")
+ARTIFACT_COUNTS = (0, 1, 5, 20)
+ERROR_SIZES = (("1KB", 1 << 10), ("64KB", 64 << 10), ("1MB", 1 << 20), ("5MB", 5 << 20))
+# Cycled through for artifact files: (path below output/, payload bytes)
+ARTIFACT_KINDS = (
+    ("android/app-release-{}.apk", 256 << 10),
+    ("android/app-release-{}.aab", 256 << 10),
+    ("ios/Runner-{}.ipa", 256 << 10),
+    ("android/mapping-{}.txt", 64 << 10),
+)
+LOG_NOISE = (
+    b"> Task :app:compileReleaseJavaWithJavac UP-TO-DATE\n"
+    b"CompileSwift normal arm64 /Users/builder/clone/ios/Runner/AppDelegate.swift (in target 'Runner')\n"
+)
+LOG_FAILURES = (
+    b"lib/main.dart:12:5: Error: Undefined name 'foo'.\n"
+    b"FAILURE: Build failed with an exception.\n"
+    b"** ARCHIVE FAILED **\n"
+)
+
+
+def bench_env(work_dir):
+    """Process environment for the notifier and the iOS templates: sample app, nothing remote"""
+    return {
+        "EMAIL_SMTP_USER": "bench@quikapp.co", "EMAIL_SMTP_PASS": "bench", "EMAIL_ID": "client@example.com",
+        "APP_NAME": "White Label App", "VERSION_NAME": "1.4.2", "VERSION_CODE": "42", "ORG_NAME": "QuikApp",
+        "USER_NAME": "bench", "WORKFLOW_ID": "android-publish", "PROJECT_ID": "bench-project",
+        "PUSH_NOTIFY": "true", "IS_CAMERA": "true", "IS_LOCATION": "false",
+        "QUIKAPP_ENV_FILE": os.path.join(work_dir, "no-env.sh"),
+        "QUIKAPP_CONFIG_SNAPSHOT": "false",
+        "QUIKAPP_LINK_CHECK": "false",
+        "QUIKAPP_HISTORY": "false",
+        "QUIKAPP_OUTBOX": "false",
+        "QUIKAPP_CHECKSUM_CACHE": os.path.join(work_dir, "checksums.json"),
+        "QUIKAPP_TEMPLATE_CACHE": os.path.join(work_dir, "templates"),
+    }
+
+
+def write_artifacts(output_dir, count):
+    """count artifact files below a fresh output_dir"""
+    shutil.rmtree(output_dir, ignore_errors=True)
+    for i in range(count):
+        pattern, size = ARTIFACT_KINDS[i % len(ARTIFACT_KINDS)]
+        path = os.path.join(output_dir, pattern.format(i))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = os.urandom(size)
+        if path.endswith(".txt"):
+            with open(path, "wb") as f:
+                f.write(payload)
+            continue
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+            archive.writestr("classes.dex", payload)
+            archive.writestr("res/raw/asset.bin", payload[:size // 4])
+
+
+def write_log(path, size):
+    """Build log of about size bytes with failures near the end"""
+    with open(path, "wb") as f:
+        f.write(LOG_NOISE * max(1, (size - len(LOG_FAILURES)) // len(LOG_NOISE)))
+        f.write(LOG_FAILURES)
+
+
+def timed(func, warmup, repeat):
+    """(median µs, best µs, last result) of func after warmup calls"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples), min(samples), result
+
+
+def row(case, median, best, size):
+    return {"case": case, "median_us": round(median, 1), "best_us": round(best, 1), "bytes": size}
+
+
+def ios_message(subject, html, config):
+    """The message send_ios_emails.send_email builds"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = config.smtp_user
+    msg['To'] = config.recipient
+    msg.attach(MIMEText(html, 'html'))
+    return msg
+
+
+def run_cases(work_dir, warmup, repeat):
+    from quikapp_notify import notify_config
+    from quikapp_notify import send_ios_emails
+    from quikapp_notify.send_email import QuikAppEmailNotifier
+
+    output_dir = os.path.join(work_dir, "output")
+    os.environ.update(bench_env(work_dir), QUIKAPP_ARTIFACT_DIR=output_dir)
+    notifier = QuikAppEmailNotifier(env=os.environ)
+    messages = []
+    notifier.message_sink = lambda msg, from_addr, to_addrs: messages.append(msg) or True
+    rows = []
+
+    def email_case(case, send):
+        def render():
+            del messages[:]
+            send()
+            return messages[-1]
+        median, best, msg = timed(render, warmup, repeat)
+        html = msg.get_payload(0).get_payload(decode=True)
+        rows.append(row(case, median, best, len(html)))
+        median, best, data = timed(msg.as_string, warmup, repeat)
+        rows.append(row(f"{case}/as_string", median, best, len(data)))
+
+    for count in ARTIFACT_COUNTS:
+        write_artifacts(output_dir, count)
+        median, best, html = timed(lambda: notifier.generate_artifact_cards("bench-1"), warmup, repeat)
+        rows.append(row(f"artifact_cards[{count}]", median, best, len(html)))
+        email_case(f"build_success[{count}]", lambda: notifier.send_build_success_email("android", "bench-1"))
+
+    median, best, html = timed(notifier.generate_feature_badges, warmup, repeat)
+    rows.append(row("feature_badges", median, best, len(html)))
+    email_case("build_started", lambda: notifier.send_build_started_email("android", "bench-1"))
+
+    config = notify_config.load()
+    templates = (("ios_certificate", send_ios_emails.get_certificate_error_template),
+                 ("ios_provisioning", send_ios_emails.get_provisioning_error_template))
+    for label, size in ERROR_SIZES:
+        log_path = os.path.join(work_dir, f"build-{label}.log")
+        write_log(log_path, size)
+        email_case(f"build_failed[{label}]",
+                   lambda: notifier.send_build_failed_email("android", "bench-1", "Build failed", log_path))
+        for name, template in templates:
+            def build(template=template):
+                return messages.append(ios_message(f"❌ {config.app_name}", template("Build failed", log_path), config))
+            email_case(f"{name}[{label}]", build)
+    return rows
+
+
+def compare(rows, baseline, tolerance, size_tolerance, min_delta_us=0):
+    """Messages for the cases that regressed against baseline rows"""
+    previous = {entry["case"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in rows:
+        old = previous.get(entry["case"])
+        if old is None:
+            continue
+        # Noise only ever adds time, so the best runs are compared; tiny cases also need an absolute change
+        if entry["best_us"] > old["best_us"] * (1 + tolerance) and entry["best_us"] - old["best_us"] > min_delta_us:
+            regressions.append(f"{entry['case']}: {old['best_us']:.1f} -> {entry['best_us']:.1f} µs "
+                               f"({(entry['best_us'] / old['best_us'] - 1) * 100:+.0f}%)")
+        if entry["bytes"] > old["bytes"] * (1 + size_tolerance):
+            regressions.append(f"{entry['case']}: {old['bytes']} -> {entry['bytes']} bytes "
+                               f"({(entry['bytes'] / old['bytes'] - 1) * 100:+.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE, help="compare against this run")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown of the best run (fraction)")
+    parser.add_argument("--min-delta-us", type=float, default=100, help="ignore slowdowns smaller than this")
+    parser.add_argument("--size-tolerance", type=float, default=0.02, help="allowed output growth (fraction)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    previous_env = dict(os.environ)
+    work_dir = tempfile.mkdtemp(prefix="quikapp-render-bench-")
+    try:
+        rows = run_cases(work_dir, args.warmup, args.repeat)
+    finally:
+        os.environ.clear()
+        os.environ.update(previous_env)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {"repeat": args.repeat, "warmup": args.warmup, "python": sys.version.split()[0], "results": rows}
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(rows, json.load(f), args.tolerance, args.size_tolerance,
+                                  args.min_delta_us)
+        report["regressions"] = regressions
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"median and best of {args.repeat} runs after {args.warmup} warmup, Python {report['python']}")
+        print(f"{'case':<36}{'median µs':>12}{'best µs':>12}{'bytes':>10}")
+        for entry in rows:
+            print(f"{entry['case']:<36}{entry['median_us']:>12.1f}{entry['best_us']:>12.1f}{entry['bytes']:>10}")
+        if args.baseline:
+            print(f"\n{len(regressions)} regressions against {args.baseline}")
+            for message in regressions:
+                print(f"  {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
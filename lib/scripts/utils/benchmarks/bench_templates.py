@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Per-template benchmark for email_templates: cold compile (including the html_optimizer pass),
+disk-cache load, warm lookup and render, plus rendered size with and without optimization.
+
+Every slot is filled with a short sample value (HTML fragments for |raw slots), so render times
+reflect the template's own size and slot count rather than the notifier's data.
+
+Usage:
+    bench_templates.py [--iterations 2000] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quikapp_notify import email_templates
+from quikapp_notify import html_optimizer
+
+SAMPLE_TEXT = "QuikApp <Sample> & Co"
+SAMPLE_FRAGMENT = b'<span style="color: #28a745;">sample fragment</span>'
+
+
+def sample_values(template):
+    raw = {name for _, name, escape in template.slots if not escape}
+    return {name: SAMPLE_FRAGMENT if name in raw else SAMPLE_TEXT for name in template.names}
+
+
+def per_call_us(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def bench_template(name, iterations):
+    template_dir = email_templates.TEMPLATE_DIR
+
+    def cold_compile():
+        source = email_templates._expand(name, template_dir)
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        return email_templates.compile_source(name, html_optimizer.optimize(source), digest)
+
+    plain = email_templates.compile_source(name, email_templates._expand(name, template_dir))
+    template = cold_compile()
+    email_templates._store_cached(template, template_dir)
+    values = sample_values(template)
+    html = template.render(**values)
+
+    def cache_load():
+        email_templates._load_cached(name, template.digest, template_dir)
+
+    email_templates.get_template(name)
+    return {
+        "template": name,
+        "plain_bytes": len(plain.render(**values)),
+        "bytes": len(html),
+        "slots": len(template.slots),
+        "compile_us": round(per_call_us(cold_compile, max(1, iterations // 10)), 1),
+        "cache_load_us": round(per_call_us(cache_load, iterations), 1),
+        "lookup_us": round(per_call_us(lambda: email_templates.get_template(name), iterations), 1),
+        "render_us": round(per_call_us(lambda: template.render(**values), iterations), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    cache_dir = tempfile.mkdtemp(prefix="quikapp-template-bench-")
+    os.environ["QUIKAPP_TEMPLATE_CACHE"] = cache_dir
+    try:
+        names = sorted(f for f in os.listdir(email_templates.TEMPLATE_DIR) if f.endswith(".html"))
+        rows = [bench_template(name, args.iterations) for name in names]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({"iterations": args.iterations, "results": rows}, indent=2))
+        return 0
+
+    print(f"{args.iterations} iterations per measurement (compile: {max(1, args.iterations // 10)}), times in µs")
+    print(f"{'template':<30}{'plain':>8}{'bytes':>8}{'slots':>7}{'compile':>10}{'cache':>9}{'lookup':>9}{'render':>9}")
+    for row in rows:
+        print(f"{row['template']:<30}{row['plain_bytes']:>8}{row['bytes']:>8}{row['slots']:>7}{row['compile_us']:>10.1f}"
+              f"{row['cache_load_us']:>9.1f}{row['lookup_us']:>9.1f}{row['render_us']:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
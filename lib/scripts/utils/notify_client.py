@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Compatibility entry point for quikapp_notify.notify_client, same arguments
+(python -m quikapp_notify.notify_client from lib/scripts/utils is equivalent).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from quikapp_notify.notify_client import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+QuikApp Notify
+Build notification emails for the QuikApp workflows, as one importable package.
+
+    transport   smtp_session, mime_stream, outbox, async_transport, notify_daemon, notify_client, smtp_sink
+    rendering   email_templates, html_optimizer, error_excerpt, log_index, log_attachment, templates/
+    artifacts   artifacts, artifact_inspector, artifact_links, checksums, link_check, build_history
+    senders     send_email, send_ios_emails, mailer (all reading notify_config, timed by timing,
+                profiled on demand by profiling)
+
+Every CLI keeps the argv of the script it replaces:
+    python -m quikapp_notify.send_email build_success android 42
+    python -m quikapp_notify send_email build_success android 42     # same, through __main__
+    python quikapp-notify.pyz send_email build_success android 42    # same, from the zipapp (see build_zipapp)
+
+Importing the package is free: modules are imported when a command needs them, and
+send_email imports the artifact, history, log attachment, outbox and SMTP modules only on
+the paths that use them.
+"""
+
+import os
+import sys
+
+# Directory (or .pyz archive) the package is imported from
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def spawn_args(module, *args, env=None):
+    """(argv, env) that run one of the package's CLIs in a new interpreter, from the same checkout or zipapp"""
+    env = dict(os.environ if env is None else env)
+    path = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = PACKAGE_PARENT + (os.pathsep + path if path else "")
+    return [sys.executable, "-m", f"{__name__}.{module}", *args], env
@@ -0,0 +1,36 @@
+"""
+QuikApp Notify command dispatcher
+Runs one of the package's CLIs by name with the argv of the script it replaces; this is
+also the entry point of the zipapp.
+
+Usage:
+    python -m quikapp_notify <command> [args ...]
+    python quikapp-notify.pyz <command> [args ...]
+"""
+
+import sys
+import importlib
+
+COMMANDS = (
+    "send_email", "send_ios_emails", "mailer", "notify_client", "notify_daemon", "outbox",
+    "async_transport", "smtp_sink", "artifacts", "artifact_inspector", "artifact_links",
+    "checksums", "link_check", "build_history", "notify_config", "error_excerpt", "log_index",
+    "log_attachment", "html_optimizer", "mime_stream", "timing", "profiling", "test_artifact_urls",
+    "build_zipapp",
+)
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print("Usage: python -m quikapp_notify <command> [args ...]")
+        print(f"Commands: {', '.join(COMMANDS)}")
+        return 1
+    name = sys.argv.pop(1)
+    # The command sees the same sys.argv[1:] as when its script was run directly
+    sys.argv[0] = name
+    return importlib.import_module(f"{__package__}.{name}").main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
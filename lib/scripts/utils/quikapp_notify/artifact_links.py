@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+QuikApp Artifact Links
+Download URLs for the artifact cards, taken from Codemagic's CM_ARTIFACT_LINKS.
+
+CM_ARTIFACT_LINKS is a JSON array with one object per uploaded artifact (name, type, url,
+optionally public_url and size). It is parsed once per value. Each local artifact from
+artifacts.discover is matched by file name, and by size when several uploads share a name
+(one app-release.apk per flavor). public_url is preferred: url needs a Codemagic login
+and expires.
+
+Resolved URLs are written to manifest.json with the checksums. When CM_ARTIFACT_LINKS is
+not set (a re-sent notification, the daemon with a trimmed environment), the URLs are
+read back from there, matched by path and size. Artifacts without a link point at the
+Codemagic build page.
+
+Usage:
+    python -m quikapp_notify.artifact_links            # print one URL per upload in CM_ARTIFACT_LINKS, public_url preferred
+"""
+
+import os
+import sys
+import json
+import logging
+
+logger = logging.getLogger("artifact_links")
+
+# CM_ARTIFACT_LINKS value -> parsed entries
+_parsed = {}
+
+
+def parse_links(value):
+    """List of link dicts from a CM_ARTIFACT_LINKS value; [] when unset or malformed"""
+    if not value:
+        return []
+    links = _parsed.get(value)
+    if links is None:
+        try:
+            data = json.loads(value)
+        except ValueError as e:
+            logger.warning(f"⚠️ CM_ARTIFACT_LINKS is not valid JSON: {e}")
+            data = []
+        links = _parsed[value] = [entry for entry in data if isinstance(entry, dict)] if isinstance(data, list) else []
+    return links
+
+
+def link_url(entry):
+    """(url, 'public_url' | 'url') of a link entry, preferring the non-expiring public URL"""
+    if entry.get("public_url"):
+        return entry["public_url"], "public_url"
+    if entry.get("url"):
+        return entry["url"], "url"
+    return None, None
+
+
+def _cached_links(manifest_path):
+    """Link entries recorded in an earlier manifest.json, keyed by artifact path"""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {a["path"]: a for a in manifest.get("artifacts", [])
+            if isinstance(a, dict) and a.get("download_url") and a.get("path")}
+
+
+def resolve(found, links_value, manifest_path=None):
+    """Set 'download_url' and 'link_source' on every artifact; returns how many were resolved"""
+    links = parse_links(links_value)
+    by_name = {}
+    for entry in links:
+        by_name.setdefault(entry.get("name"), []).append(entry)
+    cached = _cached_links(manifest_path) if manifest_path and not links else {}
+
+    resolved = 0
+    for artifact in found:
+        artifact['download_url'] = artifact['link_source'] = None
+        candidates = by_name.get(artifact['filename'], [])
+        if len(candidates) > 1:
+            candidates = [e for e in candidates if e.get("size") == artifact['bytes']] or candidates
+        if candidates:
+            entry = candidates[0]
+            by_name[artifact['filename']].remove(entry)
+            artifact['download_url'], artifact['link_source'] = link_url(entry)
+        elif artifact['path'] in cached and cached[artifact['path']].get("bytes") == artifact['bytes']:
+            artifact['download_url'] = cached[artifact['path']]["download_url"]
+            artifact['link_source'] = cached[artifact['path']].get("link_source")
+        if artifact['download_url']:
+            resolved += 1
+            if artifact['link_source'] == "url":
+                logger.warning(f"⚠️ {artifact['filename']} has no public_url; its link needs a Codemagic login "
+                               f"and expires; enable public artifact links for the team to fix this")
+    if links or cached:
+        logger.info(f"🔗 Resolved download links for {resolved} of {len(found)} artifacts")
+    return resolved
+
+
+def main():
+    """Main function to handle command line arguments"""
+    links = parse_links(os.environ.get("CM_ARTIFACT_LINKS", ""))
+    urls = []
+    for entry in links:
+        url, source = link_url(entry)
+        if url:
+            urls.append(url)
+        if source == "url":
+            logger.warning(f"⚠️ {entry.get('name')} has no public_url; its link needs a Codemagic login and expires")
+    if not urls:
+        print("Artifacts not available.")
+        return 0
+    print("\n".join(urls))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+QuikApp Artifact Discovery
+Finds the build artifacts listed in the notification emails.
+
+The output directory is walked once with os.scandir and every path, relative to that
+directory, is matched against ARTIFACT_PATTERNS in order. The first matching pattern
+supplies the card's display name, description and color. Bundle directories (.xcarchive,
+.dSYM, .app) are reported as one artifact whose size is the sum of the files inside;
+the walk does not descend into them, so nothing inside a bundle is matched on its own.
+
+Sizes come from DirEntry.stat(), so each file is stat'ed at most once and only if it
+matters: matched files, and files inside matched bundles.
+
+Extra patterns can be given in QUIKAPP_ARTIFACT_PATTERNS as comma-separated entries of
+the form "glob" or "glob=Display Name". They are tried before the built-in ones.
+
+Usage:
+    python -m quikapp_notify.artifacts [output dir]   # list what the email would show
+"""
+
+import os
+import sys
+import fnmatch
+
+DEFAULT_OUTPUT_DIR = "output"
+BUNDLE_SUFFIXES = (".xcarchive", ".dSYM", ".app")
+DEFAULT_COLOR = "#607D8B"
+
+# (glob relative to the output dir, display name, description, color); first match wins.
+# fnmatch's "*" also matches "/", so "android/*.apk" covers per-flavor subdirectories.
+ARTIFACT_PATTERNS = [
+    ("android/*.apk", "Android APK", "Install directly on Android devices", "#4CAF50"),
+    ("android/*.aab", "Android Bundle", "Upload to Google Play Console", "#2196F3"),
+    ("ios/*.ipa", "iOS IPA", "Install on iOS devices or upload to App Store", "#FF9800"),
+    ("*.xcarchive", "Xcode Archive", "Re-export or re-sign the iOS build in Xcode", "#795548"),
+    ("*.dSYM", "Debug Symbols", "Symbolicate iOS crash reports", "#9C27B0"),
+    ("*.dSYM.zip", "Debug Symbols", "Symbolicate iOS crash reports", "#9C27B0"),
+    ("android/*mapping*.txt", "R8 Mapping", "Deobfuscate Android stack traces", "#9C27B0"),
+]
+
+
+def format_size(size):
+    """Human readable size for a byte count"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
+
+
+def parse_patterns(spec):
+    """Patterns from a QUIKAPP_ARTIFACT_PATTERNS value"""
+    patterns = []
+    for entry in (e.strip() for e in spec.split(",")):
+        if not entry:
+            continue
+        glob, _, name = entry.partition("=")
+        glob = glob.strip()
+        name = name.strip() or f"{os.path.splitext(glob)[1].lstrip('.').upper() or 'Build'} Artifact"
+        patterns.append((glob, name, "Build output", DEFAULT_COLOR))
+    return patterns
+
+
+def _match(relative_path, patterns):
+    for index, pattern in enumerate(patterns):
+        if fnmatch.fnmatchcase(relative_path, pattern[0]):
+            return index
+    return None
+
+
+def _tree_size(path):
+    """Total size of the regular files below path, one scandir per directory"""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def discover(root, patterns=None):
+    """Artifacts below root as card dicts (name, description, size, filename, color, path, bytes, ...)"""
+    if patterns is None:
+        patterns = ARTIFACT_PATTERNS
+    found = []
+    # (directory path, path relative to root)
+    stack = [(root, "")]
+    while stack:
+        directory, relative = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    entry_relative = f"{relative}{entry.name}"
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        bundle = is_dir and entry.name.endswith(BUNDLE_SUFFIXES)
+                        index = _match(entry_relative, patterns) if bundle or not is_dir else None
+                        if index is None:
+                            if is_dir and not bundle:
+                                stack.append((entry.path, f"{entry_relative}/"))
+                            continue
+                        st = None if bundle else entry.stat()
+                        size = _tree_size(entry.path) if bundle else st.st_size
+                    except OSError:
+                        continue
+                    found.append((index, entry_relative, entry, st, size))
+        except OSError:
+            continue
+
+    artifacts = []
+    found.sort(key=lambda item: (item[0], item[1]))
+    for index, entry_relative, entry, st, size in found:
+        _, name, description, color = patterns[index]
+        artifacts.append({
+            'name': name,
+            'description': description,
+            'size': format_size(size),
+            'filename': entry.name,
+            'color': color,
+            'path': entry_relative,
+            'full_path': entry.path,
+            'bytes': size,
+            'bundle': st is None,
+            # The DirEntry stat of a file artifact, reused as the checksum cache key
+            'stat': st,
+        })
+    return artifacts
+
+
+def output_dir(env, base_dir=""):
+    """The configured output directory (QUIKAPP_ARTIFACT_DIR, default output/)"""
+    return os.path.join(base_dir, env.get("QUIKAPP_ARTIFACT_DIR", DEFAULT_OUTPUT_DIR))
+
+
+def discover_from_env(env, base_dir=""):
+    """Artifacts in the configured output directory"""
+    return discover(output_dir(env, base_dir), parse_patterns(env.get("QUIKAPP_ARTIFACT_PATTERNS", "")) + ARTIFACT_PATTERNS)
+
+
+def main():
+    """Main function to handle command line arguments"""
+    env = dict(os.environ)
+    if len(sys.argv) > 1:
+        env["QUIKAPP_ARTIFACT_DIR"] = sys.argv[1]
+    found = discover_from_env(env)
+    for artifact in found:
+        print(f"{artifact['size']:>10}  {artifact['name']:<16}  {artifact['path']}")
+    if not found:
+        print("No artifacts found")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
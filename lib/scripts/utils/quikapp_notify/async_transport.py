@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+QuikApp Async SMTP Transport
+Sends many notification messages concurrently over a bounded number of SMTP sessions.
+
+Each session is a native asyncio SMTP client that stays open and sends message after
+message (MAIL/RCPT/DATA, RSET on recipient failure) until it reaches its per-session
+message limit. Producers block on a bounded queue, so rendering never runs far ahead
+of delivery.
+
+Usage:
+    python -m quikapp_notify.async_transport bulk <jobs.jsonl>
+
+Each line of jobs.jsonl is {"argv": [email_type, platform, build_id, error_message?],
+"env": {...overrides}, "cwd": "..."}; jobs are rendered with QuikAppEmailNotifier and
+delivered over EMAIL_SMTP_SESSIONS parallel sessions (default 4).
+"""
+
+import os
+import re
+import ssl
+import sys
+import json
+import base64
+import asyncio
+import smtplib
+import logging
+
+from . import notify_config
+from .smtp_session import get_ssl_context
+
+logger = logging.getLogger("async_transport")
+
+DEFAULT_SESSIONS = 4
+# Gmail and most relays start refusing after ~100 messages on one connection
+DEFAULT_MAX_PER_SESSION = 100
+DEFAULT_TIMEOUT = 60.0
+
+_EOL_RE = re.compile(rb'(?:\r\n|\n|\r(?!\n))')
+_LEADING_DOT_RE = re.compile(rb'(?m)^\.')
+
+
+def encode_data(payload):
+    """Normalize line endings and dot-stuff a message for the DATA command"""
+    data = _LEADING_DOT_RE.sub(b'..', _EOL_RE.sub(b'\r\n', payload))
+    if not data.endswith(b'\r\n'):
+        data += b'\r\n'
+    return data + b'.\r\n'
+
+
+class AsyncSMTPSession:
+    """Minimal asyncio SMTP client: EHLO, STARTTLS, AUTH PLAIN/LOGIN, MAIL/RCPT/DATA"""
+
+    def __init__(self, host, port, user="", password="", starttls=True, timeout=DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.features = {}
+        self.reader = None
+        self.writer = None
+
+    async def _read_reply(self):
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            lines.append(line[4:].strip())
+            if line[3:4] != b'-':
+                return int(line[:3]), b'\n'.join(lines)
+
+    async def command(self, line, *expected):
+        """Send one command and return (code, text), raising on unexpected replies"""
+        self.writer.write(line.encode('ascii') + b'\r\n')
+        await self.writer.drain()
+        code, text = await self._read_reply()
+        if expected and code not in expected:
+            raise smtplib.SMTPResponseException(code, text)
+        return code, text
+
+    async def _ehlo(self):
+        _, text = await self.command("EHLO quikapp.local", 250)
+        self.features = {}
+        for line in text.decode('latin-1').split('\n')[1:]:
+            keyword, _, params = line.partition(' ')
+            self.features[keyword.lower()] = params
+
+    async def _auth(self):
+        mechanisms = self.features.get('auth', '').upper().split()
+        if 'PLAIN' in mechanisms or not mechanisms:
+            token = base64.b64encode(f"\0{self.user}\0{self.password}".encode('utf-8')).decode('ascii')
+            code, text = await self.command(f"AUTH PLAIN {token}")
+        else:
+            await self.command("AUTH LOGIN", 334)
+            await self.command(base64.b64encode(self.user.encode('utf-8')).decode('ascii'), 334)
+            code, text = await self.command(base64.b64encode(self.password.encode('utf-8')).decode('ascii'))
+        if code != 235:
+            raise smtplib.SMTPAuthenticationError(code, text)
+
+    async def connect(self):
+        """Open the connection, upgrade to TLS and authenticate"""
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+        code, text = await self._read_reply()
+        if code != 220:
+            raise smtplib.SMTPConnectError(code, text)
+        await self._ehlo()
+        if self.starttls:
+            if 'starttls' not in self.features:
+                raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server.")
+            await self.command("STARTTLS", 220)
+            await self.writer.start_tls(get_ssl_context(), server_hostname=self.host)
+            await self._ehlo()
+        if self.user:
+            await self._auth()
+
+    async def send(self, from_addr, to_addrs, payload):
+        """Send one message; returns refused recipients like smtplib.sendmail"""
+        await self.command(f"MAIL FROM:<{from_addr}>", 250)
+        refused = {}
+        for rcpt in to_addrs:
+            code, text = await self.command(f"RCPT TO:<{rcpt}>")
+            if code not in (250, 251):
+                refused[rcpt] = (code, text)
+        if len(refused) == len(to_addrs):
+            await self.command("RSET", 250)
+            raise smtplib.SMTPRecipientsRefused(refused)
+        await self.command("DATA", 354)
+        self.writer.write(encode_data(payload))
+        await self.writer.drain()
+        code, text = await self._read_reply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, text)
+        return refused
+
+    async def close(self, polite=True):
+        """QUIT (when polite) and close the stream"""
+        if self.writer is None:
+            return
+        try:
+            if polite:
+                await self.command("QUIT")
+        except (smtplib.SMTPException, OSError, asyncio.TimeoutError):
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+        self.writer = None
+
+
+def _sessions_from_env(env):
+    """Session count from EMAIL_SMTP_SESSIONS; DEFAULT_SESSIONS when it is unset or malformed"""
+    value = env.get("EMAIL_SMTP_SESSIONS")
+    if not value:
+        return DEFAULT_SESSIONS
+    try:
+        sessions = int(value)
+    except ValueError:
+        sessions = 0
+    if sessions < 1:
+        logger.warning(f"⚠️ Ignoring EMAIL_SMTP_SESSIONS={value!r}, using {DEFAULT_SESSIONS}")
+        return DEFAULT_SESSIONS
+    return sessions
+
+
+class AsyncSMTPTransport:
+    """Delivers a batch of messages over a bounded pool of reusable SMTP sessions"""
+
+    def __init__(self, host, port, user="", password="", sessions=DEFAULT_SESSIONS,
+                 max_per_session=DEFAULT_MAX_PER_SESSION, starttls=True, timeout=DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.sessions = max(1, sessions)
+        self.max_per_session = max_per_session
+        self.starttls = starttls
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls, env=None, sessions=None):
+        """Build a transport from the EMAIL_SMTP_* variables used by the notifier"""
+        env = os.environ if env is None else env
+        config = notify_config.load(env)
+        return cls(
+            config.smtp_server,
+            config.smtp_port,
+            config.smtp_user,
+            config.smtp_pass,
+            sessions=sessions or _sessions_from_env(env),
+        )
+
+    def _new_session(self):
+        return AsyncSMTPSession(self.host, self.port, self.user, self.password,
+                                starttls=self.starttls, timeout=self.timeout)
+
+    async def _worker(self, queue, results):
+        session = None
+        sent_on_session = 0
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            index, (msg, from_addr, to_addrs) = item
+            payload = msg if isinstance(msg, bytes) else msg.as_bytes()
+
+            # A dropped connection gets one retry on a fresh session; SMTP replies are final
+            for attempt in (1, 2):
+                try:
+                    if session is not None and sent_on_session >= self.max_per_session:
+                        await session.close()
+                        session = None
+                    if session is None:
+                        session = self._new_session()
+                        await session.connect()
+                        sent_on_session = 0
+                    refused = await session.send(from_addr, to_addrs, payload)
+                    sent_on_session += 1
+                    results[index] = {'ok': True, 'refused': refused, 'error': None}
+                    break
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                    # The transaction failed but the session is back in its ready state (RSET after
+                    # refused recipients); keep it unless the server is shutting it down (421)
+                    if isinstance(e, smtplib.SMTPRecipientsRefused):
+                        refused = e.recipients
+                        closing = any(code == 421 for code, _ in refused.values())
+                    else:
+                        refused = {}
+                        closing = e.smtp_code == 421
+                    sent_on_session += 1
+                    if closing:
+                        await session.close(polite=False)
+                        session = None
+                    results[index] = {'ok': False, 'refused': refused, 'error': str(e)}
+                    break
+                except smtplib.SMTPResponseException as e:
+                    if session is not None:
+                        await session.close(polite=False)
+                    session = None
+                    results[index] = {'ok': False, 'refused': {}, 'error': str(e)}
+                    break
+                except (smtplib.SMTPException, OSError, asyncio.TimeoutError) as e:
+                    if session is not None:
+                        await session.close(polite=False)
+                    session = None
+                    results[index] = {'ok': False, 'refused': {}, 'error': f"{type(e).__name__}: {e}"}
+
+        if session is not None:
+            await session.close()
+
+    async def send_all(self, messages):
+        """Send (msg, from_addr, to_addrs) tuples; returns one result dict per message, in order"""
+        messages = list(messages)
+        results = [None] * len(messages)
+        if not messages:
+            return results
+
+        queue = asyncio.Queue(maxsize=self.sessions * 2)
+        workers = [asyncio.create_task(self._worker(queue, results))
+                   for _ in range(min(self.sessions, len(messages)))]
+        for item in enumerate(messages):
+            await queue.put(item)  # blocks while every session is busy
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        return results
+
+    def send_messages(self, messages):
+        """Synchronous wrapper around send_all"""
+        return asyncio.run(self.send_all(messages))
+
+
+def render_messages(jobs):
+    """Render (notifier, email_type, platform, build_id, error_message) jobs without sending them"""
+    from .send_email import send_notification
+
+    messages = []
+    for notifier, *event in jobs:
+        notifier.message_sink = lambda msg, from_addr, to_addrs: messages.append((msg, from_addr, to_addrs)) or True
+        send_notification(notifier, *event)
+        notifier.message_sink = None
+    return messages
+
+
+def send_bulk(jobs, env=None, sessions=None):
+    """Render notifier jobs and deliver them concurrently"""
+    messages = render_messages(jobs)
+    logger.info(f"📨 Sending {len(messages)} messages over up to {sessions or 'default'} sessions")
+    results = AsyncSMTPTransport.from_env(env, sessions).send_messages(messages)
+    for (msg, _, to_addrs), result in zip(messages, results):
+        if result['ok']:
+            logger.info(f"✅ Email sent successfully to {', '.join(to_addrs)}")
+        else:
+            logger.error(f"❌ Failed to send email to {', '.join(to_addrs)}: {result['error']}")
+    return results
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) < 3 or sys.argv[1] != "bulk":
+        print("Usage: python -m quikapp_notify.async_transport bulk <jobs.jsonl>")
+        sys.exit(1)
+
+    from .send_email import QuikAppEmailNotifier
+
+    jobs = []
+    with open(sys.argv[2], "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            args = job["argv"]
+            error_message = args[3] if len(args) > 3 else "Unknown error occurred"
+            notifier = QuikAppEmailNotifier(env=dict(os.environ, **job.get("env", {})),
+                                            base_dir=job.get("cwd", ""))
+            jobs.append((notifier, args[0], args[1], args[2], error_message))
+
+    results = send_bulk(jobs)
+    failed = sum(1 for r in results if not r['ok'])
+    logger.info(f"Bulk send finished: {len(results) - failed} sent, {failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
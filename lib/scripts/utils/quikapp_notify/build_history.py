@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+QuikApp Build History
+Local SQLite store for what the notifier saw in earlier builds.
+
+The database lives at QUIKAPP_HISTORY_DB (default ~/.quikapp/history.sqlite3) and is opened
+in WAL mode, so the notifier, the daemon and the CLI can use it at the same time.
+Connections are cached per path for the lifetime of the process.
+
+events keeps one row per (app, workflow, build id, event) for every notification: when it
+was sent, the build duration (time since the build_started event of the same build),
+the total artifact size, whether the email went out and how long sending took. It is
+indexed on (app, workflow, recorded_at), so the trend queries below only touch the
+newest rows of one app and workflow.
+
+artifact_sizes keeps one row per (app, artifact path, build id) with the compressed and
+uncompressed totals and the per-category breakdown from artifact_inspector. A repeat
+notification for the same build replaces its row, and sizes are compared with the latest
+*other* build of the same app and artifact.
+
+Usage:
+    python -m quikapp_notify.build_history stats <app> <workflow> [limit]   # success rate, median durations, last builds as JSON
+    python -m quikapp_notify.build_history sizes <app id> [limit]           # recent artifact sizes as JSON
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+
+logger = logging.getLogger("build_history")
+
+DEFAULT_LIMIT = 20
+FINISHED_EVENTS = ("build_success", "build_failed")
+
+# MIGRATIONS[n] upgrades a database from user_version n to n + 1
+MIGRATIONS = ["""
+CREATE TABLE IF NOT EXISTS artifact_sizes (
+    app TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    build_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    version TEXT,
+    compressed INTEGER NOT NULL,
+    uncompressed INTEGER NOT NULL,
+    breakdown TEXT NOT NULL,
+    PRIMARY KEY (app, artifact, build_id)
+);
+CREATE INDEX IF NOT EXISTS artifact_sizes_recent ON artifact_sizes (app, artifact, recorded_at);
+""", """
+CREATE TABLE IF NOT EXISTS events (
+    app TEXT NOT NULL,
+    workflow TEXT NOT NULL,
+    platform TEXT,
+    build_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    duration REAL,
+    artifact_bytes INTEGER,
+    delivered INTEGER NOT NULL,
+    delivery_ms REAL,
+    PRIMARY KEY (app, workflow, build_id, event)
+);
+CREATE INDEX IF NOT EXISTS events_recent ON events (app, workflow, recorded_at);
+"""]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# path -> sqlite3.Connection
+_connections = {}
+
+
+def db_path(env=None):
+    """Database path from QUIKAPP_HISTORY_DB, default ~/.quikapp/history.sqlite3"""
+    env = os.environ if env is None else env
+    return env.get("QUIKAPP_HISTORY_DB") or os.path.join(os.path.expanduser("~"), ".quikapp", "history.sqlite3")
+
+
+def connect(path):
+    """Open (and create or migrate) the history database; raises sqlite3.Error / OSError"""
+    conn = _connections.get(path)
+    if conn is not None:
+        return conn
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for migration in MIGRATIONS[version:]:
+        version += 1
+        with conn:
+            conn.executescript(migration)
+            conn.execute(f"PRAGMA user_version={version}")
+    _connections[path] = conn
+    return conn
+
+
+def previous_size(conn, app, artifact, build_id):
+    """Latest recorded sizes of the same app and artifact from another build, or None"""
+    row = conn.execute(
+        "SELECT build_id, recorded_at, version, compressed, uncompressed, breakdown FROM artifact_sizes"
+        " WHERE app = ? AND artifact = ? AND build_id != ? ORDER BY recorded_at DESC LIMIT 1",
+        (app, artifact, build_id)).fetchone()
+    if row is None:
+        return None
+    previous = dict(row)
+    previous["breakdown"] = json.loads(previous["breakdown"])
+    return previous
+
+
+def record_size(conn, app, artifact, build_id, version, sizes):
+    """Store a build's size breakdown and return the previous build's (see previous_size)"""
+    previous = previous_size(conn, app, artifact, build_id)
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO artifact_sizes"
+            " (app, artifact, build_id, recorded_at, version, compressed, uncompressed, breakdown)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (app, artifact, build_id, time.time(), version,
+             sum(s[0] for s in sizes.values()), sum(s[1] for s in sizes.values()), json.dumps(sizes)))
+    return previous
+
+
+def record_event(conn, app, workflow, platform, build_id, event, delivered, delivery_ms=None,
+                 artifact_bytes=None):
+    """Store a notification event; returns the build duration in seconds when it is known"""
+    now = time.time()
+    duration = None
+    if event != "build_started":
+        row = conn.execute(
+            "SELECT recorded_at FROM events WHERE app = ? AND workflow = ? AND build_id = ? AND event = 'build_started'",
+            (app, workflow, build_id)).fetchone()
+        if row is not None:
+            duration = now - row[0]
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO events (app, workflow, platform, build_id, event, recorded_at, duration,"
+            " artifact_bytes, delivered, delivery_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (app, workflow, platform, build_id, event, now, duration, artifact_bytes, int(bool(delivered)),
+             delivery_ms))
+    return duration
+
+
+def recent_builds(conn, app, workflow, limit=DEFAULT_LIMIT, exclude_build=None):
+    """Finished builds (success / failed events) of an app and workflow, newest first"""
+    rows = conn.execute(
+        "SELECT build_id, event, platform, recorded_at, duration, artifact_bytes, delivered, delivery_ms"
+        " FROM events WHERE app = ? AND workflow = ? AND event IN (?, ?) AND build_id != ?"
+        " ORDER BY recorded_at DESC LIMIT ?",
+        (app, workflow) + FINISHED_EVENTS + (exclude_build or "", limit))
+    return [dict(row) for row in rows]
+
+
+def build_stats(conn, app, workflow, limit=DEFAULT_LIMIT):
+    """Success rate and median build / delivery times over the last limit builds"""
+    import statistics
+
+    builds = recent_builds(conn, app, workflow, limit)
+    durations = [b["duration"] for b in builds if b["duration"] is not None]
+    delivery = [b["delivery_ms"] for b in builds if b["delivery_ms"] is not None]
+    successes = sum(1 for b in builds if b["event"] == "build_success")
+    return {
+        "app": app,
+        "workflow": workflow,
+        "builds": len(builds),
+        "successes": successes,
+        "success_rate": successes / len(builds) if builds else None,
+        "median_duration": statistics.median(durations) if durations else None,
+        "median_delivery_ms": statistics.median(delivery) if delivery else None,
+        "last_builds": builds,
+    }
+
+
+def recent_sizes(conn, app, limit=DEFAULT_LIMIT):
+    """Most recent artifact size rows of an app, newest first"""
+    rows = conn.execute(
+        "SELECT artifact, build_id, recorded_at, version, compressed, uncompressed FROM artifact_sizes"
+        " WHERE app = ? ORDER BY recorded_at DESC LIMIT ?", (app, limit))
+    return [dict(row) for row in rows]
+
+
+def main():
+    """Main function to handle command line arguments"""
+    args = sys.argv[1:]
+    if len(args) >= 3 and args[0] == "stats":
+        limit = int(args[3]) if len(args) > 3 else DEFAULT_LIMIT
+        print(json.dumps(build_stats(connect(db_path()), args[1], args[2], limit), indent=2))
+        return 0
+    if len(args) >= 2 and args[0] == "sizes":
+        limit = int(args[2]) if len(args) > 2 else DEFAULT_LIMIT
+        print(json.dumps(recent_sizes(connect(db_path()), args[1], limit), indent=2))
+        return 0
+    print("Usage: python -m quikapp_notify.build_history stats <app> <workflow> [limit]")
+    print("       python -m quikapp_notify.build_history sizes <app id> [limit]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
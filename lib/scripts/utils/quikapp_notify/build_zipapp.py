@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+QuikApp Notify zipapp builder
+Packs quikapp_notify into a single executable .pyz for cold CI runners.
+
+The archive holds every module as source plus bytecode compiled ahead of time
+(unchecked hash-based .pyc, so zipimport loads it without recompiling or comparing
+mtimes), the templates, and their compiled caches, so a notification run from the
+zipapp never compiles Python or re-optimizes a template. It is rebuilt whenever a
+package file is newer than it (send_email.sh does this in the background).
+
+Usage:
+    python -m quikapp_notify.build_zipapp [output.pyz]   # default: lib/scripts/utils/quikapp-notify.pyz
+    python quikapp-notify.pyz send_email build_success android 42
+"""
+
+import os
+import sys
+import py_compile
+import tempfile
+import zipfile
+import logging
+
+from . import PACKAGE_PARENT
+from . import email_templates
+
+logger = logging.getLogger("build_zipapp")
+
+PACKAGE_DIR = os.path.join(PACKAGE_PARENT, __package__)
+DEFAULT_OUTPUT = os.path.join(PACKAGE_PARENT, "quikapp-notify.pyz")
+INTERPRETER = "/usr/bin/env python3"
+MAIN = f"import sys\nfrom {__package__}.__main__ import main\nsys.exit(main())\n"
+
+
+def _compile(source_path, archive_name, work_dir):
+    """Bytecode for one module, with archive_name as its file name in tracebacks"""
+    cfile = os.path.join(work_dir, "module.pyc")
+    py_compile.compile(source_path, cfile=cfile, dfile=archive_name, doraise=True,
+                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+    with open(cfile, "rb") as f:
+        return f.read()
+
+
+def _package_files():
+    """(path on disk, name in the archive) of every module and template, sorted"""
+    files = []
+    for root, dirs, names in os.walk(PACKAGE_DIR):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(names):
+            if name.endswith((".py", ".html")):
+                path = os.path.join(root, name)
+                files.append((path, os.path.relpath(path, PACKAGE_PARENT).replace(os.sep, "/")))
+    return files
+
+
+def _template_caches(work_dir):
+    """Compile every top-level template into work_dir, as email_templates caches them"""
+    template_dir = os.path.join(PACKAGE_DIR, "templates")
+    previous = os.environ.get("QUIKAPP_TEMPLATE_CACHE")
+    os.environ["QUIKAPP_TEMPLATE_CACHE"] = work_dir
+    try:
+        for name in sorted(os.listdir(template_dir)):
+            if name.endswith(".html"):
+                email_templates.get_template(name, template_dir)
+    finally:
+        if previous is None:
+            os.environ.pop("QUIKAPP_TEMPLATE_CACHE", None)
+        else:
+            os.environ["QUIKAPP_TEMPLATE_CACHE"] = previous
+    return sorted(name for name in os.listdir(work_dir) if name.endswith(".marshal"))
+
+
+def build(output=DEFAULT_OUTPUT):
+    """Write the zipapp to output (atomically) and return the number of files in it"""
+    if not os.path.isdir(PACKAGE_DIR):
+        raise OSError(f"{PACKAGE_DIR} is not a package checkout")
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    try:
+        count = _write(tmp_path)
+        os.chmod(tmp_path, 0o755)
+        os.replace(tmp_path, output)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def _write(path):
+    """Write the archive to path and return the number of files in it"""
+    count = 0
+    with tempfile.TemporaryDirectory(prefix="quikapp-zipapp-") as work_dir:
+        cache_dir = os.path.join(work_dir, "templates")
+        os.makedirs(cache_dir)
+        with open(path, "wb") as f:
+            f.write(f"#!{INTERPRETER}\n".encode("utf-8"))
+            # Stored, not deflated: the archive is small and imports skip decompression
+            with zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) as archive:
+                main_path = os.path.join(work_dir, "__main__.py")
+                with open(main_path, "w", encoding="utf-8") as main_file:
+                    main_file.write(MAIN)
+                archive.write(main_path, "__main__.py")
+                archive.writestr("__main__.pyc", _compile(main_path, "__main__.py", work_dir))
+                count += 2
+                for source, name in _package_files():
+                    archive.write(source, name)
+                    count += 1
+                    if name.endswith(".py"):
+                        archive.writestr(name + "c", _compile(source, name, work_dir))
+                        count += 1
+                for name in _template_caches(cache_dir):
+                    archive.write(os.path.join(cache_dir, name), f"{__package__}/templates/__pycache__/{name}")
+                    count += 1
+    return count
+
+
+def main():
+    """Main function to handle command line arguments"""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if len(sys.argv) > 2:
+        print("Usage: python -m quikapp_notify.build_zipapp [output.pyz]")
+        return 1
+    output = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT)
+    try:
+        count = build(output)
+    except (OSError, py_compile.PyCompileError, email_templates.TemplateError) as e:
+        logger.error(f"❌ Could not build {output}: {e}")
+        return 1
+    logger.info(f"📦 Built {output} ({count} files, {os.path.getsize(output) // 1024} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
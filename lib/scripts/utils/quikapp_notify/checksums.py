@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+QuikApp Artifact Checksums
+SHA-256 checksums for the artifacts in the success email and output/manifest.json.
+
+Files are hashed on a thread pool, one file per task. Each worker reads in 1 MB chunks
+into a reused buffer and hashlib releases the GIL while it digests them, so several
+APK/AAB/IPA files hash in parallel. Results are cached in memory and in a small JSON file
+(QUIKAPP_CHECKSUM_CACHE, default quikapp-checksums.json in the temp directory), keyed by
+(device, inode, size, mtime_ns), so a repeat notification for the same build never
+re-reads the files. The cache keeps the MAX_CACHE_ENTRIES most recently used digests, so
+it stays small on long-lived runners.
+
+Usage:
+    python -m quikapp_notify.checksums <file> [file ...]   # print sha256sum-style lines
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("checksums")
+
+CHUNK_SIZE = 1024 * 1024
+MAX_WORKERS = 4
+# Digests kept in the cache, most recently used first to survive; a few builds' worth of artifacts
+MAX_CACHE_ENTRIES = 256
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# cache key -> hex digest; loaded from the cache file on first use
+_digests = None
+
+
+def _cache_file():
+    return os.environ.get("QUIKAPP_CHECKSUM_CACHE") or os.path.join(tempfile.gettempdir(), "quikapp-checksums.json")
+
+
+def _key(st):
+    return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _load_cache():
+    global _digests
+    if _digests is None:
+        try:
+            with open(_cache_file(), "r", encoding="utf-8") as f:
+                _digests = dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            _digests = {}
+    return _digests
+
+
+def _save_cache(digests):
+    # Oldest entries first (see sha256_files), so the tail is what was used last
+    for key in list(digests)[:max(len(digests) - MAX_CACHE_ENTRIES, 0)]:
+        del digests[key]
+    path = _cache_file()
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(digests, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Checksum cache not writable ({e}), continuing without it")
+
+
+def sha256_file(path, chunk_size=CHUNK_SIZE):
+    """Hex SHA-256 of a file, read in chunks into one reused buffer"""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+
+def sha256_files(files, workers=None):
+    """{path: hex digest} for (path, stat result or None) pairs, using and filling the cache"""
+    digests = _load_cache()
+    results = {}
+    pending = []
+    for path, st in files:
+        try:
+            key = _key(st if st is not None else os.stat(path))
+        except OSError as e:
+            logger.warning(f"⚠️ Cannot checksum {path}: {e}")
+            continue
+        if key in digests:
+            # Moved to the end: recently used entries are the last to be evicted
+            results[path] = digests[key] = digests.pop(key)
+        else:
+            pending.append((path, key))
+    if not pending:
+        return results
+
+    started = time.perf_counter()
+    workers = workers or min(len(pending), os.cpu_count() or 1, MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(path, key, pool.submit(sha256_file, path)) for path, key in pending]
+        for path, key, future in futures:
+            try:
+                results[path] = digests[key] = future.result()
+            except OSError as e:
+                logger.warning(f"⚠️ Cannot checksum {path}: {e}")
+    logger.info(f"🔐 Hashed {len(pending)} artifact(s) in {time.perf_counter() - started:.2f}s")
+    _save_cache(digests)
+    return results
+
+
+def add_checksums(found):
+    """Set 'sha256' on every file artifact from artifacts.discover (bundle directories get None)"""
+    files = [(a['full_path'], a['stat']) for a in found if not a['bundle']]
+    digests = sha256_files(files)
+    for artifact in found:
+        artifact['sha256'] = digests.get(artifact['full_path'])
+    return found
+
+
+def write_manifest(output_dir, found, **build_info):
+    """Write manifest.json with every artifact's path, size, checksum, download link and metadata; returns its path or None"""
+    manifest = dict(build_info)
+    manifest.update({
+        "manifest_version": MANIFEST_VERSION,
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "artifacts": [{
+            "path": a['path'],
+            "name": a['name'],
+            "bytes": a['bytes'],
+            "sha256": a.get('sha256'),
+            "download_url": a.get('download_url'),
+            "link_source": a.get('link_source'),
+            "metadata": a.get('metadata'),
+        } for a in found],
+    })
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write {path}: {e}")
+        return None
+    logger.info(f"📝 Wrote artifact manifest {path}")
+    return path
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) < 2:
+        print("Usage: python -m quikapp_notify.checksums <file> [file ...]")
+        return 1
+    digests = sha256_files([(path, None) for path in sys.argv[1:]])
+    for path in sys.argv[1:]:
+        if path in digests:
+            print(f"{digests[path]}  {path}")
+    return 0 if len(digests) == len(sys.argv) - 1 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+QuikApp Email Templates
+Small compiled template engine for the notification emails.
+
+Template files in templates/ use two constructs:
+    {{ name }}                    value, HTML-escaped
+    {{ name|raw }}                value inserted as-is (pre-rendered HTML fragments, str or bytes)
+    {% include "file.html" %}     another template file, inlined at compile time
+
+Before compiling, html_optimizer inlines CSS and strips insignificant whitespace
+(disable with QUIKAPP_TEMPLATE_OPTIMIZE=false). A template then compiles to a list of
+pre-encoded UTF-8 byte chunks with slot positions. Compiled templates are cached in
+memory and on disk (templates/__pycache__, or QUIKAPP_TEMPLATE_CACHE), keyed by the
+SHA-256 of the expanded source, so an unchanged template is never re-parsed or re-optimized. Within a process a template is only re-read when the mtime
+or size of one of its files changes.
+
+From the zipapp, templates and their prebuilt caches are read from the archive, which
+does not change under a running process (see build_zipapp).
+"""
+
+import os
+import re
+import html
+import marshal
+import hashlib
+import logging
+
+from . import html_optimizer
+
+logger = logging.getLogger("email_templates")
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+# Bump when the compiled format changes so stale cache files are ignored
+ENGINE_VERSION = 1
+
+_SLOT_RE = re.compile(r'\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*(\|\s*raw\s*)?\}\}')
+_INCLUDE_RE = re.compile(r'\{%\s*include\s+"([^"]+)"\s*%\}')
+
+# (template_dir, name) -> (file stamp, Template)
+_compiled = {}
+
+# Path of the .pyz when the package is imported from the zipapp
+_ARCHIVE = getattr(__loader__, "archive", None)
+
+
+class TemplateError(Exception):
+    """Raised for missing templates, include cycles and missing slot values"""
+
+
+class Template:
+    """Compiled template: static byte chunks with slots filled at render time"""
+
+    __slots__ = ("name", "digest", "parts", "slots")
+
+    def __init__(self, name, digest, parts, slots):
+        self.name = name
+        self.digest = digest
+        # parts holds static bytes, with None at every slot index
+        self.parts = parts
+        # slots is a tuple of (index into parts, value name, escape flag)
+        self.slots = slots
+
+    @property
+    def names(self):
+        """Names of all values the template expects"""
+        return sorted({name for _, name, _ in self.slots})
+
+    def render(self, **values):
+        """Render to UTF-8 bytes"""
+        out = list(self.parts)
+        for index, name, escape in self.slots:
+            try:
+                value = values[name]
+            except KeyError:
+                raise TemplateError(f"{self.name}: no value for '{name}'") from None
+            if isinstance(value, bytes):
+                if not escape:
+                    out[index] = value
+                    continue
+                value = value.decode("utf-8")
+            elif not isinstance(value, str):
+                value = str(value)
+            out[index] = (html.escape(value) if escape else value).encode("utf-8")
+        return b"".join(out)
+
+    def render_text(self, **values):
+        """Render to str"""
+        return self.render(**values).decode("utf-8")
+
+
+def _in_archive(path):
+    return _ARCHIVE is not None and path.startswith(_ARCHIVE + os.sep)
+
+
+def _read_bytes(path):
+    """Contents of a file in the template or cache directory, on disk or in the zipapp"""
+    if _in_archive(path):
+        return __loader__.get_data(path)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _expand(name, template_dir, stack=(), files=None):
+    """Read a template and inline its includes, recording every file read in files"""
+    if name in stack:
+        raise TemplateError(f"Include cycle: {' -> '.join(stack + (name,))}")
+    path = os.path.join(template_dir, name)
+    try:
+        source = _read_bytes(path).decode("utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        raise TemplateError(f"Cannot read template {name}: {e}") from None
+    if files is not None:
+        files.append(path)
+    return _INCLUDE_RE.sub(
+        lambda m: _expand(m.group(1), template_dir, stack + (name,), files).rstrip("\n"), source)
+
+
+def _stamp(paths):
+    """(path, mtime, size) signature of the files a template was built from, None if one is gone"""
+    stamp = []
+    try:
+        for path in paths:
+            if _in_archive(path):
+                stamp.append((path, 0, 0))
+            else:
+                st = os.stat(path)
+                stamp.append((path, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return None
+    return tuple(stamp)
+
+
+def compile_source(name, source, digest=""):
+    """Compile expanded template source into a Template"""
+    parts = []
+    slots = []
+    position = 0
+    for match in _SLOT_RE.finditer(source):
+        if match.start() > position:
+            parts.append(source[position:match.start()].encode("utf-8"))
+        slots.append((len(parts), match.group(1), not match.group(2)))
+        parts.append(None)
+        position = match.end()
+    if position < len(source):
+        parts.append(source[position:].encode("utf-8"))
+    return Template(name, digest, parts, tuple(slots))
+
+
+def _cache_path(name, digest, template_dir):
+    cache_dir = os.environ.get("QUIKAPP_TEMPLATE_CACHE") or os.path.join(template_dir, "__pycache__")
+    return os.path.join(cache_dir, f"{name}.{digest[:16]}.v{ENGINE_VERSION}.marshal")
+
+
+def _load_cached(name, digest, template_dir):
+    try:
+        parts, slots = marshal.loads(_read_bytes(_cache_path(name, digest, template_dir)))
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return Template(name, digest, list(parts), tuple(tuple(slot) for slot in slots))
+
+
+def _store_cached(template, template_dir):
+    path = _cache_path(template.name, template.digest, template_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump((tuple(template.parts), template.slots), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Template cache not writable ({e}), continuing without it")
+
+
+def _optimize_enabled():
+    return os.environ.get("QUIKAPP_TEMPLATE_OPTIMIZE", "true").lower() != "false"
+
+
+def get_template(name, template_dir=TEMPLATE_DIR):
+    """Return the compiled template, from memory, the disk cache, or a fresh compile"""
+    key = (template_dir, name)
+    cached = _compiled.get(key)
+    if cached is not None and cached[0] is not None and _stamp(p for p, _, _ in cached[0]) == cached[0]:
+        return cached[1]
+
+    files = []
+    source = _expand(name, template_dir, files=files)
+    optimize = _optimize_enabled()
+    tag = f"optimizer-{html_optimizer.OPTIMIZER_VERSION}" if optimize else "plain"
+    digest = hashlib.sha256(f"{tag}\n{source}".encode("utf-8")).hexdigest()
+    if cached is not None and cached[1].digest == digest:
+        template = cached[1]
+    else:
+        template = _load_cached(name, digest, template_dir)
+        if template is None:
+            if optimize:
+                source = html_optimizer.optimize(source)
+            template = compile_source(name, source, digest)
+            _store_cached(template, template_dir)
+    _compiled[key] = (_stamp(files), template)
+    return template
+
+
+def render(name, **values):
+    """Render a template file to str"""
+    return get_template(name).render_text(**values)
+
+
+def render_bytes(name, **values):
+    """Render a template file to UTF-8 bytes"""
+    return get_template(name).render(**values)
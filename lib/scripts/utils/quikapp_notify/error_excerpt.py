@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+QuikApp Error Excerpt
+Builds the error excerpt for build_failed / iOS error emails from a build log.
+
+The log is read once, in fixed-size chunks, so memory stays bounded no matter how large
+the log is. The excerpt holds the lines matching known error signatures (Xcode, Gradle,
+Flutter) followed by the last QUIKAPP_ERROR_TAIL_KB kilobytes of the log (default 16).
+
+When the log is a file, render_error_details shows the ranked error sites from log_index
+instead, and falls back to the excerpt when no known signature matches.
+
+Usage:
+    python -m quikapp_notify.error_excerpt <log file | ->   # print the excerpt that would be emailed
+"""
+
+import os
+import re
+import sys
+import logging
+from collections import deque
+
+logger = logging.getLogger("error_excerpt")
+
+DEFAULT_TAIL_KB = 16
+DEFAULT_MAX_MATCHES = 50
+CHUNK_SIZE = 1024 * 1024
+# Longer lines are cut when kept as a match, so one minified blob cannot blow the budget
+MAX_LINE_BYTES = 1024
+
+ERROR_SIGNATURES = re.compile(
+    rb'error:|FAILURE:|\*\* BUILD FAILED \*\*|\* What went wrong:|Error: |Exception:|fatal:',
+)
+_ANSI_RE = re.compile(rb'\x1b\[[0-9;]*[A-Za-z]')
+
+
+def _env_int(name, default):
+    """Non-negative integer setting from the environment; default when unset or malformed"""
+    value = os.environ.get(name, "")
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        logger.warning(f"⚠️ Ignoring {name}={value!r}, using {default}")
+        return default
+    return number
+
+
+def pop_error_file(args):
+    """Remove --error-file PATH / --error-file=PATH from args; returns (args, path or None)"""
+    remaining = []
+    path = None
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--error-file" and i + 1 < len(args):
+            path = args[i + 1]
+            i += 2
+            continue
+        if arg.startswith("--error-file="):
+            path = arg.split("=", 1)[1]
+        else:
+            remaining.append(arg)
+        i += 1
+    return remaining, path
+
+
+def scan(stream, tail_bytes, max_matches=DEFAULT_MAX_MATCHES, chunk_size=CHUNK_SIZE):
+    """One pass over a binary stream; returns (matches, tail, tail_offset, total_bytes, total_matches)
+
+    matches holds (line number, byte offset, line) for the last max_matches signature lines.
+    Signatures are searched chunk-wide and lines are only located around a hit, so the
+    per-byte work stays in C.
+    """
+    matches = deque(maxlen=max_matches)
+    total_matches = 0
+    tail = bytearray()
+    offset = 0          # byte offset of the start of `partial`
+    line_number = 1     # line number of the start of `partial`
+    partial = b""
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        tail += chunk
+        if len(tail) > tail_bytes:
+            del tail[:len(tail) - tail_bytes]
+
+        data = partial + chunk
+        cut = data.rfind(b"\n") + 1
+        if cut == 0 and len(data) > MAX_LINE_BYTES * 64:
+            # Pathologically long line: treat what we have as a line of its own
+            cut = len(data) - MAX_LINE_BYTES
+        counted = 0
+        last_line_start = -1
+        for match in ERROR_SIGNATURES.finditer(data, 0, cut):
+            line_start = data.rfind(b"\n", 0, match.start()) + 1
+            if line_start == last_line_start:
+                continue
+            line_end = data.find(b"\n", match.start(), cut)
+            line_number += data.count(b"\n", counted, line_start)
+            counted = last_line_start = line_start
+            total_matches += 1
+            line = data[line_start:line_end if line_end >= 0 else cut]
+            matches.append((line_number, offset + line_start, line[:MAX_LINE_BYTES]))
+        line_number += data.count(b"\n", counted, cut)
+        offset += cut
+        partial = data[cut:]
+
+    if partial and ERROR_SIGNATURES.search(partial):
+        total_matches += 1
+        matches.append((line_number, offset, partial[:MAX_LINE_BYTES]))
+    total = offset + len(partial)
+    return list(matches), bytes(tail), total - len(tail), total, total_matches
+
+
+def _text(data):
+    return _ANSI_RE.sub(b"", data).decode("utf-8", errors="replace").rstrip()
+
+
+def build_excerpt(stream, tail_kb=None, max_matches=DEFAULT_MAX_MATCHES):
+    """Return the excerpt text for a binary stream"""
+    if tail_kb is None:
+        tail_kb = _env_int("QUIKAPP_ERROR_TAIL_KB", DEFAULT_TAIL_KB)
+    matches, tail, tail_offset, total, total_matches = scan(stream, tail_kb * 1024, max_matches)
+
+    # Lines already inside the tail would be shown twice
+    earlier = [(number, line) for number, line_offset, line in matches if line_offset < tail_offset]
+    sections = []
+    if earlier:
+        shown = f"{len(earlier)} of {total_matches}" if total_matches > len(matches) else str(len(earlier))
+        lines = "\n".join(f"{number:>7}: {_text(line)}" for number, line in earlier)
+        sections.append(f"Error lines before the tail ({shown}):\n{lines}")
+    if tail_offset > 0:
+        # Drop the partial first line of the tail
+        newline = tail.find(b"\n")
+        tail = tail[newline + 1:] if 0 <= newline < len(tail) - 1 else tail
+        sections.append(f"Last {len(tail) // 1024 or 1} KB of {total // 1024} KB log:\n{_text(tail)}")
+    else:
+        sections.append(_text(tail))
+    return "\n\n".join(sections)
+
+
+def read_excerpt(path, base_dir="", tail_kb=None):
+    """Excerpt from a log file, or from stdin when path is '-'"""
+    if path == "-":
+        return build_excerpt(sys.stdin.buffer, tail_kb)
+    with open(os.path.join(base_dir, path), "rb") as f:
+        return build_excerpt(f, tail_kb)
+
+
+def render_error_details(error_message, error_log=None, text_template="error_text.html"):
+    """HTML for the error section of an email: top error sites of the log, else plain text"""
+    # Imported here so notify_client can use the excerpt helpers without loading the renderer
+    from . import email_templates
+    from . import log_index
+
+    if error_log and error_log != "-":
+        try:
+            top = _env_int("QUIKAPP_ERROR_TOP", log_index.DEFAULT_TOP)
+            sites = log_index.index_log(error_log, top=top)
+            if sites:
+                return render_sites(sites, os.path.getsize(error_log))
+            error_message = read_excerpt(error_log)
+        except OSError as e:
+            error_message = f"{error_message}\n\n(Could not read build log {error_log}: {e})"
+    return email_templates.render(text_template, text=error_message)
+
+
+def render_sites(sites, log_bytes):
+    """Render log_index sites with the error_summary / error_site templates"""
+    from . import email_templates
+
+    site_template = email_templates.get_template("error_site.html")
+    rendered = b"".join(site_template.render(
+        tool=site["tool"],
+        line=site["line"],
+        repeat=f" · seen {site['count']} times" if site["count"] > 1 else "",
+        message=site["message"],
+        location=site.get("location") or "",
+        context=site.get("context", ""),
+    ) for site in sites)
+    size = f"{log_bytes / 1048576:.1f} MB" if log_bytes >= 1048576 else f"{log_bytes // 1024 or 1} KB"
+    headline = f"Top {len(sites)} error site{'s' if len(sites) != 1 else ''} from the {size} build log"
+    return email_templates.render("error_summary.html", headline=headline, sites=rendered)
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) < 2:
+        print("Usage: python -m quikapp_notify.error_excerpt <log file | ->")
+        return 1
+    print(read_excerpt(sys.argv[1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+QuikApp HTML Optimizer
+Precompile pass that shrinks notification templates before email_templates compiles them.
+
+    - resolves CSS custom properties (:root { --x: ... } / var(--x)) to literal values
+    - inlines <style> rules into the style attribute of every element they match, keeping
+      only the rules that cannot be inlined (:hover, ::before, @media ...) and that the
+      template actually uses
+    - canonicalizes style attributes so repeated declarations collapse and identical
+      styles serialize to identical strings
+    - drops comments and whitespace that does not affect rendering (<pre> is left alone)
+
+Template syntax ({{ slot }}, {{ slot|raw }}) passes through untouched, so the output can
+be compiled like any other template source.
+
+Usage:
+    python -m quikapp_notify.html_optimizer <template.html>   # print the optimized source (includes expanded) and the size change
+"""
+
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+# Bump when the output changes so cached compiled templates are rebuilt
+OPTIMIZER_VERSION = 1
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_STYLE_BLOCK_RE = re.compile(r'<style\b[^>]*>(.*?)</style>', re.S | re.I)
+_CLASS_ATTR_RE = re.compile(r'\bclass\s*=\s*"([^"]*)"', re.I)
+_VAR_RE = re.compile(r'var\(\s*(--[\w-]+)\s*(?:,\s*([^()]*(?:\([^()]*\)[^()]*)*))?\)')
+_COMPOUND_RE = re.compile(r'^([a-z][a-z0-9]*)?((?:\.[\w-]+)*)$', re.I)
+_LONG_HEX_RE = re.compile(r'#([0-9a-f])\1([0-9a-f])\2([0-9a-f])\3\b', re.I)
+_LEADING_ZERO_RE = re.compile(r'(?<![\w.])0\.(\d)')
+_WS_RE = re.compile(r'\s+')
+
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+                 "source", "track", "wbr"}
+# Whitespace next to these tags never renders, so it can be removed outright
+BLOCK_ELEMENTS = {"html", "head", "body", "title", "meta", "link", "style", "div", "p", "h1",
+                  "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "pre", "table", "thead",
+                  "tbody", "tr", "td", "th", "br", "hr"}
+PREFORMATTED = {"pre", "textarea"}
+
+
+def _split_top_level(text, separator):
+    """Split on separator outside quotes and parentheses"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def parse_declarations(text):
+    """Parse 'a: b; c: d' into an ordered list of (property, value)"""
+    declarations = []
+    for item in _split_top_level(text, ";"):
+        prop, sep, value = item.partition(":")
+        prop = prop.strip()
+        if sep and prop and value.strip():
+            declarations.append((prop if prop.startswith("--") else prop.lower(), value.strip()))
+    return declarations
+
+
+def parse_stylesheet(css):
+    """Parse CSS into (selector, declarations) rules; at-rules become (prelude, [rules])"""
+    css = _COMMENT_RE.sub("", css)
+    rules = []
+    position = 0
+    while True:
+        open_brace = css.find("{", position)
+        if open_brace < 0:
+            break
+        prelude = css[position:open_brace].strip()
+        depth = 1
+        i = open_brace + 1
+        while i < len(css) and depth:
+            if css[i] == "{":
+                depth += 1
+            elif css[i] == "}":
+                depth -= 1
+            i += 1
+        body = css[open_brace + 1:i - 1]
+        if prelude.startswith("@"):
+            rules.append((_WS_RE.sub(" ", prelude), parse_stylesheet(body)))
+        else:
+            rules.append((_WS_RE.sub(" ", prelude), parse_declarations(body)))
+        position = i
+    return rules
+
+
+def resolve_variables(value, variables, depth=0):
+    """Replace var(--name, fallback) with the variable's value"""
+    if "var(" not in value or depth > 10:
+        return value
+
+    def substitute(match):
+        name, fallback = match.group(1), match.group(2)
+        if name in variables:
+            return variables[name]
+        return fallback.strip() if fallback else match.group(0)
+
+    return resolve_variables(_VAR_RE.sub(substitute, value), variables, depth + 1)
+
+
+def minify_value(value):
+    """Collapse whitespace and shorten colors/numbers outside quoted strings"""
+    pieces = re.split(r"('[^']*'|\"[^\"]*\")", value)
+    for i in range(0, len(pieces), 2):
+        piece = _WS_RE.sub(" ", pieces[i])
+        piece = re.sub(r"\s*,\s*", ",", piece)
+        piece = re.sub(r"\(\s+", "(", re.sub(r"\s+\)", ")", piece))
+        piece = _LONG_HEX_RE.sub(lambda m: "#" + m.group(1) + m.group(2) + m.group(3), piece)
+        pieces[i] = _LEADING_ZERO_RE.sub(r".\1", piece)
+    return "".join(pieces).strip()
+
+
+def serialize_declarations(declarations, important=False):
+    """Canonical 'a:b;c:d' form; later duplicates of a property win"""
+    merged = {}
+    for prop, value in declarations:
+        merged.pop(prop, None)
+        merged[prop] = value
+    suffix = "!important" if important else ""
+    return ";".join(f"{prop}:{minify_value(value)}{suffix}" for prop, value in merged.items())
+
+
+def parse_selector(selector):
+    """Return [(tag, classes), ...] for descendant-only selectors, None if not inlinable"""
+    compounds = []
+    for token in selector.split():
+        match = _COMPOUND_RE.match(token)
+        if not match or not (match.group(1) or match.group(2)):
+            return None
+        tag = (match.group(1) or "").lower()
+        classes = frozenset(c for c in match.group(2).split(".") if c)
+        compounds.append((tag, classes))
+    return compounds or None
+
+
+def _compound_matches(compound, tag, classes):
+    want_tag, want_classes = compound
+    return (not want_tag or want_tag == tag) and want_classes <= classes
+
+
+def selector_matches(compounds, tag, classes, ancestors):
+    """Match element (tag, classes) with ancestors (outermost first) against a selector"""
+    if not _compound_matches(compounds[-1], tag, classes):
+        return False
+    remaining = len(compounds) - 2
+    for ancestor_tag, ancestor_classes in reversed(ancestors):
+        if remaining < 0:
+            break
+        if _compound_matches(compounds[remaining], ancestor_tag, ancestor_classes):
+            remaining -= 1
+    return remaining < 0
+
+
+def _selector_names(selector):
+    """Class names referenced by a selector"""
+    return set(re.findall(r"\.([\w-]+)", selector))
+
+
+class StyleSheet:
+    """Stylesheet split into inlinable rules and the residual rules that stay in <style>"""
+
+    def __init__(self, css, used_classes):
+        self.variables = {}
+        self.inline_rules = []
+        self.residual = []
+        order = 0
+
+        rules = parse_stylesheet(css)
+        for selector, declarations in rules:
+            if selector == ":root" and isinstance(declarations, list):
+                self.variables.update((p, v) for p, v in declarations if p.startswith("--"))
+
+        for prelude, body in rules:
+            if prelude.startswith("@"):
+                kept = [(s, self._resolve(d)) for s, d in body
+                        if not prelude.startswith("@media") or self._is_used(s, used_classes)]
+                if kept:
+                    self.residual.append((prelude, kept))
+                continue
+            declarations = [(p, v) for p, v in self._resolve(body) if not p.startswith("--")]
+            if not declarations:
+                continue
+            for selector in (s.strip() for s in prelude.split(",")):
+                compounds = parse_selector(selector)
+                if compounds is not None:
+                    specificity = (sum(len(c) for _, c in compounds), sum(1 for t, _ in compounds if t))
+                    self.inline_rules.append((specificity, order, compounds, declarations))
+                    order += 1
+                elif self._is_used(selector, used_classes):
+                    self.residual.append((selector, declarations))
+
+    def _resolve(self, declarations):
+        return [(p, resolve_variables(v, self.variables)) for p, v in declarations]
+
+    @staticmethod
+    def _is_used(selector, used_classes):
+        return _selector_names(selector) <= used_classes
+
+    def declarations_for(self, tag, classes, ancestors):
+        """Declarations of every matching inlinable rule, in cascade order"""
+        matched = [(spec, order, decls) for spec, order, compounds, decls in self.inline_rules
+                   if selector_matches(compounds, tag, classes, ancestors)]
+        matched.sort(key=lambda item: (item[0], item[1]))
+        return [d for _, _, decls in matched for d in decls]
+
+    @property
+    def residual_classes(self):
+        names = set()
+        for prelude, body in self.residual:
+            if prelude.startswith("@"):
+                for selector, _ in body:
+                    names |= _selector_names(selector)
+            else:
+                names |= _selector_names(prelude)
+        return names
+
+    def residual_css(self):
+        """Minified CSS for the rules that could not be inlined; !important so they beat inline styles"""
+        out = []
+        for prelude, body in self.residual:
+            if prelude.startswith("@"):
+                inner = "".join(f"{s}{{{serialize_declarations(d, important=True)}}}" for s, d in body)
+                out.append(f"{minify_value(prelude)}{{{inner}}}")
+            else:
+                out.append(f"{prelude}{{{serialize_declarations(body, important=True)}}}")
+        return "".join(out)
+
+
+def _attr(value):
+    return value.replace("&", "&amp;").replace('"', "&quot;").replace("<", "&lt;")
+
+
+class _Rewriter(HTMLParser):
+    """Streams the document back out with inlined styles and collapsed whitespace"""
+
+    def __init__(self, stylesheet):
+        super().__init__(convert_charrefs=False)
+        self.stylesheet = stylesheet
+        self.keep_classes = stylesheet.residual_classes
+        self.out = []
+        self.stack = []
+        self.preformatted = 0
+        self.in_style = False
+        self.style_written = False
+        self.strip_leading = True
+        self.last_text = False
+
+    def _emit_tag(self, text, tag):
+        if tag in BLOCK_ELEMENTS and not self.preformatted:
+            if self.last_text:
+                self.out[-1] = self.out[-1].rstrip()
+            self.strip_leading = True
+        else:
+            self.strip_leading = False
+        self.out.append(text)
+        self.last_text = False
+
+    def _rewrite_tag(self, tag, attrs, self_closing):
+        classes = frozenset()
+        for name, value in attrs:
+            if name == "class" and value:
+                classes = frozenset(value.split())
+        ancestors = [(t, c) for t, c in self.stack]
+
+        declarations = self.stylesheet.declarations_for(tag, classes, ancestors)
+        rebuilt = [f"<{tag}"]
+        has_style = False
+        for name, value in attrs:
+            if name == "class":
+                kept = [c for c in (value or "").split() if c in self.keep_classes]
+                if kept:
+                    rebuilt.append(f' class="{_attr(" ".join(kept))}"')
+                continue
+            if name == "style":
+                has_style = True
+                declarations = declarations + parse_declarations(value or "")
+                declarations = [(p, resolve_variables(v, self.stylesheet.variables)) for p, v in declarations]
+                if declarations:
+                    rebuilt.append(f' style="{_attr(serialize_declarations(declarations))}"')
+                continue
+            rebuilt.append(f' {name}' if value is None else f' {name}="{_attr(value)}"')
+        if declarations and not has_style:
+            rebuilt.append(f' style="{_attr(serialize_declarations(declarations))}"')
+        rebuilt.append("/>" if self_closing else ">")
+        return "".join(rebuilt), classes
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "style":
+            self.in_style = True
+            if not self.style_written:
+                self.style_written = True
+                css = self.stylesheet.residual_css()
+                if css:
+                    self._emit_tag(f"<style>{css}</style>", tag)
+            return
+        text, classes = self._rewrite_tag(tag, attrs, False)
+        self._emit_tag(text, tag)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append((tag, classes))
+            if tag in PREFORMATTED:
+                self.preformatted += 1
+
+    def handle_startendtag(self, tag, attrs):
+        text, _ = self._rewrite_tag(tag, attrs, True)
+        self._emit_tag(text, tag)
+
+    def handle_endtag(self, tag):
+        if tag == "style":
+            self.in_style = False
+            return
+        if tag in VOID_ELEMENTS:
+            return
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                for open_tag, _ in self.stack[i:]:
+                    if open_tag in PREFORMATTED:
+                        self.preformatted -= 1
+                del self.stack[i:]
+                break
+        self._emit_tag(f"</{tag}>", tag)
+
+    def handle_data(self, data):
+        if self.in_style:
+            return
+        if self.preformatted:
+            self.out.append(data)
+            self.strip_leading = False
+            self.last_text = False
+            return
+        text = _WS_RE.sub(" ", data)
+        if self.strip_leading:
+            text = text.lstrip()
+        if text:
+            self.out.append(text)
+            self.strip_leading = text.endswith(" ")
+            self.last_text = True
+
+    def handle_entityref(self, name):
+        self.handle_data(f"&{name};")
+
+    def handle_charref(self, name):
+        self.handle_data(f"&#{name};")
+
+    def handle_comment(self, data):
+        if data.startswith("[if"):  # Outlook conditional comments carry markup
+            self.out.append(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._emit_tag(f"<!{decl}>", "html")
+
+    def result(self):
+        return "".join(self.out).strip()
+
+
+def optimize(source):
+    """Return the optimized equivalent of an HTML template source"""
+    css = "\n".join(_STYLE_BLOCK_RE.findall(source))
+    used_classes = set()
+    for value in _CLASS_ATTR_RE.findall(source):
+        used_classes.update(value.split())
+
+    rewriter = _Rewriter(StyleSheet(css, used_classes))
+    rewriter.feed(source)
+    rewriter.close()
+    return rewriter.result()
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) < 2:
+        print("Usage: python -m quikapp_notify.html_optimizer <template.html>")
+        return 1
+    from . import email_templates
+
+    path = os.path.abspath(sys.argv[1])
+    source = email_templates._expand(os.path.basename(path), os.path.dirname(path))
+    optimized = optimize(source)
+    print(optimized)
+    before, after = len(source.encode("utf-8")), len(optimized.encode("utf-8"))
+    print(f"\n{sys.argv[1]}: {before} -> {after} bytes ({100 - after * 100 // max(before, 1)}% smaller)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
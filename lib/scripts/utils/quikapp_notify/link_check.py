@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+QuikApp Link Check
+Verifies that artifact download links answer before the success email goes out.
+
+Every URL gets a HEAD request, retried as a one-byte ranged GET when the server refuses
+HEAD or rejects it with 400 / 403 (signed storage URLs whose signature covers GET only).
+Requests run concurrently on a small thread pool over keep-alive http.client
+connections that are pooled per host (scheme, host, port), at most MAX_PER_HOST at a
+time, so several links to the same storage host share one TLS handshake. Redirects
+are followed up to MAX_REDIRECTS hops.
+
+All checks share one time budget (QUIKAPP_LINK_CHECK_BUDGET seconds, default 5); a link
+that could not be checked in time, or whose host could not be reached, is reported as
+unknown and left alone. Only an HTTP error status (4xx / 5xx) marks a link dead.
+Results are cached per URL in memory, live ones for LIVE_TTL and dead ones for
+DEAD_TTL seconds, so the daemon does not re-check links of a build it already sent.
+A URL that cannot be requested at all (bad port, control characters) counts as dead.
+benchmarks/bench_link_check.py runs every case against a local http.server stand-in.
+
+Usage:
+    python -m quikapp_notify.link_check <url> [url ...]   # print the status of every URL
+"""
+
+import os
+import sys
+import math
+import time
+import logging
+import threading
+import http.client
+from urllib.parse import urljoin, urlsplit
+from concurrent.futures import ThreadPoolExecutor, wait
+
+logger = logging.getLogger("link_check")
+
+DEFAULT_BUDGET = 5.0
+DEFAULT_TIMEOUT = 3.0
+MAX_WORKERS = 8
+MAX_PER_HOST = 2
+MAX_REDIRECTS = 3
+# HEAD answers that do not mean the link is dead: HEAD unsupported, or a signature made for GET
+RETRY_WITH_GET = (400, 403, 405, 501)
+LIVE_TTL = 600
+DEAD_TTL = 60
+USER_AGENT = "QuikApp-LinkCheck/1.0"
+
+# url -> (ok, detail, checked_at)
+_results = {}
+_results_lock = threading.Lock()
+
+
+class HostPool:
+    """Idle keep-alive connections per (scheme, host, port), with a per-host concurrency cap"""
+
+    def __init__(self, max_per_host=MAX_PER_HOST):
+        self.max_per_host = max_per_host
+        self._idle = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def acquire(self, key, timeout):
+        """(connection, reused) for key, waiting at most timeout for a free slot; None when none came free"""
+        if not self._slot(key).acquire(timeout=max(timeout, 0)):
+            return None
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if scheme == "https":
+            # Shares the SMTP sessions' SSL context; imported here so plain-HTTP checks skip smtplib
+            from .smtp_session import get_ssl_context
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=get_ssl_context())
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def release(self, key, conn, reusable):
+        """Return a connection to the pool (or close it) and free its slot"""
+        if reusable:
+            with self._lock:
+                self._idle.setdefault(key, []).append(conn)
+        else:
+            conn.close()
+        self._slot(key).release()
+
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+_pool = HostPool()
+
+
+def _host_key(parts):
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return parts.scheme, parts.hostname, port
+
+
+def _request(key, target, deadline, method, headers):
+    """(status, location) of one request on a pooled connection; retries once if a reused connection was stale"""
+    for attempt in range(2):
+        timeout = min(DEFAULT_TIMEOUT, deadline - time.monotonic())
+        if timeout <= 0:
+            raise TimeoutError("link check budget exhausted")
+        acquired = _pool.acquire(key, timeout)
+        if acquired is None:
+            raise TimeoutError("link check budget exhausted")
+        conn, reused = acquired
+        reusable = False
+        try:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            conn.request(method, target, headers=headers)
+            response = conn.getresponse()
+            if method == "HEAD":
+                response.read()
+                reusable = not response.will_close
+            else:
+                # The server may ignore Range; never read a whole artifact, drop the connection instead
+                response.close()
+            return response.status, response.getheader("Location")
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            if not reused or attempt:
+                raise
+        finally:
+            _pool.release(key, conn, reusable)
+
+
+def _check(url, deadline):
+    """(ok, detail) for one URL: True for 2xx, False for 4xx / 5xx, None when it could not be checked"""
+    for _ in range(MAX_REDIRECTS + 1):
+        headers = {"User-Agent": USER_AGENT}
+        try:
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                return False, "not an http(s) URL"
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+            # A port out of range or not a number raises here
+            key = _host_key(parts)
+            status, location = _request(key, target, deadline, "HEAD", headers)
+            if status in RETRY_WITH_GET:
+                status, location = _request(key, target, deadline, "GET", dict(headers, Range="bytes=0-0"))
+        except (ValueError, http.client.InvalidURL):
+            # Bad port, control characters in the path, malformed IPv6 host: no request can succeed
+            return False, "invalid URL"
+        except TimeoutError as e:
+            return None, str(e) or "timed out"
+        except (OSError, http.client.HTTPException) as e:
+            return None, f"{type(e).__name__}: {e}"
+        if status in (301, 302, 303, 307, 308) and location:
+            url = urljoin(url, location)
+            continue
+        return status < 400, str(status)
+    return None, "too many redirects"
+
+
+def _cached(url, now):
+    with _results_lock:
+        result = _results.get(url)
+    if result is None:
+        return None
+    ok, detail, checked_at = result
+    if now - checked_at > (LIVE_TTL if ok else DEAD_TTL):
+        return None
+    return ok, detail
+
+
+def check_urls(urls, budget=DEFAULT_BUDGET, workers=MAX_WORKERS):
+    """{url: (ok, detail)} for every URL, all checked within budget seconds (see _check)"""
+    started = time.monotonic()
+    deadline = started + budget
+    results = {}
+    pending = []
+    for url in dict.fromkeys(urls):
+        cached = _cached(url, time.time())
+        if cached is not None:
+            results[url] = cached
+        else:
+            pending.append(url)
+    if not pending:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=min(len(pending), workers))
+    futures = {executor.submit(_check, url, deadline): url for url in pending}
+    done, not_done = wait(futures, timeout=budget)
+    executor.shutdown(wait=False, cancel_futures=True)
+    for future in not_done:
+        results[futures[future]] = (None, "link check budget exhausted")
+    for future in done:
+        url = futures[future]
+        results[url] = future.result()
+        if results[url][0] is not None:
+            with _results_lock:
+                _results[url] = results[url] + (time.time(),)
+
+    dead = sum(1 for url in pending if results[url][0] is False)
+    unknown = sum(1 for url in pending if results[url][0] is None)
+    logger.info(f"🔗 Checked {len(pending)} link(s) in {time.monotonic() - started:.2f}s: "
+                f"{len(pending) - dead - unknown} live, {dead} dead, {unknown} unknown")
+    return results
+
+
+def budget_from_env(env=None):
+    """Time budget from QUIKAPP_LINK_CHECK_BUDGET; 0 when QUIKAPP_LINK_CHECK=false"""
+    env = os.environ if env is None else env
+    if env.get("QUIKAPP_LINK_CHECK", "true").lower() == "false":
+        return 0
+    try:
+        budget = float(env.get("QUIKAPP_LINK_CHECK_BUDGET", DEFAULT_BUDGET))
+    except ValueError:
+        return DEFAULT_BUDGET
+    # "nan" and "inf" parse too, and would make the shared deadline meaningless
+    return max(budget, 0) if math.isfinite(budget) else DEFAULT_BUDGET
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) < 2:
+        print("Usage: python -m quikapp_notify.link_check <url> [url ...]")
+        return 1
+    results = check_urls(sys.argv[1:], budget=budget_from_env() or DEFAULT_BUDGET)
+    for url in sys.argv[1:]:
+        ok, detail = results[url]
+        print(f"{'live' if ok else 'dead' if ok is False else 'unknown'}\t{detail}\t{url}")
+    return 0 if all(ok is not False for ok, _ in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+QuikApp Log Attachment
+Attaches the full build log, compressed, to build_failed and iOS error emails.
+
+Off unless QUIKAPP_ATTACH_LOG=true. The log is compressed in one pass, in fixed-size chunks,
+into a temporary file (kept in memory up to SPOOL_SIZE, on disk beyond), and is base64-encoded
+only as the message is generated: mime_stream writes it into the SMTP DATA stream or the
+spool file a block at a time, so neither the log nor its encoding is ever held whole.
+
+    QUIKAPP_LOG_COMPRESSION          gzip (default) or xz
+    QUIKAPP_LOG_ATTACHMENT_MAX_KB    cap on the compressed log (default 5120; base64 adds a third)
+
+When the compressed log exceeds the cap, the last part of the log that fits is attached
+instead (build-tail.log.gz), starting at a line and headed by a note of what was left out.
+
+Usage:
+    python -m quikapp_notify.log_attachment <log file>   # show what would be attached
+"""
+
+import os
+import sys
+import base64
+import logging
+import tempfile
+from email.mime.base import MIMEBase
+
+logger = logging.getLogger("log_attachment")
+
+DEFAULT_MAX_KB = 5120
+CHUNK_SIZE = 1024 * 1024
+# Compressed output kept in memory before the temporary file moves to disk
+SPOOL_SIZE = 1024 * 1024
+# base64 input per encoded block: a whole number of 57-byte (76-character) lines
+ENCODE_SIZE = 57 * 1024
+# xz presets above 3 need 90+ MB to compress; 3 needs about 32 MB
+XZ_PRESET = 3
+# Tail attempts before giving up on attaching anything
+TAIL_ATTEMPTS = 4
+COMPRESSIONS = {
+    # name: (Content-Type subtype, file extension)
+    "gzip": ("gzip", ".gz"),
+    "xz": ("x-xz", ".xz"),
+}
+
+
+class CapExceeded(Exception):
+    """The compressed log grew past the cap; carries how far compression got"""
+
+    def __init__(self, consumed, produced):
+        super().__init__(f"{produced} compressed bytes after {consumed} log bytes")
+        self.consumed = consumed
+        self.produced = produced
+
+
+def settings(env=None):
+    """(compression, max compressed bytes) from the environment, or None when attaching is off"""
+    env = os.environ if env is None else env
+    if env.get("QUIKAPP_ATTACH_LOG", "false").lower() != "true":
+        return None
+    compression = env.get("QUIKAPP_LOG_COMPRESSION", "gzip").lower()
+    if compression not in COMPRESSIONS:
+        logger.warning(f"⚠️ Unknown QUIKAPP_LOG_COMPRESSION {compression!r}, using gzip")
+        compression = "gzip"
+    try:
+        max_kb = max(int(env.get("QUIKAPP_LOG_ATTACHMENT_MAX_KB", DEFAULT_MAX_KB)), 1)
+    except ValueError:
+        max_kb = DEFAULT_MAX_KB
+    return compression, max_kb * 1024
+
+
+def _compressor(compression):
+    if compression == "xz":
+        import lzma
+        return lzma.LZMACompressor(format=lzma.FORMAT_XZ, preset=XZ_PRESET)
+    import zlib
+    # wbits 31: gzip framing
+    return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+def compress(path, compression="gzip", max_bytes=None, skip=0):
+    """Compress the log from byte skip on into a temporary file; returns (file, log bytes read, skipped)
+
+    With skip, the part starts at the next line and is headed by a note of the bytes left out.
+    Raises CapExceeded as soon as the output passes max_bytes.
+    """
+    compressor = _compressor(compression)
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    consumed = 0
+    produced = 0
+    try:
+        with open(path, "rb") as f:
+            f.seek(skip)
+            chunk = f.read(CHUNK_SIZE)
+            if skip and chunk:
+                cut = chunk.find(b"\n") + 1
+                skip += cut
+                chunk = b"[... first %d bytes of %s omitted: the compressed log exceeds the attachment cap ...]\n%s" % (
+                    skip, os.path.basename(path).encode("utf-8", "replace"), chunk[cut:])
+            while chunk:
+                consumed += len(chunk)
+                produced += out.write(compressor.compress(chunk))
+                if max_bytes is not None and produced > max_bytes:
+                    raise CapExceeded(consumed, produced)
+                chunk = f.read(CHUNK_SIZE)
+        produced += out.write(compressor.flush())
+        if max_bytes is not None and produced > max_bytes:
+            raise CapExceeded(consumed, produced)
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+    return out, consumed, skip
+
+
+class LogAttachment(MIMEBase):
+    """application/gzip (or x-xz) part whose base64 body is encoded while it is written
+
+    StreamingBytesGenerator calls write_body; any other generator, and get_payload, see
+    the encoded payload, built on first use.
+    """
+
+    def __init__(self, data, filename, compression="gzip"):
+        subtype, _ = COMPRESSIONS[compression]
+        self._encoded = None
+        super().__init__("application", subtype)
+        self._data = data
+        self["Content-Transfer-Encoding"] = "base64"
+        self.add_header("Content-Disposition", "attachment", filename=filename)
+
+    @property
+    def _payload(self):
+        if self._encoded is None:
+            self._data.seek(0)
+            self._encoded = base64.encodebytes(self._data.read()).decode("ascii")
+        return self._encoded
+
+    @_payload.setter
+    def _payload(self, value):
+        # Message.__init__ starts every part with a None payload
+        if value is not None:
+            self._encoded = value
+
+    def is_multipart(self):
+        return False
+
+    @property
+    def size(self):
+        """Compressed size in bytes"""
+        self._data.seek(0, os.SEEK_END)
+        return self._data.tell()
+
+    def write_body(self, generator):
+        """Write the base64 body through generator, a block of the compressed log at a time"""
+        if self._encoded is not None:
+            return generator._write_lines(self._encoded)
+        self._data.seek(0)
+        while True:
+            block = self._data.read(ENCODE_SIZE)
+            if not block:
+                return
+            generator._write_lines(base64.encodebytes(block).decode("ascii"))
+
+    def close(self):
+        self._data.close()
+
+
+def tail_filename(path):
+    name, ext = os.path.splitext(os.path.basename(path))
+    return f"{name}-tail{ext or '.log'}"
+
+
+def build(path, env=None):
+    """The log attachment for path, a tail of it when the whole log is over the cap, or None
+
+    None when QUIKAPP_ATTACH_LOG is off, the log cannot be read, or not even a tail fits.
+    """
+    options = settings(env)
+    if options is None or not path:
+        return None
+    compression, max_bytes = options
+    _, extension = COMPRESSIONS[compression]
+    try:
+        size = os.path.getsize(path)
+        try:
+            data, _, _ = compress(path, compression, max_bytes)
+            logger.info(f"📎 Attaching {os.path.basename(path)} ({size} bytes, {compression} to "
+                        f"{data.seek(0, os.SEEK_END)} bytes)")
+            return LogAttachment(data, os.path.basename(path) + extension, compression)
+        except CapExceeded as e:
+            # How much log fits, from the ratio seen so far, with a margin for the log's tail compressing worse
+            tail = int(max_bytes * e.consumed / max(e.produced, 1) * 0.9)
+        for _ in range(TAIL_ATTEMPTS):
+            try:
+                data, _, skipped = compress(path, compression, max_bytes, skip=max(size - tail, 0))
+            except CapExceeded:
+                tail //= 2
+                continue
+            logger.warning(f"⚠️ {os.path.basename(path)} is over {max_bytes // 1024} KB compressed; "
+                           f"attaching its last {size - skipped} of {size} bytes")
+            return LogAttachment(data, tail_filename(path) + extension, compression)
+        logger.warning(f"⚠️ Not even a tail of {os.path.basename(path)} fits {max_bytes // 1024} KB; not attaching it")
+    except OSError as e:
+        logger.warning(f"⚠️ Cannot attach {path}: {e}")
+    return None
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) != 2:
+        print("Usage: python -m quikapp_notify.log_attachment <log file>")
+        return 1
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    env = dict(os.environ)
+    env.setdefault("QUIKAPP_ATTACH_LOG", "true")
+    part = build(sys.argv[1], env)
+    if part is None:
+        print("Nothing would be attached")
+        return 1
+    print(f"{part.get_filename()}: {part.get_content_type()}, {part.size} bytes compressed, "
+          f"about {(part.size + 56) // 57 * 78} bytes encoded")
+    part.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+QuikApp Log Index
+Finds, dedupes and ranks the error sites in a build log for the failure emails.
+
+The log is memory-mapped and searched for a few literal needles ("rror:", "FAIL", "ailed",
+"[!]", ...) with mmap.find, which runs in C. Only the lines around a hit are decoded
+and classified with the precompiled signature regexes below (Xcode, codesign, CocoaPods,
+Gradle/Kotlin, Dart/Flutter). Large logs are split at line boundaries and scanned by
+several processes, each mapping the file itself. The processes are started by a forkserver
+(spawn where there is none), never forked from the caller: notify_daemon indexes logs from a
+worker thread, and a fork while other threads hold locks can deadlock the child.
+
+Every site records tool, message, file location, line number and hit count. Identical
+messages (ignoring numbers) collapse into one site, and sites are ranked by signature
+weight, then by first appearance, because the earliest compiler error is usually the cause.
+
+Usage:
+    python -m quikapp_notify.log_index <log file> [top]   # print the ranked summary
+"""
+
+import os
+import re
+import sys
+import mmap
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_TOP = 5
+CONTEXT_LINES = 2
+MAX_LINE_BYTES = 2048
+# Below this size one process is faster than starting workers
+PARALLEL_THRESHOLD = 64 * 1024 * 1024
+MAX_WORKERS = 8
+
+# Each needle ends on a byte that is rare in build output, which keeps mmap.find's skips long.
+# Matches are re-checked by SIGNATURES, so needles only need to be a superset.
+NEEDLES = (b"rror:", "rror •".encode("utf-8"), b"FAIL", b"ailed", b"[!]", b"\ne:")
+
+# (tool, weight, regex); the first matching signature classifies a line.
+# Named groups: msg (required), loc/line (source location)
+SIGNATURES = [(tool, weight, re.compile(pattern)) for tool, weight, pattern in (
+    ("dart", 100, r"(?P<loc>\S+\.dart):(?P<line>\d+):\d+: Error: (?P<msg>.+)"),
+    ("dart", 95, r"^\s*error • (?P<msg>.+?) • (?P<loc>\S+\.dart):(?P<line>\d+)"),
+    ("xcode", 100, r"(?P<loc>\S+\.(?:swift|mm?|h|cc?|cpp|storyboard|xib|plist)):(?P<line>\d+)(?::\d+)?: (?:fatal )?error: (?P<msg>.+)"),
+    ("kotlin", 100, r"^e: (?:file://)?(?P<loc>\S+\.kts?):(?P<line>\d+):\d+ (?P<msg>.+)"),
+    ("java", 100, r"(?P<loc>\S+\.java):(?P<line>\d+): error: (?P<msg>.+)"),
+    ("codesign", 90, r"(?P<msg>(?:No signing certificate|No profiles? for|\S+ requires a provisioning profile"
+                     r"|Provisioning profile .+|Code ?Signing Error.*|.*errSec\w+.*|Command CodeSign failed.*).*)"),
+    ("cocoapods", 85, r"\[!\] (?P<msg>.+)"),
+    ("xcode", 80, r"xcodebuild: error: (?P<msg>.+)"),
+    ("gradle", 70, r"Execution failed for task '(?P<msg>[^']+)'"),
+    ("build", 55, r"(?:^|\s)(?:ld|clang|swiftc?|dart|flutter)?:? ?error: (?P<msg>.+)"),
+    ("flutter", 50, r"Target (?P<msg>\S+ failed.*)"),
+    ("flutter", 45, r"^Error: (?P<msg>.+)"),
+    ("gradle", 30, r"FAILURE: (?P<msg>.+)"),
+    ("build", 10, r"\*\* (?P<msg>(?:BUILD|ARCHIVE|EXPORT) FAILED) \*\*"),
+)]
+
+_NUMBER_RE = re.compile(r"\d+")
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def _line_bounds(mm, offset, limit):
+    start = mm.rfind(b"\n", 0, offset) + 1
+    end = mm.find(b"\n", offset, limit)
+    return start, (limit if end < 0 else end)
+
+
+def _decode(data):
+    return _ANSI_RE.sub("", data[:MAX_LINE_BYTES].decode("utf-8", errors="replace")).rstrip("\r")
+
+
+def classify(line):
+    """Return (tool, weight, message, location) for an error line, or None"""
+    for tool, weight, pattern in SIGNATURES:
+        match = pattern.search(line)
+        if not match:
+            continue
+        groups = match.groupdict()
+        location = groups.get("loc")
+        if location and groups.get("line"):
+            location = f"{location}:{groups['line']}"
+        return tool, weight, (groups.get("msg") or "").strip(), location
+    return None
+
+
+def _gradle_cause(mm, position, end, lookahead=4):
+    """Message under '* What went wrong:' in the lines following a Gradle FAILURE line"""
+    for _ in range(lookahead):
+        line_start = position + 1
+        if line_start >= end:
+            break
+        position = _line_bounds(mm, line_start, end)[1]
+        if mm[line_start:position].strip() == b"* What went wrong:":
+            return _decode(mm[position + 1:_line_bounds(mm, position + 1, end)[1]]).strip()
+    return None
+
+
+def _count_newlines(mm, start, end, step=16 * 1024 * 1024):
+    count = 0
+    while start < end:
+        stop = min(start + step, end)
+        count += mm[start:stop].count(b"\n")
+        start = stop
+    return count
+
+
+def scan_region(path, start, end, count_all=True):
+    """Classify every needle hit in [start, end); returns (sites, newline count of the region)
+
+    Line numbers in the returned sites are relative to the region. With count_all=False
+    newlines after the last hit are not counted (the last region does not need them).
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        line_starts = set()
+        for needle in NEEDLES:
+            # A needle starting with a newline may match on the newline that ends the previous region
+            position = mm.find(needle, max(start - 1, 0) if needle[0] == 0x0A else start, end)
+            while position >= 0:
+                if needle[0] == 0x0A:
+                    position += 1
+                line_start, line_end = _line_bounds(mm, position, end)
+                line_starts.add(line_start)
+                position = mm.find(needle, line_end, end)
+
+        sites = []
+        counted_to = start
+        line_number = 0
+        for line_start in sorted(line_starts):
+            line_start = max(line_start, start)
+            line_number += _count_newlines(mm, counted_to, line_start)
+            counted_to = line_start
+            _, line_end = _line_bounds(mm, line_start, end)
+            found = classify(_decode(mm[line_start:line_end]))
+            if not found:
+                continue
+            tool, weight, message, location = found
+            if tool == "gradle" and message.startswith("Build failed"):
+                message = _gradle_cause(mm, line_end, end) or message
+            if message:
+                sites.append({
+                    "tool": tool, "weight": weight, "message": message, "location": location,
+                    "line": line_number + 1, "offset": line_start, "count": 1,
+                })
+        return sites, line_number + (_count_newlines(mm, counted_to, end) if count_all else 0)
+
+
+def _regions(path, size, parts):
+    """Split the file into parts that start at line boundaries"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = [0]
+        for i in range(1, parts):
+            cut = mm.find(b"\n", size * i // parts)
+            if cut < 0:
+                break
+            if cut + 1 > bounds[-1]:
+                bounds.append(cut + 1)
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def dedupe_and_rank(sites):
+    """Merge sites with the same tool and message (numbers ignored) and rank them"""
+    merged = {}
+    for site in sites:
+        key = (site["tool"], _NUMBER_RE.sub("#", site["message"])[:200])
+        if key in merged:
+            merged[key]["count"] += site["count"]
+        else:
+            merged[key] = dict(site)
+    return sorted(merged.values(), key=lambda s: (-s["weight"], s["line"]))
+
+
+def add_context(path, sites, lines=CONTEXT_LINES):
+    """Attach the surrounding lines of the log to each site"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        for site in sites:
+            start = site["offset"]
+            for _ in range(lines):
+                if start <= 0:
+                    break
+                start = mm.rfind(b"\n", 0, start - 1) + 1
+            end = site["offset"]
+            for _ in range(lines + 1):
+                end = mm.find(b"\n", end, size)
+                if end < 0:
+                    end = size
+                    break
+                end += 1
+            site["context"] = "\n".join(_decode(l) for l in mm[start:end].split(b"\n")).rstrip("\n")
+    return sites
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def index_log(path, top=DEFAULT_TOP, workers=None):
+    """Ranked, deduplicated error sites of a log file, with context for the top entries"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    if workers is None:
+        workers = min(os.cpu_count() or 1, MAX_WORKERS) if size >= PARALLEL_THRESHOLD else 1
+    regions = _regions(path, size, workers) if workers > 1 else [(0, size)]
+
+    if len(regions) > 1:
+        with ProcessPoolExecutor(max_workers=len(regions), mp_context=_mp_context()) as pool:
+            starts, ends = zip(*regions)
+            count_all = [True] * (len(regions) - 1) + [False]
+            results = list(pool.map(scan_region, [path] * len(regions), starts, ends, count_all))
+    else:
+        results = [scan_region(path, 0, size, count_all=False)]
+
+    sites = []
+    lines_before = 0
+    for region_sites, newlines in results:
+        for site in region_sites:
+            site["line"] += lines_before
+        sites.extend(region_sites)
+        lines_before += newlines
+
+    ranked = dedupe_and_rank(sites)
+    return add_context(path, ranked[:top]) if top else ranked
+
+
+def format_summary(sites):
+    """Plain-text rendering of index_log results"""
+    blocks = []
+    for i, site in enumerate(sites, 1):
+        where = f" ({site['location']})" if site.get("location") else ""
+        repeat = f" x{site['count']}" if site["count"] > 1 else ""
+        blocks.append(f"{i}. [{site['tool']}] {site['message']}{where}{repeat}\n"
+                      f"   log line {site['line']}\n{site.get('context', '')}")
+    return "\n\n".join(blocks)
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) < 2:
+        print("Usage: python -m quikapp_notify.log_index <log file> [top]")
+        return 1
+    started = time.perf_counter()
+    sites = index_log(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_TOP)
+    print(format_summary(sites) or "No error signatures found")
+    print(f"\nIndexed {os.path.getsize(sys.argv[1]) // 1024} KB in {time.perf_counter() - started:.3f}s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
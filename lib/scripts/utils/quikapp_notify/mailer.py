@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Email notification script for Codemagic CI/CD
+Uses SMTP to send build notifications
+"""
+
+import sys
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+from . import timing
+from . import profiling
+from . import notify_config
+
+def send_email(to_email, subject, body):
+    """Send email using SMTP"""
+    
+    # SMTP credentials shared with the other senders (relays and timeouts: see smtp_session.py)
+    with timing.span("env"):
+        config = notify_config.load()
+    smtp_user = config.smtp_user
+    smtp_pass = config.smtp_pass
+    
+    if not all([smtp_user, smtp_pass]):
+        print("❌ SMTP credentials not configured")
+        return False
+    
+    try:
+        with timing.span("mime"):
+            # Create message
+            msg = MIMEMultipart()
+            msg['From'] = smtp_user
+            msg['To'] = to_email
+            msg['Subject'] = subject
+            
+            # Add body
+            msg.attach(MIMEText(body, 'plain'))
+        
+        # Spool for background delivery when the outbox is enabled
+        # (outbox and smtp_session, with smtplib and ssl, are imported only on the path that sends)
+        from . import outbox
+        if outbox.is_enabled():
+            outbox.spool(msg, smtp_user, [to_email], source="mailer.py")
+            outbox.spawn_worker()
+            print(f"📥 Email to {to_email} queued for background delivery")
+            return True
+        
+        # Create SMTP session with deadline, failover and circuit breaker
+        from .smtp_session import SMTPSession
+        with SMTPSession.from_env() as session:
+            # Send email, generating it straight into the DATA stream
+            session.send_message(smtp_user, to_email, msg)
+        
+        print(f"✅ Email sent successfully to {to_email}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Failed to send email: {str(e)}")
+        return False
+
+def main():
+    """Main function"""
+    with profiling.profiled("mailer"):
+        _main()
+
+def _main():
+    """Send the email named on the command line and exit with its result"""
+    if len(sys.argv) < 4:
+        print("Usage: python3 mailer.py <to_email> <subject> <body>")
+        sys.exit(1)
+    
+    to_email = sys.argv[1]
+    subject = sys.argv[2]
+    body = sys.argv[3]
+    
+    print(f"📧 Sending email to: {to_email}")
+    print(f"📝 Subject: {subject}")
+    
+    with timing.trace("mailer") as active:
+        success = send_email(to_email, subject, body)
+        active.attrs["sent"] = success
+    
+    if success:
+        print("✅ Email notification completed")
+        sys.exit(0)
+    else:
+        print("❌ Email notification failed")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+QuikApp MIME Streaming
+Serializes notification emails as bytes straight into the SMTP DATA stream or a spool file.
+
+msg.as_string() followed by smtplib's sendmail holds several copies of the whole message at
+once: the generated str, its bytes, the dot-stuffed DATA payload and its terminator. The
+stdlib generators add more, since they render every body (and every multipart subpart) into
+a buffer before writing its headers and split each payload into a list of lines.
+
+StreamingBytesGenerator is a BytesGenerator, with the line separator taken from a clone of the
+message's own policy, that writes headers first and bodies straight through, in line-aligned
+slices, whenever nothing can change the headers afterwards (a multipart boundary is chosen
+up front; only payloads that would have their transfer encoding re-done are buffered). Parts
+with a write_body method (log_attachment) encode their own body as it is written. It writes
+into a DataWriter that normalizes line ends, doubles leading dots and sends in fixed-size
+blocks, or into a spool file. The output is byte-for-byte what msg.as_bytes() produces.
+
+Usage:
+    python -m quikapp_notify.mime_stream <message.eml>   # print the DATA payload a spooled message becomes
+"""
+
+import sys
+from email.generator import BytesGenerator
+
+# Serialized bytes collected before line ends are normalized and the block is sent
+BLOCK_SIZE = 64 * 1024
+# Blocks read at once when streaming a spooled message from disk
+FILE_BLOCK_SIZE = 256 * 1024
+# Payload characters handed to the line splitter at once
+SLICE_SIZE = 64 * 1024
+
+
+class StreamingBytesGenerator(BytesGenerator):
+    """BytesGenerator that writes bodies straight to its file instead of buffering them"""
+
+    def _write(self, msg):
+        if getattr(msg, 'write_body', None) is not None:
+            self._write_headers(msg)
+            return msg.write_body(self)
+        payload = msg._payload
+        # Non-ASCII text payloads may get their transfer encoding re-done, which changes the headers
+        if not msg.is_multipart() and not (isinstance(payload, str) and payload.isascii()):
+            return super()._write(msg)
+        if msg.is_multipart() and not msg.get_boundary():
+            # The stdlib picks a boundary absent from the rendered parts; a random one is as safe
+            msg.set_boundary(self._make_boundary())
+        meth = getattr(msg, '_write_headers', None)
+        if meth is None:
+            self._write_headers(msg)
+        else:
+            meth(self)
+        self._dispatch(msg)
+
+    def _handle_text(self, msg):
+        payload = msg._payload
+        if isinstance(payload, str) and payload.isascii() and not self._mangle_from_:
+            # ASCII has no surrogates to check for, and the check would copy the payload
+            self._write_lines(payload)
+        else:
+            super()._handle_text(msg)
+
+    def _handle_multipart(self, msg):
+        subparts = msg.get_payload()
+        if not isinstance(subparts, list):
+            return super()._handle_multipart(msg)
+        # Set by _write before the headers went out
+        boundary = msg.get_boundary()
+        if msg.preamble is not None:
+            self._write_lines(msg.preamble)
+            self.write(self._NL)
+        self.write('--' + boundary + self._NL)
+        for index, part in enumerate(subparts):
+            if index:
+                self.write(self._NL + '--' + boundary + self._NL)
+            self.clone(self._fp).flatten(part, unixfrom=False, linesep=self._NL)
+        self.write(self._NL + '--' + boundary + '--' + self._NL)
+        if msg.epilogue is not None:
+            self._write_lines(msg.epilogue)
+
+    def _write_lines(self, lines):
+        # The stdlib splits the whole payload into a list of lines; split it a slice at a time
+        if len(lines) <= SLICE_SIZE:
+            return super()._write_lines(lines)
+        start = 0
+        while start < len(lines):
+            end = min(len(lines), start + SLICE_SIZE)
+            if end < len(lines):
+                cut = lines.rfind("\n", start, end)
+                if cut >= start:
+                    end = cut + 1
+                elif lines[end - 1] == "\r":
+                    end += 1
+            super()._write_lines(lines[start:end])
+            start = end
+
+
+def write_message(msg, fp, linesep="\r\n"):
+    """Serialize msg as bytes into fp (anything with write(bytes)), like msg.as_bytes() but without the copies"""
+    policy = msg.policy.clone(linesep=linesep)
+    StreamingBytesGenerator(fp, mangle_from_=False, policy=policy).flatten(msg)
+
+
+def write_file(path, fp):
+    """Copy a serialized message from disk into fp block by block"""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(FILE_BLOCK_SIZE)
+            if not block:
+                return
+            fp.write(block)
+
+
+class DataWriter:
+    """File-like DATA payload encoder: CRLF line ends, dot-stuffing and the final ".", sent in blocks
+
+    send is called with each encoded block (smtplib.SMTP.send, or any bytes consumer).
+    """
+
+    def __init__(self, send, block_size=BLOCK_SIZE):
+        self.send = send
+        self.block_size = block_size
+        # Bytes of the DATA payload handed to send so far, terminator included after close()
+        self.bytes = 0
+        self._buffer = bytearray()
+        # The last encoded byte ended a line (or nothing has been written yet)
+        self._line_start = True
+        # A block ended in "\r"; it is joined with the next block so "\r\n" is not split
+        self._pending_cr = False
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= self.block_size:
+            self._send(self._encode_buffer())
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def _encode_buffer(self):
+        """The buffered bytes as DATA payload (possibly empty); a trailing "\r" is held back"""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        if self._pending_cr:
+            data = b"\r" + data
+            self._pending_cr = False
+        if data.endswith(b"\r"):
+            data = data[:-1]
+            self._pending_cr = True
+        if not data:
+            return data
+        # Every line end becomes "\n" first (bare "\r" too, as smtplib does), then "\r\n"
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        if self._line_start and data.startswith(b"."):
+            data = b"." + data
+        data = data.replace(b"\n.", b"\n..")
+        self._line_start = data.endswith(b"\n")
+        return data.replace(b"\n", b"\r\n")
+
+    def _send(self, data):
+        if data:
+            self.send(data)
+            self.bytes += len(data)
+
+    def close(self):
+        """Send what is buffered and the end-of-data marker"""
+        data = self._encode_buffer()
+        # The payload ends with a line end before the "." line, as in smtplib (an empty one is just that)
+        end = b"\r\n" if self._pending_cr or not self._line_start or not (self.bytes or data) else b""
+        self._pending_cr = False
+        # One write: a separate small one for the marker would wait out the peer's delayed ACK (Nagle)
+        self._send(data + end + b".\r\n")
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) != 2:
+        print("Usage: python -m quikapp_notify.mime_stream <message.eml>")
+        return 1
+    writer = DataWriter(sys.stdout.buffer.write)
+    try:
+        write_file(sys.argv[1], writer)
+    except OSError as e:
+        print(f"Cannot read {sys.argv[1]}: {e}", file=sys.stderr)
+        return 1
+    writer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
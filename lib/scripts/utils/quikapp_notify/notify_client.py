@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+QuikApp Notification Client
+Hands a build event to notify_daemon.py over its Unix socket.
+Accepts the same arguments as send_email.py and falls back to it when no daemon is running.
+
+Set QUIKAPP_NOTIFY_WAIT=true to block until the daemon has delivered the message.
+"""
+
+# Keep imports minimal: the whole point of the client is a near-zero startup cost
+import os
+import sys
+import json
+import socket
+
+DEFAULT_SOCKET_PATH = "/tmp/quikapp-notify.sock"
+
+
+def hand_off(socket_path, args, wait):
+    """Send the event to the daemon and return its reply"""
+    payload = {
+        "command": "send",
+        "argv": args,
+        "env": dict(os.environ),
+        "cwd": os.getcwd(),
+        "wait": wait,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(None if wait else 5.0)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline().decode("utf-8"))
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) < 4:
+        print("Usage: notify_client.py <email_type> <platform> <build_id> [error_message | --error-file PATH|-]")
+        print("Email types: build_started, build_success, build_failed")
+        sys.exit(1)
+
+    if os.environ.get("ENABLE_EMAIL_NOTIFICATIONS", "true").lower() == "false":
+        print("[notify_client.py] Email notifications are disabled. Exiting.")
+        sys.exit(0)
+
+    socket_path = os.environ.get("QUIKAPP_NOTIFY_SOCKET") or DEFAULT_SOCKET_PATH
+    wait = os.environ.get("QUIKAPP_NOTIFY_WAIT", "false").lower() == "true"
+
+    args = sys.argv[1:]
+    if "--error-file" in args or any(a.startswith("--error-file=") for a in args):
+        from .error_excerpt import pop_error_file, build_excerpt
+        args, error_file = pop_error_file(args)
+        if error_file == "-":
+            # The daemon cannot read our stdin, so the excerpt is built here
+            args = args[:3] + [build_excerpt(sys.stdin.buffer)]
+        else:
+            # Large logs are scanned by the daemon, off the build's critical path
+            args += ["--error-file", os.path.abspath(error_file)]
+
+    try:
+        reply = hand_off(socket_path, args, wait)
+    except (OSError, ValueError) as e:
+        print(f"[notify_client.py] Daemon unavailable ({e}), sending directly")
+        from . import send_email
+        sys.argv[1:] = args
+        send_email.main()
+        return
+
+    status = reply.get("status")
+    print(f"[notify_client.py] Event {reply.get('id', '?')} {status}")
+    sys.exit(0 if status in ("queued", "sent") else 1)
+
+
+if __name__ == "__main__":
+    main()
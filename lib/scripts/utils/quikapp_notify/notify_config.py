@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+QuikApp Notify Config
+One parsed, read-only view of the notification settings shared by every sender
+(send_email, send_ios_emails, mailer, outbox, smtp_session, test_artifact_urls, send_email.sh).
+
+Each setting in FIELDS is read from the environment and, when it is unset or empty there,
+from lib/config/env.sh (QUIKAPP_ENV_FILE), whose assignments are evaluated the way the
+shell would (including ${VAR:-default} and $VAR). Values are converted once (ports to int,
+flags to bool) into a frozen, slotted NotifyConfig.
+
+The first sender of a build writes the result to a JSON snapshot (QUIKAPP_CONFIG_SNAPSHOT,
+default quikapp-config-<build id>.json in the temp directory, mode 0600; "false" disables
+it). It never holds the SMTP password, which every sender takes from the environment; when
+the password only comes from env.sh, no snapshot is written. Later senders of the same build
+load the snapshot instead of re-parsing env.sh, as long as its fingerprint (the raw values of
+every variable below, the password only as set or unset, plus the env.sh size and mtime)
+still matches. Notifiers created with an explicit
+environment (daemon, batch sends) use an in-memory cache with the same fingerprint instead.
+
+Usage:
+    python -m quikapp_notify.notify_config            # print the resolved settings as JSON (password masked)
+    python -m quikapp_notify.notify_config --shell    # print export lines (settings that are set) for eval in shell scripts
+"""
+
+import os
+import re
+import sys
+import json
+import shlex
+import hashlib
+import logging
+import tempfile
+
+from . import PACKAGE_PARENT
+
+logger = logging.getLogger("notify_config")
+
+SNAPSHOT_VERSION = 3
+
+# (attribute, environment variables in order of preference, type, default)
+# A recipient default of None means "the SMTP user"
+FIELDS = (
+    ("smtp_server", ("EMAIL_SMTP_SERVER",), str, "smtp.gmail.com"),
+    ("smtp_port", ("EMAIL_SMTP_PORT",), int, 587),
+    ("smtp_user", ("EMAIL_SMTP_USER",), str, ""),
+    ("smtp_pass", ("EMAIL_SMTP_PASS",), str, ""),
+    ("recipient", ("EMAIL_ID",), str, None),
+    ("notifications_enabled", ("ENABLE_EMAIL_NOTIFICATIONS",), bool, True),
+
+    ("app_name", ("APP_NAME",), str, "QuikApp"),
+    ("version_name", ("VERSION_NAME",), str, "1.0.0"),
+    ("version_code", ("VERSION_CODE",), str, "1"),
+    ("org_name", ("ORG_NAME",), str, "QuikApp Technologies"),
+    ("user_name", ("USER_NAME",), str, "Developer"),
+    ("web_url", ("WEB_URL",), str, ""),
+    ("pkg_name", ("PKG_NAME",), str, ""),
+    ("bundle_id", ("BUNDLE_ID",), str, ""),
+    ("workflow_id", ("WORKFLOW_ID",), str, "unknown"),
+    ("project_id", ("CM_PROJECT_ID", "FCI_PROJECT_ID"), str, "unknown"),
+    ("build_id", ("CM_BUILD_ID", "FCI_BUILD_ID", "BUILD_NUMBER"), str, ""),
+
+    ("push_notify", ("PUSH_NOTIFY",), bool, False),
+    ("is_chatbot", ("IS_CHATBOT",), bool, False),
+    ("is_domain_url", ("IS_DOMAIN_URL",), bool, False),
+    ("is_splash", ("IS_SPLASH",), bool, False),
+    ("is_pulldown", ("IS_PULLDOWN",), bool, False),
+    ("is_bottommenu", ("IS_BOTTOMMENU",), bool, False),
+    ("is_load_ind", ("IS_LOAD_IND",), bool, False),
+
+    ("is_camera", ("IS_CAMERA",), bool, False),
+    ("is_location", ("IS_LOCATION",), bool, False),
+    ("is_mic", ("IS_MIC",), bool, False),
+    ("is_notification", ("IS_NOTIFICATION",), bool, False),
+    ("is_contact", ("IS_CONTACT",), bool, False),
+    ("is_biometric", ("IS_BIOMETRIC",), bool, False),
+    ("is_calendar", ("IS_CALENDAR",), bool, False),
+    ("is_storage", ("IS_STORAGE",), bool, False),
+
+    ("cert_p12_url", ("CERT_P12_URL",), str, ""),
+    ("cert_cer_url", ("CERT_CER_URL",), str, ""),
+    ("cert_key_url", ("CERT_KEY_URL",), str, ""),
+    ("profile_url", ("PROFILE_URL",), str, ""),
+    ("profile_type", ("PROFILE_TYPE",), str, ""),
+    ("support_email", ("SUPPORT_EMAIL",), str, "support@quikapp.co"),
+)
+
+# Template keys of the feature and permission badges -> attribute
+FEATURES = (("push_notify", "push_notify"), ("is_chatbot", "is_chatbot"), ("is_domain_url", "is_domain_url"),
+            ("is_splash", "is_splash"), ("is_pulldown", "is_pulldown"), ("is_bottommenu", "is_bottommenu"))
+PERMISSIONS = (("camera", "is_camera"), ("location", "is_location"), ("microphone", "is_mic"),
+               ("notification", "is_notification"), ("contact", "is_contact"), ("biometric", "is_biometric"),
+               ("calendar", "is_calendar"), ("storage", "is_storage"))
+
+_VARIABLES = tuple(name for _, names, _, _ in FIELDS for name in names)
+# Never written to the snapshot; read from the environment by every sender instead
+_SECRETS = ("EMAIL_SMTP_PASS",)
+# lib/scripts/utils (holding the package or the zipapp) -> lib/config, else relative to the working directory
+_UTILS_DIR = PACKAGE_PARENT if os.path.isdir(PACKAGE_PARENT) else os.path.dirname(PACKAGE_PARENT)
+ENV_FILE_CANDIDATES = (
+    os.path.join(_UTILS_DIR, "..", "..", "config", "env.sh"),
+    os.path.join("lib", "config", "env.sh"),
+)
+
+_ASSIGN_RE = re.compile(r'^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)=(.*)$')
+_DEFAULT_RE = re.compile(r'^\$\{([A-Za-z_][A-Za-z0-9_]*):?-(.*)\}\s*(?:#.*)?$')
+_VAR_RE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}|\$([A-Za-z_][A-Za-z0-9_]*)')
+
+# env file path -> ((size, mtime_ns), {name: value})
+_env_files = {}
+# fingerprint -> NotifyConfig
+_loaded = {}
+
+
+class NotifyConfig:
+    """Resolved notification settings; read-only, one attribute per entry of FIELDS
+
+    configured holds the attributes whose value came from the environment or env.sh
+    rather than from a default.
+    """
+
+    __slots__ = tuple(field[0] for field in FIELDS) + ("configured",)
+
+    def __init__(self, configured=(), **values):
+        for name, _, _, _ in FIELDS:
+            object.__setattr__(self, name, values[name])
+        object.__setattr__(self, "configured", frozenset(configured))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"NotifyConfig is read-only (tried to set {name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"NotifyConfig is read-only (tried to delete {name})")
+
+    def __repr__(self):
+        return f"NotifyConfig(app_name={self.app_name!r}, build_id={self.build_id!r}, recipient={self.recipient!r})"
+
+    @property
+    def features(self):
+        """Feature flags keyed like the feature badge template"""
+        return {key: getattr(self, name) for key, name in FEATURES}
+
+    @property
+    def permissions(self):
+        """Permission flags keyed like the feature badge template"""
+        return {key: getattr(self, name) for key, name in PERMISSIONS}
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name, _, _, _ in FIELDS}
+
+    def shell_exports(self):
+        """export lines (first variable of every configured field) for eval in a shell script
+
+        Defaults are left out, so the script's own ${VAR:-...} fallbacks still apply.
+        """
+        lines = []
+        for name, names, kind, _ in FIELDS:
+            value = getattr(self, name)
+            if name not in self.configured:
+                continue
+            if kind is bool:
+                value = "true" if value else "false"
+            lines.append(f"export {names[0]}={shlex.quote(str(value))}")
+        return "\n".join(lines)
+
+
+def _expand(text, namespace):
+    return _VAR_RE.sub(lambda m: namespace.get(m.group(1) or m.group(2), ""), text)
+
+
+def _shell_value(text, namespace):
+    """Value of the right-hand side of a shell assignment (quotes, $VAR and ${VAR:-default})"""
+    text = text.strip()
+    match = _DEFAULT_RE.match(text)
+    if match:
+        return namespace.get(match.group(1)) or _shell_value(match.group(2), namespace)
+    if text[:1] == "'":
+        end = text.find("'", 1)
+        return text[1:end if end > 0 else None]
+    if text[:1] == '"':
+        end = text.find('"', 1)
+        return _expand(text[1:end if end > 0 else None], namespace)
+    words = text.split("#", 1)[0].split()
+    return _expand(words[0], namespace) if words else ""
+
+
+def parse_env_file(path, env):
+    """{name: value} of every assignment in a shell env file, evaluated in order on top of env"""
+    namespace = dict(env)
+    assigned = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            match = _ASSIGN_RE.match(line)
+            if match and "$(" not in match.group(2) and "`" not in match.group(2):
+                namespace[match.group(1)] = assigned[match.group(1)] = _shell_value(match.group(2), namespace)
+    return assigned
+
+
+def env_file(env=None):
+    """Path of the env.sh to read (QUIKAPP_ENV_FILE, else lib/config/env.sh), or None"""
+    env = os.environ if env is None else env
+    if env.get("QUIKAPP_ENV_FILE"):
+        return env["QUIKAPP_ENV_FILE"]
+    for path in ENV_FILE_CANDIDATES:
+        if os.path.isfile(path):
+            return os.path.normpath(path)
+    return None
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _env_file_values(path, stamp, env):
+    cached = _env_files.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        values = parse_env_file(path, env)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not read {path}: {e}")
+        values = {}
+    _env_files[path] = (stamp, values)
+    return values
+
+
+def _convert(name, kind, value, default):
+    if value is None:
+        return default
+    if kind is bool:
+        return value.lower() == "true"
+    if kind is int:
+        try:
+            return int(value)
+        except ValueError:
+            logger.warning(f"⚠️ {name}={value!r} is not a number, using {default}")
+            return default
+    return value
+
+
+def derive(env, file_values=None):
+    """Build a NotifyConfig from env, falling back to file_values (see parse_env_file)"""
+    file_values = file_values or {}
+    values = {}
+    configured = []
+    for name, names, kind, default in FIELDS:
+        raw = next((env[n] for n in names if env.get(n)), None)
+        if raw is None:
+            raw = next((file_values[n] for n in names if file_values.get(n)), None)
+        if raw is not None:
+            configured.append(name)
+        values[name] = _convert(names[0], kind, raw, default)
+    if not values["recipient"]:
+        values["recipient"] = values["smtp_user"]
+    return NotifyConfig(configured, **values)
+
+
+def _fingerprint(env, path, stamp, masked=()):
+    # masked variables count only as set or unset
+    values = [bool(env.get(name)) if name in masked else env.get(name) for name in _VARIABLES]
+    raw = json.dumps([SNAPSHOT_VERSION, path, stamp, values])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def snapshot_path(env=None):
+    """Snapshot file for this build, or None when QUIKAPP_CONFIG_SNAPSHOT=false"""
+    env = os.environ if env is None else env
+    path = env.get("QUIKAPP_CONFIG_SNAPSHOT")
+    if path:
+        return None if path.lower() == "false" else path
+    build_id = env.get("CM_BUILD_ID") or env.get("FCI_BUILD_ID") or env.get("BUILD_NUMBER") or "local"
+    return os.path.join(tempfile.gettempdir(), f"quikapp-config-{re.sub(r'[^A-Za-z0-9_.-]', '_', build_id)}.json")
+
+
+def _read_snapshot(path, fingerprint, env):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("fingerprint") == fingerprint:
+            configured = set(snapshot["configured"]) | ({"smtp_pass"} if env.get("EMAIL_SMTP_PASS") else set())
+            return NotifyConfig(configured, **dict(snapshot["config"], smtp_pass=env.get("EMAIL_SMTP_PASS", "")))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _write_snapshot(path, fingerprint, config, env):
+    if config.smtp_pass and not env.get("EMAIL_SMTP_PASS"):
+        # The password came from env.sh; a snapshot without it would hand later senders none
+        return
+    values = config.to_dict()
+    del values["smtp_pass"]
+    tmp_path = None
+    try:
+        # A new, randomly named 0600 file (O_EXCL), never one planted at a predictable path
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                        dir=os.path.dirname(path) or ".")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "config": values,
+                       "configured": sorted(config.configured - {"smtp_pass"})}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Config snapshot not writable ({e}), continuing without it")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def load(env=None):
+    """NotifyConfig for env (default: the process environment), from a snapshot when still valid"""
+    process_env = env is None or env is os.environ
+    env = os.environ if env is None else env
+    path = env_file(env)
+    stamp = _stamp(path)
+    fingerprint = _fingerprint(env, path, stamp)
+    config = _loaded.get(fingerprint)
+    if config is not None:
+        return config
+
+    snapshot = snapshot_path(env) if process_env else None
+    if snapshot:
+        snapshot_key = _fingerprint(env, path, stamp, masked=_SECRETS)
+        config = _read_snapshot(snapshot, snapshot_key, env)
+    if config is None:
+        config = derive(env, _env_file_values(path, stamp, env) if stamp else None)
+        if snapshot:
+            _write_snapshot(snapshot, snapshot_key, config, env)
+    _loaded[fingerprint] = config
+    return config
+
+
+def parse_relays(env=None):
+    """Ordered (host, port) list: EMAIL_SMTP_SERVER/PORT first, then EMAIL_SMTP_RELAYS"""
+    env = os.environ if env is None else env
+    config = load(env)
+    relays = [(config.smtp_server, config.smtp_port)]
+    for entry in env.get("EMAIL_SMTP_RELAYS", "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.rpartition(":") if ":" in entry else (entry, "", "587")
+        try:
+            relay = (host, int(port or 587))
+        except ValueError:
+            logger.warning(f"⚠️ Skipping malformed EMAIL_SMTP_RELAYS entry {entry!r}")
+            continue
+        if relay not in relays:
+            relays.append(relay)
+    return relays
+
+
+def main():
+    """Main function to handle command line arguments"""
+    config = load()
+    if sys.argv[1:] == ["--shell"]:
+        print(config.shell_exports())
+        return 0
+    if sys.argv[1:]:
+        print("Usage: python -m quikapp_notify.notify_config [--shell]")
+        return 1
+    values = config.to_dict()
+    values["smtp_pass"] = "SET" if values["smtp_pass"] else "NOT SET"
+    values["env_file"] = env_file()
+    print(json.dumps(values, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
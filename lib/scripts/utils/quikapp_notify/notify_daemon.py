@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+QuikApp Notification Daemon
+Long-lived notifier that accepts build events over a local Unix socket and keeps
+one authenticated SMTP session (smtp_session.SMTPSession) warm between events.
+
+Usage:
+    python -m quikapp_notify.notify_daemon serve   # run in the foreground
+    python -m quikapp_notify.notify_daemon start   # spawn a detached daemon and wait until it accepts events
+    python -m quikapp_notify.notify_daemon stop    # ask a running daemon to shut down
+    python -m quikapp_notify.notify_daemon status  # check whether a daemon is listening
+"""
+
+import os
+import sys
+import json
+import queue
+import socket
+import socketserver
+import subprocess
+import threading
+import time
+import logging
+
+from . import spawn_args
+from . import error_excerpt
+from . import timing
+from .send_email import QuikAppEmailNotifier, send_notification
+from .smtp_session import SMTPSession, DEFAULT_IDLE_TIMEOUT, tls_stats
+
+logger = logging.getLogger("notify_daemon")
+
+DEFAULT_SOCKET_PATH = "/tmp/quikapp-notify.sock"
+
+
+def get_socket_path(env=None):
+    """Resolve the daemon socket path from QUIKAPP_NOTIFY_SOCKET"""
+    env = os.environ if env is None else env
+    return env.get("QUIKAPP_NOTIFY_SOCKET") or DEFAULT_SOCKET_PATH
+
+
+class NotificationDaemon:
+    """Queues events from clients and delivers them on a single worker thread"""
+
+    def __init__(self, socket_path, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.session = None
+        self.events = queue.Queue()
+        self.server = None
+        self._next_id = 0
+        self._id_lock = threading.Lock()
+
+    def submit(self, request):
+        """Queue an event and return its id and completion handle"""
+        with self._id_lock:
+            self._next_id += 1
+            event_id = self._next_id
+        done = {"event": threading.Event(), "success": False}
+        self.events.put((event_id, request, done))
+        return event_id, done
+
+    def session_for(self, notifier):
+        """Return the warm session, replacing it when the relay or credentials change"""
+        candidate = SMTPSession.from_env(notifier.env, idle_timeout=self.idle_timeout)
+        if self.session is not None and self.session.key != candidate.key:
+            self.session.close()
+            self.session = None
+        if self.session is None:
+            self.session = candidate
+        return self.session
+
+    def deliver(self, request):
+        """Render and send one event using the warm SMTP session"""
+        args, error_file = error_excerpt.pop_error_file(request.get("argv") or [])
+        env = request.get("env") or {}
+        if len(args) < 3:
+            logger.error(f"Rejected event with too few arguments: {args}")
+            return False
+
+        email_type, platform, build_id = args[:3]
+        error_message = args[3] if len(args) > 3 else "Unknown error occurred"
+        # The client turns stdin into a positional excerpt, so error_file is always a path here
+        error_log = os.path.join(request.get("cwd", ""), error_file) if error_file else None
+
+        if env.get("ENABLE_EMAIL_NOTIFICATIONS", "true").lower() == "false":
+            logger.info("Email notifications are disabled. Skipping event.")
+            return True
+
+        # Timing goes where the caller's environment says (QUIKAPP_TIMING_FILE / QUIKAPP_TIMING_PROM)
+        with timing.trace("notify_daemon", env=env):
+            with timing.span("env"):
+                notifier = QuikAppEmailNotifier(env=env, base_dir=request.get("cwd", ""))
+            notifier.smtp_session = self.session_for(notifier)
+            return send_notification(notifier, email_type, platform, build_id, error_message, error_log)
+
+    def run_worker(self):
+        """Deliver queued events until a None sentinel arrives"""
+        while True:
+            try:
+                item = self.events.get(timeout=30)
+            except queue.Empty:
+                if self.session is not None:
+                    self.session.close_if_idle()
+                continue
+            if item is None:
+                break
+
+            event_id, request, done = item
+            started = time.monotonic()
+            try:
+                done["success"] = bool(self.deliver(request))
+            except Exception as e:
+                logger.error(f"❌ Event {event_id} failed: {e}")
+            finally:
+                done["event"].set()
+            logger.info(f"Event {event_id} {'delivered' if done['success'] else 'failed'} "
+                        f"in {time.monotonic() - started:.2f}s")
+
+        if self.session is not None:
+            self.session.close()
+
+    def serve_forever(self):
+        """Bind the Unix socket and process events until shut down"""
+        if os.path.exists(self.socket_path):
+            if ping(self.socket_path):
+                logger.error(f"Another daemon is already listening on {self.socket_path}")
+                return 1
+            os.unlink(self.socket_path)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline().decode("utf-8"))
+                except ValueError:
+                    self._reply({"status": "error", "error": "invalid request"})
+                    return
+
+                command = request.get("command", "send")
+                if command == "ping":
+                    self._reply({"status": "ok", "pending": daemon.events.qsize(), "tls": tls_stats()})
+                elif command == "shutdown":
+                    self._reply({"status": "ok"})
+                    threading.Thread(target=daemon.server.shutdown, daemon=True).start()
+                elif command == "send":
+                    event_id, done = daemon.submit(request)
+                    if request.get("wait"):
+                        done["event"].wait()
+                        self._reply({"status": "sent" if done["success"] else "failed", "id": event_id})
+                    else:
+                        self._reply({"status": "queued", "id": event_id})
+                else:
+                    self._reply({"status": "error", "error": f"unknown command: {command}"})
+
+            def _reply(self, payload):
+                self.wfile.write((json.dumps(payload) + "\n").encode("utf-8"))
+
+        old_umask = os.umask(0o077)  # socket carries SMTP credentials, keep it owner-only
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon_threads = True
+
+        worker = threading.Thread(target=self.run_worker, name="notify-worker")
+        worker.start()
+        logger.info(f"📡 QuikApp notification daemon listening on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+            self.events.put(None)
+            worker.join()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            logger.info("Notification daemon stopped")
+        return 0
+
+
+def request(socket_path, payload, timeout=5.0):
+    """Send one JSON request to the daemon and return its reply"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline().decode("utf-8"))
+
+
+def ping(socket_path):
+    """Return True if a daemon answers on the socket"""
+    try:
+        return request(socket_path, {"command": "ping"}, timeout=1.0).get("status") == "ok"
+    except (OSError, ValueError):
+        return False
+
+
+def start_detached(socket_path, log_path, wait_seconds=10.0):
+    """Spawn `serve` in a new session and wait until it answers pings"""
+    if ping(socket_path):
+        logger.info(f"Daemon already running on {socket_path}")
+        return 0
+
+    argv, env = spawn_args("notify_daemon", "serve", env=dict(os.environ, QUIKAPP_NOTIFY_SOCKET=socket_path))
+    with open(log_path, "ab") as log_file:
+        subprocess.Popen(
+            argv, stdin=subprocess.DEVNULL, stdout=log_file, stderr=log_file,
+            start_new_session=True, env=env,
+        )
+
+    deadline = time.monotonic() + wait_seconds
+    while time.monotonic() < deadline:
+        if ping(socket_path):
+            logger.info(f"✅ Daemon started on {socket_path} (log: {log_path})")
+            return 0
+        time.sleep(0.05)
+    logger.error(f"❌ Daemon did not come up within {wait_seconds:.0f}s, see {log_path}")
+    return 1
+
+
+def main():
+    """Main function to handle command line arguments"""
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    socket_path = get_socket_path()
+
+    if command == "serve":
+        return NotificationDaemon(socket_path).serve_forever()
+    if command == "start":
+        log_path = os.environ.get("QUIKAPP_NOTIFY_LOG", "/tmp/quikapp-notify.log")
+        return start_detached(socket_path, log_path)
+    if command == "stop":
+        try:
+            request(socket_path, {"command": "shutdown"})
+        except OSError:
+            logger.info("Daemon is not running")
+        return 0
+    if command == "status":
+        try:
+            reply = request(socket_path, {"command": "ping"}, timeout=1.0)
+        except (OSError, ValueError):
+            print(f"QuikApp notification daemon not running on {socket_path}")
+            return 1
+        print(f"QuikApp notification daemon running on {socket_path}")
+        print(json.dumps(reply, indent=2))
+        return 0
+
+    print("Usage: python -m quikapp_notify.notify_daemon [serve|start|stop|status]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
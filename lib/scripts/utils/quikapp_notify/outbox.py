@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+QuikApp Email Outbox
+Durable on-disk spool for notification emails with a background delivery worker.
+
+Layout of the spool directory (QUIKAPP_OUTBOX_DIR, default /tmp/quikapp-outbox):
+    data/<id>.eml     serialized MIME message, written once
+    tmp/              metadata being written
+    new/<id>.json     queued, waiting for (re)delivery
+    cur/<id>.json     claimed by a worker
+    sent/<id>.json    delivered
+    failed/<id>.json  gave up (permanent error or attempts exhausted)
+
+Every state change is a rename, so a crash at any point leaves each message in exactly one state.
+
+Usage:
+    python -m quikapp_notify.outbox deliver   # deliver everything that is due, waiting out backoff delays
+    python -m quikapp_notify.outbox status    # print queue counts and failed messages as JSON
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import fcntl
+import random
+import logging
+
+from . import spawn_args
+from . import timing
+from . import notify_config
+
+logger = logging.getLogger("outbox")
+
+DEFAULT_OUTBOX_DIR = "/tmp/quikapp-outbox"
+STATES = ("tmp", "new", "cur", "sent", "failed")
+
+DEFAULT_MAX_ATTEMPTS = 6
+DEFAULT_BASE_DELAY = 5.0
+DEFAULT_MAX_DELAY = 300.0
+
+
+def is_enabled(env=None):
+    """Return True when QUIKAPP_OUTBOX asks senders to spool instead of sending inline"""
+    env = os.environ if env is None else env
+    return env.get("QUIKAPP_OUTBOX", "false").lower() == "true"
+
+
+def get_outbox_dir(env=None):
+    """Resolve the spool directory from QUIKAPP_OUTBOX_DIR"""
+    env = os.environ if env is None else env
+    return env.get("QUIKAPP_OUTBOX_DIR") or DEFAULT_OUTBOX_DIR
+
+
+def _env_number(env, name, default, minimum=0):
+    """Finite number (of default's type) from env[name], at least minimum; default (with a warning) otherwise"""
+    value = env.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        number = type(default)(value)
+    except ValueError:
+        number = minimum - 1
+    # "nan" and "inf" parse as floats; neither is a usable delay
+    if not minimum <= number < float("inf"):
+        logger.warning(f"⚠️ Ignoring {name}={value!r}, using {default:g}")
+        return default
+    return number
+
+
+def _ensure_layout(outbox_dir):
+    for name in STATES + ("data",):
+        os.makedirs(os.path.join(outbox_dir, name), mode=0o700, exist_ok=True)
+
+
+def _write_atomic(path, data):
+    """Write bytes (or whatever data(f) writes) to a temp file, fsync and rename into place; returns the size"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        if callable(data):
+            data(f)
+        else:
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+def _read_meta(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_meta(outbox_dir, state, meta):
+    """Write metadata via tmp/ and rename it into the given state directory"""
+    staged = os.path.join(outbox_dir, "tmp", f"{meta['id']}.json")
+    _write_atomic(staged, json.dumps(meta, indent=2).encode("utf-8"))
+    os.replace(staged, os.path.join(outbox_dir, state, f"{meta['id']}.json"))
+
+
+def spool(msg, from_addr, to_addrs, env=None, source="send_email.py"):
+    """Persist a message for background delivery and return its id"""
+    from . import mime_stream
+
+    env = os.environ if env is None else env
+    config = notify_config.load(env)
+    outbox_dir = get_outbox_dir(env)
+    _ensure_layout(outbox_dir)
+
+    message_id = f"{time.strftime('%Y%m%d%H%M%S')}-{os.urandom(6).hex()}"
+    with timing.span("spool") as spooled:
+        # Generated straight into the file, in the same format as msg.as_bytes()
+        spooled["bytes"] = _write_atomic(os.path.join(outbox_dir, "data", f"{message_id}.eml"),
+                                         lambda f: mime_stream.write_message(msg, f, linesep="\n"))
+        meta = {
+            "id": message_id,
+            "source": source,
+            "from": from_addr,
+            "to": list(to_addrs),
+            "subject": str(msg["Subject"]),
+            "smtp_server": config.smtp_server,
+            "smtp_port": config.smtp_port,
+            "smtp_user": config.smtp_user,
+            "relays": [list(relay) for relay in notify_config.parse_relays(env)],
+            "created": time.time(),
+            "attempts": 0,
+            "next_attempt": 0.0,
+            "last_error": None,
+            "status": "queued",
+        }
+        # The metadata rename is the commit point: a message is queued once new/<id>.json exists
+        _write_meta(outbox_dir, "new", meta)
+    logger.info(f"📥 Spooled message {message_id} to {outbox_dir}")
+    return message_id
+
+
+def spawn_worker(env=None):
+    """Start a detached delivery worker so the caller can return immediately"""
+    import subprocess
+
+    argv, env = spawn_args("outbox", "deliver", env=env)
+    outbox_dir = get_outbox_dir(env)
+    log_path = os.path.join(outbox_dir, "worker.log")
+    with open(log_path, "ab") as log_file, timing.span("spawn"):
+        subprocess.Popen(
+            argv, stdin=subprocess.DEVNULL, stdout=log_file, stderr=log_file,
+            start_new_session=True, env=env,
+        )
+
+
+def backoff_delay(attempts, base=DEFAULT_BASE_DELAY, cap=DEFAULT_MAX_DELAY):
+    """Exponential backoff with equal jitter for the given attempt count"""
+    delay = min(cap, base * (2 ** max(0, attempts - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def is_permanent_error(error):
+    """5xx replies (other than auth hiccups) will not succeed on retry"""
+    import smtplib
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+
+class OutboxWorker:
+    """Claims due messages from new/ and delivers them over one SMTP session per run"""
+
+    def __init__(self, outbox_dir, env=None):
+        self.outbox_dir = outbox_dir
+        self.env = os.environ if env is None else env
+        self.max_attempts = _env_number(self.env, "QUIKAPP_OUTBOX_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS, minimum=1)
+        self.base_delay = _env_number(self.env, "QUIKAPP_OUTBOX_BASE_DELAY", DEFAULT_BASE_DELAY)
+        self.max_delay = _env_number(self.env, "QUIKAPP_OUTBOX_MAX_DELAY", DEFAULT_MAX_DELAY)
+        self.session = None
+        _ensure_layout(outbox_dir)
+
+    def _path(self, state, message_id, ext="json"):
+        return os.path.join(self.outbox_dir, state, f"{message_id}.{ext}")
+
+    def _ids(self, state):
+        return sorted(name[:-5] for name in os.listdir(os.path.join(self.outbox_dir, state))
+                      if name.endswith(".json"))
+
+    def recover(self):
+        """Requeue messages claimed by workers that died mid-delivery"""
+        for message_id in self._ids("cur"):
+            try:
+                meta = _read_meta(self._path("cur", message_id))
+            except (OSError, ValueError):
+                continue
+            if not _pid_alive(meta.get("worker_pid", 0)):
+                logger.warning(f"♻️ Requeuing {message_id} left behind by worker {meta.get('worker_pid')}")
+                meta["status"] = "queued"
+                _write_meta(self.outbox_dir, "new", meta)
+                os.unlink(self._path("cur", message_id))
+
+    def claim(self, message_id):
+        """Atomically move a message from new/ to cur/, returning its metadata or None"""
+        try:
+            os.rename(self._path("new", message_id), self._path("cur", message_id))
+        except FileNotFoundError:
+            return None  # another worker won the race
+        meta = _read_meta(self._path("cur", message_id))
+        meta["worker_pid"] = os.getpid()
+        meta["status"] = "sending"
+        _write_meta(self.outbox_dir, "cur", meta)
+        return meta
+
+    def _session_for(self, meta):
+        """Return an authenticated SMTP session for the message's relay"""
+        from .smtp_session import SMTPSession, DeliveryPolicy
+        relays = meta.get("relays") or [(meta["smtp_server"], meta["smtp_port"])]
+        candidate = SMTPSession(relays, meta["smtp_user"], notify_config.load(self.env).smtp_pass,
+                                policy=DeliveryPolicy.from_env(self.env))
+        if self.session is not None and self.session.key != candidate.key:
+            self.close()
+        if self.session is None:
+            self.session = candidate
+        return self.session
+
+    def close(self):
+        """Close the SMTP session if one is open"""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def deliver(self, meta):
+        """Attempt delivery of one claimed message and file it under its next state"""
+        message_id = meta["id"]
+        meta["attempts"] += 1
+        try:
+            # Streamed from disk into DATA, never read whole
+            refused = self._session_for(meta).send_file(meta["from"], meta["to"], self._path("data", message_id, "eml"))
+            if refused:
+                from smtplib import SMTPRecipientsRefused
+                raise SMTPRecipientsRefused(refused)
+        except Exception as e:
+            self.close()
+            meta["last_error"] = f"{type(e).__name__}: {e}"
+            if is_permanent_error(e) or meta["attempts"] >= self.max_attempts:
+                meta["status"] = "failed"
+                meta["finished"] = time.time()
+                _write_meta(self.outbox_dir, "failed", meta)
+                os.unlink(self._path("cur", message_id))
+                logger.error(f"❌ Giving up on {message_id} after {meta['attempts']} attempt(s): {meta['last_error']}")
+                return False
+            delay = backoff_delay(meta["attempts"], self.base_delay, self.max_delay)
+            meta["status"] = "queued"
+            meta["next_attempt"] = time.time() + delay
+            _write_meta(self.outbox_dir, "new", meta)
+            os.unlink(self._path("cur", message_id))
+            logger.warning(f"⏳ Attempt {meta['attempts']} for {message_id} failed ({meta['last_error']}), "
+                           f"retrying in {delay:.1f}s")
+            return False
+
+        meta["status"] = "sent"
+        meta["finished"] = time.time()
+        meta["last_error"] = None
+        _write_meta(self.outbox_dir, "sent", meta)
+        os.unlink(self._path("cur", message_id))
+        logger.info(f"✅ Delivered {message_id} to {', '.join(meta['to'])} (attempt {meta['attempts']})")
+        return True
+
+    def run_once(self):
+        """Deliver every due message; return seconds until the next one is due, or None if idle"""
+        next_due = None
+        for message_id in self._ids("new"):
+            try:
+                due = _read_meta(self._path("new", message_id)).get("next_attempt", 0)
+            except (OSError, ValueError):
+                continue
+            if due > time.time():
+                next_due = due if next_due is None else min(next_due, due)
+                continue
+            meta = self.claim(message_id)
+            if meta is not None:
+                with timing.trace("outbox", env=self.env, message=message_id, source=meta.get("source")) as active:
+                    active.attrs["sent"] = self.deliver(meta)
+                    active.attrs["attempt"] = meta["attempts"]
+                if meta["status"] == "queued":
+                    due = meta["next_attempt"]
+                    next_due = due if next_due is None else min(next_due, due)
+        self.close()
+        return None if next_due is None else max(0.0, next_due - time.time())
+
+    def run(self):
+        """Deliver until the queue is empty, sleeping through backoff delays"""
+        self.recover()
+        while True:
+            wait = self.run_once()
+            if wait is None:
+                from .smtp_session import tls_stats
+                logger.info(f"Outbox drained, TLS handshakes: {json.dumps(tls_stats())}")
+                return
+            time.sleep(wait)
+
+
+def run_worker(env=None):
+    """Run a worker unless another one already holds the spool lock"""
+    env = os.environ if env is None else env
+    outbox_dir = get_outbox_dir(env)
+    _ensure_layout(outbox_dir)
+    worker = OutboxWorker(outbox_dir, env)
+
+    with open(os.path.join(outbox_dir, "worker.lock"), "w") as lock:
+        while True:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.info("Another outbox worker is running, leaving delivery to it")
+                return 0
+            try:
+                worker.run()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            # A message spooled while we held the lock may have seen its own worker exit early
+            if not worker._ids("new"):
+                return 0
+
+
+def status(env=None):
+    """Summarize the spool: counts per state plus details of failed messages"""
+    outbox_dir = get_outbox_dir(env)
+    _ensure_layout(outbox_dir)
+    summary = {"outbox": outbox_dir, "counts": {}, "failed": []}
+    for state in ("new", "cur", "sent", "failed"):
+        ids = [name[:-5] for name in os.listdir(os.path.join(outbox_dir, state)) if name.endswith(".json")]
+        summary["counts"][state] = len(ids)
+        if state == "failed":
+            for message_id in sorted(ids):
+                meta = _read_meta(os.path.join(outbox_dir, state, f"{message_id}.json"))
+                summary["failed"].append({k: meta.get(k) for k in ("id", "subject", "to", "attempts", "last_error")})
+    return summary
+
+
+def main():
+    """Main function to handle command line arguments"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    command = sys.argv[1] if len(sys.argv) > 1 else "deliver"
+
+    if command == "deliver":
+        return run_worker()
+    if command == "status":
+        print(json.dumps(status(), indent=2))
+        return 0
+
+    print("Usage: python -m quikapp_notify.outbox [deliver|status]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
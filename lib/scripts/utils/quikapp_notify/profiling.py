@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+QuikApp Notify Profiling
+Opt-in cProfile + tracemalloc profiling of a whole sender run, for real invocations on
+the runner (huge error logs, many artifacts) without editing any script.
+
+Enabled by --profile anywhere on the command line of send_email, send_ios_emails or mailer
+(the flag is removed before the command parses its arguments), or by QUIKAPP_NOTIFY_PROFILE:
+    true / 1         write reports to <artifact dir>/profiles (output/profiles)
+    <directory>      write reports there
+Each run writes <command>-<time>-<pid> with three extensions:
+    .pstats          cProfile data (python -m pstats, snakeviz, or diff below)
+    .tracemalloc     tracemalloc snapshot of the memory still allocated at exit
+    .txt             wall time, peak memory, top functions and top allocating lines
+
+Usage:
+    python -m quikapp_notify.profiling diff <before.pstats> <after.pstats> [top]
+    python -m quikapp_notify.profiling diff <before.tracemalloc> <after.tracemalloc> [top]
+"""
+
+import os
+import sys
+import time
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger("profiling")
+
+FLAG = "--profile"
+# Frames kept per allocation; enough to see which caller of a helper allocated
+TRACEMALLOC_FRAMES = 10
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 20
+
+
+def profile_dir(env, flag=False):
+    """Directory to write reports to, or None when profiling is off"""
+    value = env.get("QUIKAPP_NOTIFY_PROFILE", "").strip()
+    if value.lower() in ("", "0", "false", "no"):
+        if not flag:
+            return None
+        value = "true"
+    if value.lower() not in ("1", "true", "yes"):
+        return value
+    from . import artifacts
+    return os.path.join(artifacts.output_dir(env), "profiles")
+
+
+def _snapshot_filters(tracemalloc):
+    return (
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    )
+
+
+def write_reports(directory, name, profiler, snapshot, peak, elapsed):
+    """Write the .pstats, .tracemalloc and .txt reports and return their common path prefix"""
+    import io
+    import pstats
+
+    os.makedirs(directory, exist_ok=True)
+    prefix = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    profiler.dump_stats(f"{prefix}.pstats")
+    snapshot.dump(f"{prefix}.tracemalloc")
+
+    out = io.StringIO()
+    out.write(f"{name} {' '.join(sys.argv[1:])}\n")
+    out.write(f"wall time {elapsed * 1000:.1f} ms, peak traced memory {peak / 1024:.1f} KiB\n\n")
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+    out.write(f"Top {TOP_ALLOCATIONS} allocating lines still held at exit\n")
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        out.write(f"    {stat}\n")
+    with open(f"{prefix}.txt", "w", encoding="utf-8") as f:
+        f.write(out.getvalue())
+    return prefix
+
+
+def _report(level, message):
+    """Log message, or print it to stderr for the senders that never configure logging"""
+    if logging.getLogger().handlers:
+        logger.log(level, message)
+    else:
+        print(message, file=sys.stderr)
+
+
+@contextmanager
+def profiled(name, env=None):
+    """Profile the enclosed run when --profile or QUIKAPP_NOTIFY_PROFILE asks for it"""
+    env = os.environ if env is None else env
+    flag = FLAG in sys.argv[1:]
+    if flag:
+        sys.argv[1:] = [arg for arg in sys.argv[1:] if arg != FLAG]
+    directory = profile_dir(env, flag)
+    if directory is None:
+        yield
+        return
+
+    import cProfile
+    import tracemalloc
+
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot().filter_traces(_snapshot_filters(tracemalloc))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        try:
+            prefix = write_reports(directory, name, profiler, snapshot, peak, elapsed)
+            _report(logging.INFO, f"🔬 Profile of {name} written to {prefix}.{{pstats,tracemalloc,txt}}")
+        except OSError as e:
+            _report(logging.WARNING, f"⚠️ Could not write the profile of {name}: {e}")
+
+
+def _function_key(key):
+    """Stable name for a pstats entry: the last two path parts and the function, without the line"""
+    filename, _, function = key
+    parts = filename.replace("\\", "/").split("/")
+    return f"{'/'.join(parts[-2:])}:{function}"
+
+
+def _load_functions(path):
+    """{function: [calls, own seconds, cumulative seconds]} from a .pstats file"""
+    import pstats
+
+    functions = {}
+    for key, (_, calls, tottime, cumtime, _) in pstats.Stats(path).stats.items():
+        entry = functions.setdefault(_function_key(key), [0, 0.0, 0.0])
+        entry[0] += calls
+        entry[1] += tottime
+        entry[2] += cumtime
+    return functions
+
+
+def diff_pstats(before_path, after_path, top=20):
+    """Rows for the functions whose cumulative time changed most, largest change first"""
+    before = _load_functions(before_path)
+    after = _load_functions(after_path)
+    rows = []
+    for function in before.keys() | after.keys():
+        old = before.get(function, [0, 0.0, 0.0])
+        new = after.get(function, [0, 0.0, 0.0])
+        rows.append({
+            "function": function,
+            "calls": (old[0], new[0]),
+            "own_ms": (old[1] * 1000, new[1] * 1000),
+            "cumulative_ms": (old[2] * 1000, new[2] * 1000),
+            "delta_ms": (new[2] - old[2]) * 1000,
+        })
+    rows.sort(key=lambda row: abs(row["delta_ms"]), reverse=True)
+    totals = (sum(entry[1] for entry in before.values()) * 1000, sum(entry[1] for entry in after.values()) * 1000)
+    return totals, rows[:top]
+
+
+def diff_tracemalloc(before_path, after_path, top=20):
+    """tracemalloc StatisticDiff entries for the lines whose retained memory changed most"""
+    import tracemalloc
+
+    before = tracemalloc.Snapshot.load(before_path)
+    after = tracemalloc.Snapshot.load(after_path)
+    return after.compare_to(before, "lineno")[:top]
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) not in (4, 5) or sys.argv[1] != "diff":
+        print("Usage: python -m quikapp_notify.profiling diff <before.pstats|.tracemalloc> <after> [top]")
+        return 1
+    before, after = sys.argv[2], sys.argv[3]
+    top = int(sys.argv[4]) if len(sys.argv) > 4 else 20
+    try:
+        if before.endswith(".tracemalloc"):
+            for stat in diff_tracemalloc(before, after, top):
+                print(stat)
+            return 0
+        (old_total, new_total), rows = diff_pstats(before, after, top)
+    except (OSError, ValueError, EOFError) as e:
+        print(f"Cannot compare {before} and {after}: {e}")
+        return 1
+
+    print(f"total profiled time {old_total:.1f} ms -> {new_total:.1f} ms ({new_total - old_total:+.1f} ms)")
+    print(f"{'cumulative ms':>24}{'delta':>10}{'calls':>16}  function")
+    for row in rows:
+        old_ms, new_ms = row["cumulative_ms"]
+        old_calls, new_calls = row["calls"]
+        print(f"{old_ms:>11.1f} -> {new_ms:>9.1f}{row['delta_ms']:>+10.1f}{old_calls:>7} -> {new_calls:<6}  {row['function']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
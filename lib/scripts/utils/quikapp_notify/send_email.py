@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+"""
+QuikApp Enhanced Email Notification System v2.0
+Professional email notifications for build status with modern UI design
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.header import Header
+import logging
+
+from . import timing
+from . import profiling
+from . import error_excerpt
+from . import email_templates
+from . import notify_config
+# Imported where used: the artifact modules (artifacts, checksums, artifact_inspector,
+# artifact_links, link_check) by success emails, build_history (sqlite3) unless QUIKAPP_HISTORY
+# is false, log_attachment by failure emails, outbox when spooling and smtp_session (smtplib,
+# ssl) for direct SMTP delivery
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Growth of an artifact since the previous build (percent) that is flagged in the size report
+DEFAULT_SIZE_REGRESSION_PCT = 5.0
+
+# Repeated 14 times per email, so kept in the optimizer's minified form
+BADGE_ENABLED = '<span style="background:#28a745;color:white;padding:4px 8px;border-radius:12px;font-size:12px;font-weight:600">✅ Enabled</span>'
+BADGE_DISABLED = '<span style="background:#6c757d;color:white;padding:4px 8px;border-radius:12px;font-size:12px;font-weight:600">❌ Disabled</span>'
+
+def _size_delta(size, previous):
+    """('+1.2 MB', color) for the change from previous to size; ('', grey) without a previous size"""
+    if previous is None:
+        return "", "#6c757d"
+    from . import artifacts
+    change = size - previous
+    if change == 0:
+        return "±0", "#6c757d"
+    sign = "+" if change > 0 else "−"
+    return f"{sign}{artifacts.format_size(abs(change))}", "#dc3545" if change > 0 else "#28a745"
+
+def _format_duration(seconds):
+    """'12m 30s' style duration"""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
+
+class QuikAppEmailNotifier:
+    def __init__(self, env=None, base_dir=""):
+        """Initialize the email notifier with environment variables"""
+        # The daemon passes the caller's environment and working directory explicitly
+        self.env = os.environ if env is None else env
+        self.base_dir = base_dir
+        # SMTP session reused across sends; opened lazily, or injected by notify_daemon.py
+        self.smtp_session = None
+        self._owns_session = False
+        # Optional callable(msg, from_addr, to_addrs) that takes rendered messages instead of SMTP (bulk sends)
+        self.message_sink = None
+        # Build history connection (build_history.py); opened lazily, False once it proved unavailable
+        self.history = None
+        # Total artifact bytes of the last success email, recorded with its event
+        self.artifact_bytes = None
+        
+        # Settings shared by all senders: environment first, then lib/config/env.sh (notify_config.py)
+        self.config = notify_config.load(self.env)
+        config = self.config
+        
+        # SMTP Configuration
+        self.smtp_server = config.smtp_server
+        self.smtp_port = config.smtp_port
+        self.smtp_user = config.smtp_user
+        self.smtp_pass = config.smtp_pass
+        self.recipient = config.recipient
+        
+        # App Configuration
+        self.app_name = config.app_name
+        self.version_name = config.version_name
+        self.version_code = config.version_code
+        self.org_name = config.org_name
+        self.user_name = config.user_name
+        self.workflow_id = config.workflow_id
+        self.project_id = config.project_id
+        
+        # Feature flags and permissions, keyed like feature_badges.html
+        self.features = config.features
+        self.permissions = config.permissions
+        
+        logger.info(f"Email notifier initialized for {self.app_name} v{self.version_name}")
+        logger.info(f"SMTP: {self.smtp_server}:{self.smtp_port}, User: {self.smtp_user}")
+        logger.info(f"Recipient: {self.recipient}")
+
+    def __enter__(self):
+        """Batch several sends over one SMTP session"""
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Close the SMTP session if this notifier opened it"""
+        if self.smtp_session is not None and self._owns_session:
+            self.smtp_session.close()
+            self.smtp_session = None
+            self._owns_session = False
+
+    def _get_session(self):
+        """Return the shared SMTP session, creating it on first use"""
+        if self.smtp_session is None:
+            from .smtp_session import SMTPSession
+            self.smtp_session = SMTPSession.from_env(self.env)
+            self._owns_session = True
+        return self.smtp_session
+
+    def _history(self):
+        """Build history connection, or None when disabled (QUIKAPP_HISTORY=false) or unavailable"""
+        if self.history is None:
+            self.history = False
+            if self.env.get("QUIKAPP_HISTORY", "true").lower() != "false":
+                import sqlite3
+                from . import build_history
+                try:
+                    self.history = build_history.connect(build_history.db_path(self.env))
+                except (sqlite3.Error, OSError) as e:
+                    logger.warning(f"⚠️ Build history unavailable: {e}")
+        return self.history or None
+
+    def record_event(self, email_type, platform, build_id, delivered, delivery_ms):
+        """Add this notification to the build history"""
+        history = self._history()
+        if history is None:
+            return
+        import sqlite3
+        from . import build_history
+        try:
+            build_history.record_event(history, self.app_name, self.workflow_id, platform, build_id, email_type,
+                                       delivered, delivery_ms,
+                                       self.artifact_bytes if email_type == "build_success" else None)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Could not record {email_type} in build history: {e}")
+
+    def generate_trend_strip(self, build_id, succeeded, limit=10):
+        """Colored squares for the last builds of this app and workflow, this one last"""
+        history = self._history()
+        if history is None:
+            return ""
+        import sqlite3
+        from . import build_history
+        try:
+            builds = build_history.recent_builds(history, self.app_name, self.workflow_id, limit - 1, build_id)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Build history query failed: {e}")
+            return ""
+        if not builds:
+            return ""
+        builds.reverse()
+        builds.append({"build_id": build_id, "event": "build_success" if succeeded else "build_failed",
+                       "recorded_at": None, "duration": None})
+
+        cell_template = email_templates.get_template("trend_cell.html")
+        cells = []
+        for build in builds:
+            passed = build["event"] == "build_success"
+            title = f"{build['build_id']}: {'passed' if passed else 'failed'}"
+            if build["recorded_at"]:
+                title += f" · {datetime.fromtimestamp(build['recorded_at']).strftime('%Y-%m-%d %H:%M')}"
+            if build["duration"]:
+                title += f" · {_format_duration(build['duration'])}"
+            cells.append(cell_template.render(title=title, color="#28a745" if passed else "#dc3545"))
+
+        passed = sum(1 for b in builds if b["event"] == "build_success")
+        summary = f"Last {len(builds)} builds: {passed} passed ({passed * 100 // len(builds)}%)"
+        durations = [b["duration"] for b in builds if b["duration"]]
+        if durations:
+            import statistics
+            summary += f" · median build time {_format_duration(statistics.median(durations))}"
+        return email_templates.render("trend_strip.html", cells=b"".join(cells), summary=summary)
+
+    def get_file_size(self, file_path):
+        """Get human readable file size"""
+        from . import artifacts
+        try:
+            return artifacts.format_size(os.path.getsize(file_path))
+        except OSError:
+            return "Unknown"
+
+    def scan_artifacts(self):
+        """Scan for build artifacts in output directories"""
+        # One scandir walk over output/ (QUIKAPP_ARTIFACT_DIR), matched against artifacts.ARTIFACT_PATTERNS
+        from . import artifacts
+        found = artifacts.discover_from_env(self.env, self.base_dir)
+        logger.info(f"Found {len(found)} artifacts: {[a['path'] for a in found]}")
+        return found
+
+    def generate_artifact_cards(self, build_id, found=None):
+        """Generate HTML cards for downloadable artifacts"""
+        if found is None:
+            found = self.scan_artifacts()
+        
+        if not found:
+            return email_templates.render("artifacts_empty.html")
+        
+        # Codemagic build and project IDs (CM_*, FCI_* or BUILD_NUMBER, see notify_config.FIELDS)
+        cm_build_id = self.config.build_id or build_id
+        cm_project_id = self.project_id
+        
+        logger.info(f"Using build_id: {cm_build_id} (from env: {self.config.build_id or 'NOT SET'})")
+        logger.info(f"Using project_id: {cm_project_id}")
+        
+        from . import artifacts, checksums, artifact_links, link_check
+        codemagic_build_url = f"https://codemagic.io/builds/{cm_build_id if cm_build_id != 'unknown' else build_id}"
+        output_dir = artifacts.output_dir(self.env, self.base_dir)
+        
+        # Checksums are cached by file identity, so repeat notifications don't re-hash
+        with timing.span("checksums"):
+            checksums.add_checksums(found)
+        # Real upload URLs from CM_ARTIFACT_LINKS, or from the manifest of an earlier notification
+        artifact_links.resolve(found, self.env.get("CM_ARTIFACT_LINKS", ""),
+                               os.path.join(output_dir, checksums.MANIFEST_NAME))
+        
+        # Don't ship links that 404 (expired or private uploads); unreachable hosts keep their link
+        budget = link_check.budget_from_env(self.env)
+        urls = [a['download_url'] for a in found if a['download_url']]
+        link_status = {}
+        if budget and urls:
+            with timing.span("link_check", urls=len(urls)):
+                link_status = link_check.check_urls(urls, budget=budget)
+        for artifact in found:
+            ok, detail = link_status.get(artifact['download_url'], (None, None))
+            if ok is False:
+                logger.warning(f"⚠️ Download link for {artifact['filename']} is dead ({detail}), linking the build page")
+                artifact['download_url'] = artifact['link_source'] = None
+        
+        # Written after the link check, so a later resolve() never reads back a dead link
+        version_name, version_code = self._built_version(found)
+        checksums.write_manifest(output_dir, found,
+                                 app_name=self.app_name, version_name=version_name,
+                                 version_code=version_code, workflow_id=self.workflow_id,
+                                 project_id=cm_project_id, build_id=cm_build_id)
+        
+        card_template = email_templates.get_template("artifact_card.html")
+        checksum_template = email_templates.get_template("artifact_checksum.html")
+        cards = []
+        for artifact in found:
+            artifact['checksum'] = checksum_template.render(sha256=artifact['sha256']) if artifact['sha256'] else b""
+            if artifact['download_url']:
+                artifact['download_label'] = "Download"
+                logger.info(f"Download URL for {artifact['filename']} ({artifact['link_source']}): {artifact['download_url']}")
+            else:
+                # Not uploaded under this name, CM_ARTIFACT_LINKS unavailable or the link is dead: link the build page
+                artifact['download_url'] = codemagic_build_url
+                artifact['download_label'] = "Download from Codemagic"
+            cards.append(card_template.render(**artifact))
+        
+        return email_templates.render("artifacts.html", cards=b"".join(cards), build_page_url=codemagic_build_url)
+    
+    def generate_feature_badges(self):
+        """Generate HTML for feature and permission badges"""
+        def get_badge(enabled):
+            return BADGE_ENABLED if enabled else BADGE_DISABLED
+        
+        badges = {name: get_badge(enabled) for name, enabled in self.features.items()}
+        badges.update((name, get_badge(enabled)) for name, enabled in self.permissions.items())
+        return email_templates.render("feature_badges.html", **badges)
+    
+    def _app_info(self, platform, build_id):
+        """Values shared by the app-info grid of every build email"""
+        return {
+            'app_name': self.app_name,
+            'version_name': self.version_name,
+            'version_code': self.version_code,
+            'platform': platform,
+            'build_id': build_id,
+            'workflow_id': self.workflow_id,
+            'org_name': self.org_name,
+            'user_name': self.user_name,
+        }
+    
+    def send_build_started_email(self, platform, build_id):
+        """Send build started notification"""
+        subject = f"🚀 QuikApp Build Started - {self.app_name}"
+        
+        with timing.span("render"):
+            html = email_templates.render(
+                "build_started.html",
+                feature_badges=self.generate_feature_badges(),
+                **self._app_info(platform, build_id),
+            )
+        
+        return self._send_email(subject, html)
+    
+    def _built_version(self, found):
+        """(version name, code) of the first inspected artifact that has one, else the environment's"""
+        for artifact in found:
+            metadata = artifact.get('metadata')
+            if not metadata:
+                continue
+            if metadata.get('version_name'):
+                return metadata['version_name'], metadata.get('version_code') or self.version_code
+            break
+        return self.version_name, self.version_code
+    
+    def generate_binary_details(self, found, app_info):
+        """Rows describing the built APK/AAB/IPA files; updates app_info with the built version"""
+        from . import artifact_inspector
+        row_template = email_templates.get_template("app_binary.html")
+        # The manifest takes its version from _built_version too, so it and the email agree
+        built = self._built_version(found)
+        if built != (app_info['version_name'], app_info['version_code']):
+            logger.warning(f"⚠️ Built version is {built[0]} ({built[1]}), "
+                           f"environment says {app_info['version_name']} ({app_info['version_code']})")
+            app_info['version_name'], app_info['version_code'] = built
+        rows = []
+        for artifact in found:
+            metadata = artifact.get('metadata')
+            if not metadata:
+                continue
+            label = "Frameworks" if metadata['platform'] == "ios" else "Native libraries"
+            rows.append(row_template.render(
+                name=f"{artifact['name']} ({artifact['path']})",
+                summary=artifact_inspector.describe(metadata),
+                contents=f"{label}: {', '.join(metadata['frameworks'])}" if metadata['frameworks'] else "",
+            ))
+        return b"".join(rows)
+
+    def generate_size_report(self, found, build_id):
+        """Per-category size tables for the built APK/AAB/IPA files, with the change since the previous build"""
+        inspected = [a for a in found if a.get('metadata')]
+        if not inspected:
+            return ""
+        history = self._history()
+        import sqlite3
+        from . import artifacts, build_history
+        try:
+            threshold = float(self.env.get("QUIKAPP_SIZE_REGRESSION_PCT", DEFAULT_SIZE_REGRESSION_PCT))
+        except ValueError:
+            threshold = DEFAULT_SIZE_REGRESSION_PCT
+
+        table_template = email_templates.get_template("size_table.html")
+        row_template = email_templates.get_template("size_row.html")
+        tables = []
+        for artifact in inspected:
+            metadata = artifact['metadata']
+            sizes = metadata['sizes']
+            version = f"{metadata.get('version_name') or '?'} ({metadata.get('version_code') or '?'})"
+            previous = None
+            if history is not None:
+                try:
+                    previous = build_history.record_size(history, metadata.get('id') or self.app_name,
+                                                         artifact['path'], build_id, version, sizes)
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ Could not record sizes of {artifact['path']}: {e}")
+            old_sizes = previous['breakdown'] if previous else {}
+            categories = list(sizes) + [c for c in old_sizes if c not in sizes]
+
+            rows = []
+            for category in categories:
+                compressed, uncompressed, _ = sizes.get(category, (0, 0, 0))
+                delta, color = _size_delta(compressed, old_sizes.get(category, (0,))[0] if previous else None)
+                rows.append(row_template.render(category=category, compressed=artifacts.format_size(compressed),
+                                                uncompressed=artifacts.format_size(uncompressed),
+                                                delta=delta, delta_color=color))
+
+            total = sum(s[0] for s in sizes.values())
+            summary = f"{artifacts.format_size(total)} download, {artifacts.format_size(sum(s[1] for s in sizes.values()))} installed"
+            color = "#6c757d"
+            if previous:
+                old_total = previous['compressed']
+                delta, color = _size_delta(total, old_total)
+                percent = (total - old_total) * 100.0 / old_total if old_total else 0.0
+                summary += f" · {delta} ({percent:+.1f}%) vs build {previous['build_id']}, {previous['version']}"
+                if percent > threshold:
+                    summary = f"⚠️ {summary}"
+                    color = "#dc3545"
+                    logger.warning(f"⚠️ {artifact['path']} grew {percent:.1f}% since build {previous['build_id']} "
+                                   f"(threshold {threshold:g}%)")
+            tables.append(table_template.render(name=f"{artifact['name']} ({artifact['path']})", summary=summary,
+                                                delta_color=color, rows=b"".join(rows)))
+        return email_templates.render("size_report.html", tables=b"".join(tables))
+
+    def send_build_success_email(self, platform, build_id):
+        """Send build success notification with download links"""
+        subject = f"🎉 QuikApp Build Successful - {self.app_name}"
+        
+        # Version and ids come from the built files when they can be read, not from the environment
+        from . import artifact_inspector
+        with timing.span("scan") as scan:
+            found = artifact_inspector.inspect_artifacts(self.scan_artifacts())
+            scan["artifacts"] = len(found)
+        self.artifact_bytes = sum(a['bytes'] for a in found)
+        app_info = self._app_info(platform, build_id)
+        with timing.span("render"):
+            binary_details = self.generate_binary_details(found, app_info)
+            html = email_templates.render(
+                "build_success.html",
+                timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+                artifact_cards=self.generate_artifact_cards(build_id, found),
+                feature_badges=self.generate_feature_badges(),
+                binary_details=binary_details,
+                size_report=self.generate_size_report(found, build_id),
+                trend_strip=self.generate_trend_strip(build_id, True),
+                **app_info,
+            )
+        
+        return self._send_email(subject, html)
+    
+    def send_build_failed_email(self, platform, build_id, error_message, error_log=None):
+        """Send build failure notification, summarizing error_log when one is given"""
+        subject = f"❌ QuikApp Build Failed - {self.app_name}"
+        
+        with timing.span("render"):
+            html = email_templates.render(
+                "build_failed.html",
+                timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+                error_details=error_excerpt.render_error_details(error_message, error_log),
+                trend_strip=self.generate_trend_strip(build_id, False),
+                **self._app_info(platform, build_id),
+            )
+        from . import log_attachment
+        with timing.span("attach"):
+            attachment = log_attachment.build(error_log, self.env)
+
+        return self._send_email(subject, html, [attachment] if attachment is not None else [])
+    
+    def _send_email(self, subject, html_content, attachments=()):
+        """Send email with enhanced error handling and logging"""
+        if not self.smtp_user or not self.smtp_pass:
+            logger.warning("Missing SMTP credentials. Skipping email.")
+            return False
+        
+        try:
+            with timing.span("mime"):
+                # Create message; attachments need a mixed container around the HTML
+                msg = MIMEMultipart('mixed' if attachments else 'alternative')
+                msg['Subject'] = Header(subject, 'utf-8')
+                msg['From'] = Header(f"QuikApp Build System <{self.smtp_user}>", 'utf-8')
+                msg['To'] = Header(self.recipient, 'utf-8')
+                msg['X-Priority'] = '2'  # High priority
+                msg['X-Mailer'] = 'QuikApp Build System v2.0'
+                
+                # Attach HTML content
+                html_part = MIMEText(html_content, 'html', 'utf-8')
+                msg.attach(html_part)
+                for attachment in attachments:
+                    msg.attach(attachment)
+            
+            # Bulk senders collect rendered messages and deliver them concurrently
+            if self.message_sink is not None:
+                return self.message_sink(msg, self.smtp_user, [self.recipient])
+            
+            # Hand the message to the durable outbox instead of waiting on SMTP
+            from . import outbox
+            if outbox.is_enabled(self.env):
+                outbox.spool(msg, self.smtp_user, [self.recipient], env=self.env)
+                outbox.spawn_worker(self.env)
+                logger.info(f"📥 Email to {self.recipient} queued for background delivery")
+                return True
+            
+            # Send email with enhanced connection handling
+            relays = ", ".join(f"{host}:{port}" for host, port in notify_config.parse_relays(self.env))
+            logger.info(f"Sending email to {self.recipient} via {relays}")
+            
+            import smtplib
+            try:
+                return self._deliver(self._get_session(), msg)
+            except smtplib.SMTPAuthenticationError as e:
+                logger.error(f"❌ SMTP Authentication failed: {e}")
+            except smtplib.SMTPRecipientsRefused as e:
+                logger.error(f"❌ Recipient refused: {e}")
+            except smtplib.SMTPServerDisconnected as e:
+                logger.error(f"❌ SMTP server disconnected: {e}")
+                    
+        except Exception as e:
+            logger.error(f"❌ Failed to send email: {e}")
+            
+        return False
+    
+    def _deliver(self, session, msg):
+        """Send a prepared message over the reusable SMTP session"""
+        # Generated straight into the DATA stream; no serialized copy of the message is kept
+        result = session.send_message(self.smtp_user, [self.recipient], msg)
+        
+        if result:
+            logger.warning(f"Email delivery issues: {result}")
+            return False
+        
+        logger.info(f"✅ Email sent successfully to {self.recipient}")
+        return True
+
+def send_notification(notifier, email_type, platform, build_id, error_message="Unknown error occurred",
+                      error_log=None):
+    """Dispatch a build event to the matching notifier method and record it in the build history"""
+    with timing.trace("send_email", env=notifier.env, email_type=email_type, platform=platform,
+                      build_id=build_id) as active:
+        started = time.perf_counter()
+        if email_type == "build_started":
+            sent = notifier.send_build_started_email(platform, build_id)
+        elif email_type == "build_success":
+            sent = notifier.send_build_success_email(platform, build_id)
+        elif email_type == "build_failed":
+            sent = notifier.send_build_failed_email(platform, build_id, error_message, error_log)
+        else:
+            raise ValueError(f"Unknown email type: {email_type}")
+        with timing.span("history"):
+            notifier.record_event(email_type, platform, build_id, sent, (time.perf_counter() - started) * 1000)
+        active.attrs["sent"] = sent
+        return sent
+
+def main():
+    """Main function to handle command line arguments"""
+    # One timing trace for the whole run, so settings loading is part of it
+    with profiling.profiled("send_email"), timing.trace("send_email"):
+        _main()
+
+def _main():
+    """Load the settings, send the email named on the command line and exit with its result"""
+    # Add debugging information
+    logger.info("=== QuikApp Email System Debug Info ===")
+    logger.info(f"Python version: {sys.version}")
+    logger.info(f"Arguments received: {sys.argv}")
+    with timing.span("env"):
+        config = notify_config.load()
+    logger.info(f"Settings (environment, then {notify_config.env_file() or 'no env.sh'}):")
+    logger.info(f"  SMTP: {config.smtp_server}:{config.smtp_port}")
+    logger.info(f"  EMAIL_SMTP_USER: {config.smtp_user or 'NOT SET'}")
+    logger.info(f"  EMAIL_SMTP_PASS: {'SET' if config.smtp_pass else 'NOT SET'}")
+    logger.info(f"  EMAIL_ID: {config.recipient or 'NOT SET'}")
+    logger.info(f"  ENABLE_EMAIL_NOTIFICATIONS: {config.notifications_enabled}")
+    logger.info(f"  APP_NAME: {config.app_name}")
+    logger.info(f"  Build ID: {config.build_id or 'NOT SET'}")
+    logger.info(f"  Project ID: {config.project_id}")
+    logger.info("=======================================")
+    
+    args, error_file = error_excerpt.pop_error_file(sys.argv[1:])
+    if len(args) < 3:
+        print("Usage: send_email.py <email_type> <platform> <build_id> [error_message | --error-file PATH|-]")
+        print("Email types: build_started, build_success, build_failed")
+        sys.exit(1)
+    
+    email_type = args[0]
+    platform = args[1]
+    build_id = args[2]
+    error_message = args[3] if len(args) > 3 else "Unknown error occurred"
+    error_log = None
+    if error_file == "-":
+        error_message = error_excerpt.read_excerpt("-")
+    elif error_file:
+        error_log = error_file
+    
+    logger.info(f"Processing email: type={email_type}, platform={platform}, build_id={build_id}")
+    
+    # Check if email notifications are enabled
+    if not config.notifications_enabled:
+        logger.info("Email notifications are disabled. Exiting.")
+        sys.exit(0)
+    
+    # Initialize email notifier
+    try:
+        notifier = QuikAppEmailNotifier()
+        logger.info("Email notifier initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize email notifier: {e}")
+        sys.exit(1)
+    
+    # Send appropriate email
+    success = False
+    try:
+        with notifier:
+            success = send_notification(notifier, email_type, platform, build_id, error_message, error_log)
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Failed to send email: {e}")
+        sys.exit(1)
+    
+    if success:
+        logger.info("✅ Email sent successfully")
+        sys.exit(0)
+    else:
+        logger.error("❌ Failed to send email")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import sys
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from . import outbox
+from . import timing
+from . import profiling
+from . import error_excerpt
+from . import log_attachment
+from . import email_templates
+from . import notify_config
+
+def send_email(subject, html_content, attachments=()):
+    """Send (or spool) the email with any attachments; returns whether it was handed off"""
+    # Email configuration (relays, timeouts and failover come from smtp_session)
+    config = notify_config.load()
+    smtp_user = config.smtp_user
+    smtp_pass = config.smtp_pass
+    recipient = config.recipient
+
+    if not smtp_user or not smtp_pass:
+        print("[send_ios_emails.py] Missing email credentials. Skipping email.")
+        return False
+
+    # Create message
+    with timing.span("mime"):
+        msg = MIMEMultipart('mixed' if attachments else 'alternative')
+        msg['Subject'] = subject
+        msg['From'] = smtp_user
+        msg['To'] = recipient
+        msg.attach(MIMEText(html_content, 'html'))
+        for attachment in attachments:
+            msg.attach(attachment)
+
+    if outbox.is_enabled():
+        outbox.spool(msg, smtp_user, [recipient], source="send_ios_emails.py")
+        outbox.spawn_worker()
+        print(f"[send_ios_emails.py] Email to {recipient} queued for background delivery")
+        return True
+
+    from .smtp_session import SMTPSession
+
+    try:
+        with SMTPSession.from_env() as session:
+            session.send_message(smtp_user, [recipient], msg)
+        print(f"[send_ios_emails.py] Email sent to {recipient}")
+        return True
+    except Exception as e:
+        print(f"[send_ios_emails.py] Failed to send email: {e}")
+        return False
+
+def get_certificate_error_template(error_details, error_log=None):
+    config = notify_config.load()
+    return email_templates.render(
+        "ios_certificate_error.html",
+        app_name=config.app_name,
+        p12_url=config.cert_p12_url or "Not provided",
+        cer_url=config.cert_cer_url or "Not provided",
+        key_url=config.cert_key_url or "Not provided",
+        support_email=config.support_email,
+        error_details=error_excerpt.render_error_details(error_details, error_log, "ios_error_text.html"),
+    )
+
+def get_provisioning_error_template(error_details, error_log=None):
+    config = notify_config.load()
+    return email_templates.render(
+        "ios_provisioning_error.html",
+        app_name=config.app_name,
+        profile_url=config.profile_url or "Not provided",
+        bundle_id=config.bundle_id or "Not provided",
+        profile_type=config.profile_type or "Not provided",
+        support_email=config.support_email,
+        error_details=error_excerpt.render_error_details(error_details, error_log, "ios_error_text.html"),
+    )
+
+def main():
+    """Main function to handle command line arguments"""
+    with profiling.profiled("send_ios_emails"), timing.trace("send_ios_emails") as active:
+        # The exit status stays 0 when sending fails; the trace records it
+        active.attrs["sent"] = _main()
+
+def _main():
+    """Render and send the iOS error email named on the command line"""
+    args, error_file = error_excerpt.pop_error_file(sys.argv[1:])
+    if len(args) < (1 if error_file else 2):
+        print("Usage: send_ios_emails.py <error_type> <error_details | --error-file PATH|->")
+        sys.exit(1)
+
+    error_type = args[0]
+    error_details = args[1] if len(args) > 1 else "See the build log for details"
+    error_log = None
+    if error_file == "-":
+        error_details = error_excerpt.read_excerpt("-")
+    elif error_file:
+        error_log = error_file
+    with timing.span("env"):
+        app_name = notify_config.load().app_name
+
+    with timing.span("render", error_type=error_type):
+        if error_type == "certificates":
+            subject = f"❌ {app_name} - iOS Certificate Error"
+            html_content = get_certificate_error_template(error_details, error_log)
+        elif error_type == "provisioning":
+            subject = f"❌ {app_name} - iOS Provisioning Profile Error"
+            html_content = get_provisioning_error_template(error_details, error_log)
+        else:
+            print(f"[send_ios_emails.py] Unknown error type: {error_type}")
+            sys.exit(1)
+
+    with timing.span("attach"):
+        attachment = log_attachment.build(error_log)
+    return send_email(subject, html_content, [attachment] if attachment is not None else [])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+QuikApp SMTP Session
+Lazily opened, health-checked SMTP connection that is reused across messages.
+
+Every send runs under a total deadline with separate connect/TLS/auth/data budgets,
+walks an ordered list of relays, and skips relays that failed recently (circuit breaker
+state is shared between processes through a small JSON file).
+
+STARTTLS uses one process-wide SSLContext and offers the last TLS session seen for the
+same relay, so reconnects (daemon, outbox worker, batch sends) do abbreviated handshakes.
+Handshake counts and timings are available from tls_stats(), and every phase (connect,
+starttls, auth, data, noop, quit) is a timing span of the notification being sent.
+
+send_message and send_file stream a Message or a spooled message into DATA block by
+block (mime_stream) instead of holding the serialized message in memory.
+
+Environment:
+    EMAIL_SMTP_SERVER / EMAIL_SMTP_PORT   primary relay
+    EMAIL_SMTP_RELAYS                     extra fallback relays, "host:port,host:port"
+    EMAIL_SMTP_DEADLINE                   total seconds per message (default 45)
+    EMAIL_SMTP_CONNECT_TIMEOUT            connect + greeting budget (default 10)
+    EMAIL_SMTP_TLS_TIMEOUT                EHLO + STARTTLS budget (default 10)
+    EMAIL_SMTP_AUTH_TIMEOUT               AUTH budget (default 10)
+    EMAIL_SMTP_DATA_TIMEOUT               MAIL/RCPT/DATA budget (default 30)
+    EMAIL_SMTP_BREAKER_FILE               breaker state (default /tmp/quikapp-smtp-breaker.json)
+    EMAIL_SMTP_BREAKER_COOLDOWN           seconds a failed relay is skipped (default 300)
+"""
+
+import os
+import ssl
+import json
+import time
+import smtplib
+import threading
+import logging
+
+from . import timing
+from . import notify_config
+# Relay list parsing is part of the shared settings; re-exported for the senders
+from .notify_config import parse_relays
+
+logger = logging.getLogger("smtp_session")
+
+# Close the session after this many idle seconds (most relays drop idle clients after ~5 minutes)
+DEFAULT_IDLE_TIMEOUT = 240
+# Sends closer together than this skip the NOOP probe; a failed send still reconnects once
+DEFAULT_PROBE_AFTER = 2.0
+
+DEFAULT_DEADLINE = 45.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_TLS_TIMEOUT = 10.0
+DEFAULT_AUTH_TIMEOUT = 10.0
+DEFAULT_DATA_TIMEOUT = 30.0
+DEFAULT_BREAKER_FILE = "/tmp/quikapp-smtp-breaker.json"
+DEFAULT_BREAKER_COOLDOWN = 300.0
+
+
+_ssl_context = None
+_tls_lock = threading.Lock()
+# Last TLS session per (host, port); offered on the next STARTTLS to that relay
+_tls_sessions = {}
+_tls_stats = {"handshakes": 0, "resumed": 0, "full_seconds": 0.0, "resumed_seconds": 0.0}
+
+
+def get_ssl_context():
+    """Process-wide default SSL context, created once (loading CA certs is the expensive part)"""
+    global _ssl_context
+    with _tls_lock:
+        if _ssl_context is None:
+            _ssl_context = ssl.create_default_context()
+        return _ssl_context
+
+
+def _env_float(env, name, default):
+    """Non-negative number from env[name]; default (with a warning) when it is malformed"""
+    value = env.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        number = -1
+    # "nan" and "inf" parse too; neither is a usable timeout
+    if not 0 <= number < float("inf"):
+        logger.warning(f"⚠️ Ignoring {name}={value!r}, using {default:g}")
+        return default
+    return number
+
+
+def _record_handshake(seconds, resumed):
+    with _tls_lock:
+        _tls_stats["handshakes"] += 1
+        if resumed:
+            _tls_stats["resumed"] += 1
+            _tls_stats["resumed_seconds"] += seconds
+        else:
+            _tls_stats["full_seconds"] += seconds
+
+
+def tls_stats():
+    """Handshake counts and average timings (ms) for this process"""
+    with _tls_lock:
+        stats = dict(_tls_stats)
+    full = stats["handshakes"] - stats["resumed"]
+    return {
+        "handshakes": stats["handshakes"],
+        "resumed": stats["resumed"],
+        "full": full,
+        "avg_full_ms": round(stats["full_seconds"] * 1000 / full, 2) if full else None,
+        "avg_resumed_ms": round(stats["resumed_seconds"] * 1000 / stats["resumed"], 2) if stats["resumed"] else None,
+    }
+
+
+class ResumableSMTP(smtplib.SMTP):
+    """smtplib.SMTP whose STARTTLS uses the shared context and offers a cached TLS session"""
+
+    def starttls(self, keyfile=None, certfile=None, context=None):
+        # Mirrors smtplib.SMTP.starttls, adding session= to wrap_socket
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("starttls"):
+            raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server.")
+        resp, reply = self.docmd("STARTTLS")
+        if resp != 220:
+            raise smtplib.SMTPResponseException(resp, reply)
+
+        relay = (self._host, self.sock.getpeername()[1])
+        started = time.perf_counter()
+        self.sock = (context or get_ssl_context()).wrap_socket(
+            self.sock, server_hostname=self._host, session=_tls_sessions.get(relay))
+        elapsed = time.perf_counter() - started
+        self.tls_resumed = self.sock.session_reused
+        _record_handshake(elapsed, self.tls_resumed)
+        logger.info(f"🔐 TLS handshake with {relay[0]}:{relay[1]} in {elapsed * 1000:.1f} ms"
+                    f"{' (resumed)' if self.tls_resumed else ''}")
+
+        self.file = None
+        self.helo_resp = None
+        self.ehlo_resp = None
+        self.esmtp_features = {}
+        self.does_esmtp = False
+        return resp, reply
+
+    def send_streamed(self, from_addr, to_addrs, write_payload):
+        """smtplib's sendmail, with the DATA payload written by write_payload(fp) instead of passed in whole
+
+        Returns (refused recipients, DATA bytes sent).
+        """
+        from .mime_stream import DataWriter
+
+        self.ehlo_or_helo_if_needed()
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        code, resp = self.mail(from_addr)
+        if code != 250:
+            self.close() if code == 421 else self._rset()
+            raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+        refused = {}
+        for rcpt in to_addrs:
+            code, resp = self.rcpt(rcpt)
+            if code not in (250, 251):
+                refused[rcpt] = (code, resp)
+            if code == 421:
+                self.close()
+                raise smtplib.SMTPRecipientsRefused(refused)
+        if len(refused) == len(to_addrs):
+            self._rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        self.putcmd("data")
+        code, resp = self.getreply()
+        if code != 354:
+            raise smtplib.SMTPDataError(code, resp)
+        # SMTP.send closes the connection and raises SMTPServerDisconnected when a write fails
+        writer = DataWriter(self.send)
+        write_payload(writer)
+        writer.close()
+        code, resp = self.getreply()
+        if code != 250:
+            self.close() if code == 421 else self._rset()
+            raise smtplib.SMTPDataError(code, resp)
+        return refused, writer.bytes
+
+    def remember_tls_session(self):
+        """Cache the session for resumption; TLS 1.3 tickets only arrive after the first reply"""
+        session = getattr(self.sock, "session", None)
+        if session is not None:
+            _tls_sessions[(self._host, self.sock.getpeername()[1])] = session
+
+
+class DeadlineExceeded(smtplib.SMTPException):
+    """The total delivery budget ran out"""
+
+
+class RelaysExhausted(smtplib.SMTPException):
+    """No relay in the list accepted a connection"""
+
+
+class Deadline:
+    """Total time budget shared by every phase of one delivery"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        return self.expires - time.monotonic()
+
+    def budget(self, phase_timeout, phase):
+        """Timeout for the next phase: its own budget, clipped to what is left overall"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Delivery deadline of {self.seconds:.0f}s exceeded before {phase}")
+        return min(phase_timeout, remaining)
+
+
+class CircuitBreaker:
+    """Remembers relay failures across processes so later sends skip a dead relay"""
+
+    def __init__(self, path=DEFAULT_BREAKER_FILE, cooldown=DEFAULT_BREAKER_COOLDOWN):
+        self.path = path
+        self.cooldown = cooldown
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, state):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist SMTP breaker state: {e}")
+
+    def is_open(self, host, port):
+        """True while the relay is inside its cooldown window"""
+        entry = self._load().get(f"{host}:{port}")
+        return bool(entry) and entry.get("open_until", 0) > time.time()
+
+    def record_failure(self, host, port):
+        state = self._load()
+        entry = state.setdefault(f"{host}:{port}", {"failures": 0})
+        entry["failures"] += 1
+        entry["open_until"] = time.time() + self.cooldown
+        self._save(state)
+
+    def record_success(self, host, port):
+        state = self._load()
+        if state.pop(f"{host}:{port}", None) is not None:
+            self._save(state)
+
+
+class DeliveryPolicy:
+    """Deadline and per-phase timeouts for one delivery, plus the shared breaker"""
+
+    def __init__(self, deadline=DEFAULT_DEADLINE, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 tls_timeout=DEFAULT_TLS_TIMEOUT, auth_timeout=DEFAULT_AUTH_TIMEOUT,
+                 data_timeout=DEFAULT_DATA_TIMEOUT, breaker=None):
+        self.deadline = deadline
+        self.connect_timeout = connect_timeout
+        self.tls_timeout = tls_timeout
+        self.auth_timeout = auth_timeout
+        self.data_timeout = data_timeout
+        self.breaker = breaker or CircuitBreaker()
+
+    @classmethod
+    def from_env(cls, env=None):
+        env = os.environ if env is None else env
+        return cls(
+            deadline=_env_float(env, "EMAIL_SMTP_DEADLINE", DEFAULT_DEADLINE),
+            connect_timeout=_env_float(env, "EMAIL_SMTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+            tls_timeout=_env_float(env, "EMAIL_SMTP_TLS_TIMEOUT", DEFAULT_TLS_TIMEOUT),
+            auth_timeout=_env_float(env, "EMAIL_SMTP_AUTH_TIMEOUT", DEFAULT_AUTH_TIMEOUT),
+            data_timeout=_env_float(env, "EMAIL_SMTP_DATA_TIMEOUT", DEFAULT_DATA_TIMEOUT),
+            breaker=CircuitBreaker(
+                env.get("EMAIL_SMTP_BREAKER_FILE") or DEFAULT_BREAKER_FILE,
+                _env_float(env, "EMAIL_SMTP_BREAKER_COOLDOWN", DEFAULT_BREAKER_COOLDOWN),
+            ),
+        )
+
+    def candidates(self, relays):
+        """Relays in order, healthy ones first; tripped relays are only tried as a last resort"""
+        healthy = [r for r in relays if not self.breaker.is_open(*r)]
+        skipped = [r for r in relays if r not in healthy]
+        for host, port in skipped:
+            logger.info(f"⏭️ Skipping {host}:{port}, it failed within the last {self.breaker.cooldown:.0f}s")
+        return healthy + skipped
+
+
+class SMTPSession:
+    """Authenticated SMTP session that reconnects transparently after idle disconnects"""
+
+    def __init__(self, relays, user, password, policy=None, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 probe_after=DEFAULT_PROBE_AFTER):
+        self.relays = [tuple(r) for r in relays]
+        self.user = user
+        self.password = password
+        self.policy = policy or DeliveryPolicy()
+        self.idle_timeout = idle_timeout
+        self.probe_after = probe_after
+        self.relay = None
+        self.connects = 0
+        self.messages = 0
+        self._server = None
+        self._last_used = 0.0
+
+    @classmethod
+    def from_env(cls, env=None, **kwargs):
+        """Session for the EMAIL_SMTP_* settings shared by all senders"""
+        env = os.environ if env is None else env
+        config = notify_config.load(env)
+        return cls(parse_relays(env), config.smtp_user, config.smtp_pass, policy=DeliveryPolicy.from_env(env), **kwargs)
+
+    @property
+    def key(self):
+        """Identity of the relays and credentials this session is bound to"""
+        return (tuple(self.relays), self.user, self.password)
+
+    @property
+    def is_open(self):
+        return self._server is not None
+
+    def _open(self, host, port, deadline):
+        policy = self.policy
+        with timing.span("connect", relay=f"{host}:{port}"):
+            server = ResumableSMTP(host, port, timeout=deadline.budget(policy.connect_timeout, "connect"))
+        try:
+            with timing.span("starttls") as tls:
+                server.sock.settimeout(deadline.budget(policy.tls_timeout, "STARTTLS"))
+                server.starttls()
+                tls["resumed"] = server.tls_resumed
+            with timing.span("auth"):
+                server.sock.settimeout(deadline.budget(policy.auth_timeout, "AUTH"))
+                server.login(self.user, self.password)
+            server.remember_tls_session()
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _connect(self, deadline):
+        """Open a session on the first relay that answers within the deadline"""
+        errors = []
+        for host, port in self.policy.candidates(self.relays):
+            logger.info(f"🔌 Opening SMTP session to {host}:{port}")
+            try:
+                server = self._open(host, port, deadline)
+            except (DeadlineExceeded, smtplib.SMTPAuthenticationError):
+                raise
+            except (smtplib.SMTPException, OSError) as e:
+                self.policy.breaker.record_failure(host, port)
+                errors.append(f"{host}:{port} ({type(e).__name__}: {e})")
+                logger.warning(f"⚠️ Relay {host}:{port} failed: {e}")
+                continue
+            self.policy.breaker.record_success(host, port)
+            self._server = server
+            self.relay = (host, port)
+            self.connects += 1
+            return
+        raise RelaysExhausted(f"All SMTP relays failed: {'; '.join(errors) or 'none configured'}")
+
+    def _is_alive(self):
+        """Probe the session with NOOP"""
+        try:
+            with timing.span("noop"):
+                self._server.sock.settimeout(self.policy.connect_timeout)
+                return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def get(self, deadline=None):
+        """Return a live smtplib.SMTP, opening or replacing the connection as needed"""
+        if self._server is not None:
+            idle = time.monotonic() - self._last_used
+            if idle > self.idle_timeout:
+                self.close()
+            elif idle > self.probe_after and not self._is_alive():
+                logger.info("♻️ SMTP session went stale, reconnecting")
+                self._drop()
+
+        if self._server is None:
+            self._connect(deadline or Deadline(self.policy.deadline))
+
+        self._last_used = time.monotonic()
+        return self._server
+
+    def _send(self, send, size=None):
+        """Run send(server) within the delivery deadline, retrying once (on the next relay) if the connection dies"""
+        deadline = Deadline(self.policy.deadline)
+        for attempt in (1, 2):
+            server = self.get(deadline)
+            server.sock.settimeout(deadline.budget(self.policy.data_timeout, "DATA"))
+            try:
+                with timing.span("data", relay=f"{self.relay[0]}:{self.relay[1]}", bytes=size) as data:
+                    result = send(server)
+                    # Streamed sends also return the DATA size, known only once it is sent
+                    if isinstance(result, tuple):
+                        result, data["bytes"] = result
+            except smtplib.SMTPServerDisconnected:
+                # smtplib reports timeouts and resets as disconnects; the breaker steers the retry elsewhere
+                self.policy.breaker.record_failure(*self.relay)
+                self._drop()
+                if attempt == 2:
+                    raise
+                logger.info("♻️ SMTP session lost during send, retrying on a new connection")
+                continue
+            self._last_used = time.monotonic()
+            self.messages += 1
+            return result
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        """Send a serialized message (str or bytes); returns refused recipients like smtplib"""
+        return self._send(lambda server: server.sendmail(from_addr, to_addrs, msg), len(msg))
+
+    def send_message(self, from_addr, to_addrs, msg):
+        """Send an email.message.Message, generating it straight into the DATA stream"""
+        from . import mime_stream
+        return self._send(lambda server: server.send_streamed(
+            from_addr, to_addrs, lambda fp: mime_stream.write_message(msg, fp)))
+
+    def send_file(self, from_addr, to_addrs, path):
+        """Send a serialized message stored at path (an outbox spool file) without reading it whole"""
+        from . import mime_stream
+        return self._send(lambda server: server.send_streamed(
+            from_addr, to_addrs, lambda fp: mime_stream.write_file(path, fp)))
+
+    def close_if_idle(self):
+        """Drop the session once it has been idle longer than the timeout"""
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            logger.info("💤 Closing idle SMTP session")
+            self.close()
+
+    def _drop(self):
+        """Discard a connection that is already known to be dead"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def close(self):
+        """QUIT and close, ignoring errors from an already dead connection"""
+        if self._server is None:
+            return
+        try:
+            with timing.span("quit"):
+                if self._server.sock is not None:
+                    self._server.sock.settimeout(self.policy.connect_timeout)
+                self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+QuikApp SMTP Sink
+Local SMTP stand-in for benchmarks, load tests and transport testing. Counts delivered
+messages and discards them.
+
+Optionally it behaves like a real relay:
+    STARTTLS     with a given certificate, or a self-signed one for 127.0.0.1 / localhost
+                 (clients trust it through SSL_CERT_FILE); AUTH is then only offered after TLS
+    AUTH         PLAIN and LOGIN, checked against one user and password (any credentials otherwise)
+    latency      fixed delay before every reply, plus uniform random jitter
+    failures     injected per stage with a probability, "stage=rate,...":
+                     connect   421 greeting and hang up
+                     auth      535 authentication failure
+                     data      451 temporary failure after DATA
+                     drop      connection closed in the middle of DATA
+
+STARTTLS needs Python 3.11 (StreamWriter.start_tls).
+
+Usage:
+    python -m quikapp_notify.smtp_sink [--host 127.0.0.1] [--port 2525] [--latency SECONDS] [--jitter SECONDS]
+                                       [--tls | --certfile CERT --keyfile KEY] [--user USER --password PASS]
+                                       [--fail connect=0.01,data=0.05] [--seed N]
+"""
+
+import os
+import sys
+import time
+import random
+import base64
+import asyncio
+import argparse
+import threading
+import subprocess
+import logging
+
+logger = logging.getLogger("smtp_sink")
+
+FAILURE_STAGES = ("connect", "auth", "data", "drop")
+
+
+class SinkError(Exception):
+    """Raised for unusable sink settings"""
+
+
+def parse_failures(spec):
+    """{stage: probability} from "connect=0.01,data=0.05" """
+    failures = {}
+    for entry in filter(None, (e.strip() for e in (spec or "").split(","))):
+        stage, _, rate = entry.partition("=")
+        if stage not in FAILURE_STAGES:
+            raise SinkError(f"Unknown failure stage {stage!r} (expected one of {', '.join(FAILURE_STAGES)})")
+        try:
+            failures[stage] = float(rate)
+        except ValueError:
+            raise SinkError(f"Bad failure rate in {entry!r}") from None
+    return failures
+
+
+def self_signed_cert(directory):
+    """(certfile, keyfile) of a new self-signed certificate for 127.0.0.1 and localhost"""
+    certfile = os.path.join(directory, "smtp-sink-cert.pem")
+    keyfile = os.path.join(directory, "smtp-sink-key.pem")
+    try:
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "2",
+                        "-subj", "/CN=localhost", "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost",
+                        "-keyout", keyfile, "-out", certfile], check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise SinkError(f"Could not create a self-signed certificate with openssl: {e}") from None
+    return certfile, keyfile
+
+
+def tls_context(certfile, keyfile):
+    """Server SSLContext for STARTTLS"""
+    import ssl
+
+    if not hasattr(asyncio.StreamWriter, "start_tls"):
+        raise SinkError("STARTTLS needs Python 3.11 or later")
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+class SMTPSink:
+    """asyncio SMTP server speaking just enough ESMTP for smtplib, smtp_session and async_transport"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, tls_context=None,
+                 credentials=None, failures=None, seed=None):
+        self.host = host
+        self.port = port
+        # Delay before every reply, to imitate a relay's round-trip time, plus up to jitter more
+        self.latency = latency
+        self.jitter = jitter
+        # Offer STARTTLS with this server context; AUTH is then only offered after TLS
+        self.tls_context = tls_context
+        # (user, password) that AUTH must match; None accepts anything
+        self.credentials = credentials
+        # {stage: probability} of an injected failure (FAILURE_STAGES)
+        self.failures = failures or {}
+        self.random = random.Random(seed)
+        self.messages = 0
+        self.bytes_received = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.auth_failures = 0
+        self.injected = dict.fromkeys(FAILURE_STAGES, 0)
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+    def _inject(self, stage):
+        """Whether to fail this stage now; counts the failures it injects"""
+        rate = self.failures.get(stage)
+        if rate and self.random.random() < rate:
+            self.injected[stage] += 1
+            return True
+        return False
+
+    async def _reply(self, writer, line):
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        writer.write(line.encode('ascii') + b'\r\n')
+        await writer.drain()
+
+    def _check(self, user, password):
+        """Whether AUTH credentials are accepted"""
+        if self._inject("auth"):
+            return False
+        ok = self.credentials is None or (user, password) == self.credentials
+        if not ok:
+            self.auth_failures += 1
+        return ok
+
+    async def _auth(self, reader, writer, line):
+        """Run one AUTH PLAIN or LOGIN exchange; returns whether it succeeded"""
+        parts = line.split()
+        mechanism = parts[1].upper() if len(parts) > 1 else b''
+        try:
+            if mechanism == b'PLAIN':
+                if len(parts) < 3:
+                    await self._reply(writer, "334 ")
+                    parts.append((await reader.readline()).strip())
+                _, user, password = base64.b64decode(parts[2]).split(b'\0', 2)
+            elif mechanism == b'LOGIN':
+                if len(parts) < 3:
+                    await self._reply(writer, "334 VXNlcm5hbWU6")
+                    parts.append((await reader.readline()).strip())
+                user = base64.b64decode(parts[2])
+                await self._reply(writer, "334 UGFzc3dvcmQ6")
+                password = base64.b64decode((await reader.readline()).strip())
+            else:
+                await self._reply(writer, "504 5.5.4 Unrecognized authentication type")
+                return False
+        except ValueError:
+            await self._reply(writer, "501 5.5.2 Cannot decode response")
+            return False
+        if not self._check(user.decode('utf-8', 'replace'), password.decode('utf-8', 'replace')):
+            await self._reply(writer, "535 5.7.8 Username and Password not accepted")
+            return False
+        await self._reply(writer, "235 2.7.0 Authentication successful")
+        return True
+
+    async def _read_data(self, reader):
+        size = 0
+        while True:
+            line = await reader.readline()
+            if not line or line == b'.\r\n':
+                return size
+            size += len(line)
+
+    async def handle(self, reader, writer):
+        """Serve one SMTP connection"""
+        self.connections += 1
+        if self._inject("connect"):
+            await self._reply(writer, "421 4.7.0 Try again later, closing connection")
+            writer.close()
+            return
+        await self._reply(writer, "220 quikapp-sink ESMTP ready")
+        secure = False
+        authenticated = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                verb = line.split(b' ', 1)[0].strip().upper()
+
+                if verb == b'EHLO':
+                    if self.tls_context is not None and not secure:
+                        await self._reply(writer, "250-quikapp-sink\r\n250-8BITMIME\r\n250-SIZE 36700160\r\n"
+                                                  "250 STARTTLS")
+                    else:
+                        await self._reply(writer, "250-quikapp-sink\r\n250-8BITMIME\r\n250-SIZE 36700160\r\n"
+                                                  "250 AUTH PLAIN LOGIN")
+                elif verb == b'HELO':
+                    await self._reply(writer, "250 quikapp-sink")
+                elif verb == b'STARTTLS' and self.tls_context is not None and not secure:
+                    await self._reply(writer, "220 2.0.0 Ready to start TLS")
+                    await writer.start_tls(self.tls_context)
+                    self.tls_handshakes += 1
+                    secure = True
+                elif verb == b'AUTH':
+                    if self.tls_context is not None and not secure:
+                        await self._reply(writer, "530 5.7.0 Must issue a STARTTLS command first")
+                    else:
+                        authenticated = await self._auth(reader, writer, line)
+                elif verb in (b'MAIL', b'RCPT') and self.credentials is not None and not authenticated:
+                    await self._reply(writer, "530 5.7.0 Authentication Required")
+                elif verb in (b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                    await self._reply(writer, "250 OK")
+                elif verb == b'DATA':
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    if self._inject("drop"):
+                        break
+                    size = await self._read_data(reader)
+                    if self._inject("data"):
+                        await self._reply(writer, "451 4.3.0 Temporary failure, try again later")
+                        continue
+                    self.bytes_received += size
+                    self.messages += 1
+                    await self._reply(writer, "250 OK queued")
+                elif verb == b'QUIT':
+                    await self._reply(writer, "221 Bye")
+                    break
+                else:
+                    await self._reply(writer, "502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    def stats(self):
+        """Counters of everything the sink has seen"""
+        return {
+            "connections": self.connections,
+            "tls_handshakes": self.tls_handshakes,
+            "messages": self.messages,
+            "bytes_received": self.bytes_received,
+            "auth_failures": self.auth_failures,
+            "injected": {stage: count for stage, count in self.injected.items() if count},
+        }
+
+    async def start(self):
+        """Start listening; fills in self.port when an ephemeral port was requested"""
+        self._server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    def start_in_thread(self):
+        """Run the sink on a background event loop and return its port"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.port
+
+    def stop(self):
+        """Stop a sink started with start_in_thread"""
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+
+
+def main():
+    """Main function to handle command line arguments"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Local SMTP stand-in for QuikApp notification testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before every reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per reply")
+    parser.add_argument("--tls", action="store_true", help="offer STARTTLS with a new self-signed certificate")
+    parser.add_argument("--certfile", help="offer STARTTLS with this certificate")
+    parser.add_argument("--keyfile", help="key of --certfile")
+    parser.add_argument("--user", help="accept only this AUTH user")
+    parser.add_argument("--password", default="", help="password of --user")
+    parser.add_argument("--fail", default="", help="injected failures, e.g. connect=0.01,data=0.05")
+    parser.add_argument("--seed", type=int, help="seed for jitter and failure injection")
+    args = parser.parse_args()
+
+    import tempfile
+
+    try:
+        failures = parse_failures(args.fail)
+        context = None
+        if args.tls or args.certfile:
+            certfile, keyfile = args.certfile, args.keyfile or args.certfile
+            if not certfile:
+                certfile, keyfile = self_signed_cert(tempfile.mkdtemp(prefix="quikapp-sink-"))
+                logger.info(f"🔐 Self-signed certificate: {certfile} (export SSL_CERT_FILE={certfile})")
+            context = tls_context(certfile, keyfile)
+    except (SinkError, OSError) as e:
+        logger.error(f"❌ {e}")
+        return 1
+
+    credentials = (args.user, args.password) if args.user else None
+    sink = SMTPSink(args.host, args.port, args.latency, args.jitter, context, credentials, failures, args.seed)
+    sink.start_in_thread()
+    logger.info(f"📭 SMTP sink listening on {args.host}:{sink.port}")
+    try:
+        while True:
+            time.sleep(10)
+            logger.info(f"Received {sink.messages} messages over {sink.connections} connections: {sink.stats()}")
+    except KeyboardInterrupt:
+        sink.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
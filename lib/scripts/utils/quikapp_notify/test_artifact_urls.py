@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script to debug artifact URL resolution
+Shows which CM_ARTIFACT_LINKS entry each local artifact is matched to, exactly as
+send_email.py resolves the download buttons, and whether each link answers.
+"""
+
+import os
+import sys
+
+from . import artifacts
+from . import artifact_links
+from . import checksums
+from . import link_check
+from . import notify_config
+
+def test_artifact_urls():
+    print("=== Artifact URL Debug Test ===")
+
+    # Settings as every sender sees them (environment, then lib/config/env.sh)
+    config = notify_config.load()
+    print("\n📋 Settings:")
+    print(f"  Build ID: {config.build_id or 'NOT SET'}")
+    print(f"  Project ID: {config.project_id}")
+    print(f"  QUIKAPP_ARTIFACT_DIR: {os.environ.get('QUIKAPP_ARTIFACT_DIR', 'NOT SET')}")
+
+    # Uploaded artifacts as Codemagic reports them
+    links = artifact_links.parse_links(os.environ.get("CM_ARTIFACT_LINKS", ""))
+    print(f"\n🔗 CM_ARTIFACT_LINKS: {len(links)} entries")
+    for entry in links:
+        url, source = artifact_links.link_url(entry)
+        print(f"  {entry.get('name')}: {url or 'no URL'} ({source or '-'})")
+
+    # Local artifacts and the link each one resolves to
+    print("\n📁 Local Artifacts:")
+    found = artifacts.discover_from_env(os.environ)
+    output_dir = artifacts.output_dir(os.environ)
+    artifact_links.resolve(found, os.environ.get("CM_ARTIFACT_LINKS", ""),
+                           os.path.join(output_dir, checksums.MANIFEST_NAME))
+    status = link_check.check_urls([a['download_url'] for a in found if a['download_url']],
+                                   budget=link_check.budget_from_env() or link_check.DEFAULT_BUDGET)
+    for artifact in found:
+        if artifact['download_url']:
+            ok, detail = status[artifact['download_url']]
+            print(f"  {'✅' if ok is not False else '❌'} {artifact['path']} ({artifact['bytes']} bytes) -> "
+                  f"{artifact['download_url']} [{artifact['link_source']}, HTTP {detail}]")
+        else:
+            print(f"  ❌ {artifact['path']} ({artifact['bytes']} bytes) -> no upload found, build page link")
+    if not found:
+        print(f"  No artifacts in {output_dir}")
+
+    # Test Codemagic build URL
+    print(f"\n📱 Codemagic Build URL: https://codemagic.io/builds/{config.build_id or 'unknown'}")
+
+    print("\n=== End Debug Test ===")
+
+def main():
+    """Main function to handle command line arguments"""
+    test_artifact_urls()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
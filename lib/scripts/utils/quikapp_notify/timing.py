@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+QuikApp Notify Timing
+Timing spans for the notification hot path, so a slow notification shows whether the relay,
+TLS or our own rendering took the time.
+
+A trace covers one notification (or one outbox delivery); spans inside it time its phases:
+    env         notify_config.load
+    scan        artifact discovery and inspection (success emails)
+    render      templates; holds checksums and link_check for the artifact cards
+    attach      compressing the build log for attachment (failure emails, log_attachment)
+    mime        building the MIME message
+    spool       serializing it into the outbox instead of sending
+    connect     DNS, TCP connect and greeting
+    starttls    EHLO and the TLS handshake (resumed or full)
+    auth        AUTH
+    data        MAIL, RCPT and DATA, with the message serialized into the DATA stream
+    noop, quit  health probe of a reused session, QUIT
+When the trace ends it is logged as one line ("⏱️ send_email 412.3ms: env 0.2ms · render 9.8ms ...")
+and, when configured, written out:
+    QUIKAPP_TIMING_FILE   append one JSON object per span (and one "total" per trace); "-" for stderr
+    QUIKAPP_TIMING_PROM   Prometheus textfile (node_exporter textfile collector) with the last
+                          run of every sender, merged with what other senders wrote there
+Spans outside a trace are not recorded.
+
+Usage:
+    python -m quikapp_notify.timing <spans.jsonl>   # count, median, p95 and max per sender and phase
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import fcntl
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger("timing")
+
+# Prometheus metrics written to the textfile, with their HELP text
+METRICS = {
+    "quikapp_notify_phase_seconds": "Time spent in each phase of the last notification",
+    "quikapp_notify_duration_seconds": "Total time of the last notification",
+    "quikapp_notify_success": "Whether the last notification succeeded",
+    "quikapp_notify_last_run_timestamp_seconds": "When the last notification finished",
+}
+
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})? (\S+)$')
+_SENDER_RE = re.compile(r'sender="((?:[^"\\]|\\.)*)"')
+
+_local = threading.local()
+
+
+class Trace:
+    """Spans of one notification"""
+
+    __slots__ = ("sender", "attrs", "id", "wall", "started", "spans", "stack")
+
+    def __init__(self, sender, attrs):
+        self.sender = sender
+        self.attrs = attrs
+        self.id = f"{time.strftime('%Y%m%d%H%M%S')}-{os.urandom(4).hex()}"
+        self.wall = time.time()
+        self.started = time.perf_counter()
+        # (phase, parent phase, wall start, milliseconds, error, attrs) in completion order
+        self.spans = []
+        # Phases of the spans currently open, innermost last
+        self.stack = []
+
+    def phases(self):
+        """{phase: total milliseconds} in the order the phases first finished"""
+        totals = {}
+        for phase, _, _, ms, _, _ in self.spans:
+            totals[phase] = totals.get(phase, 0.0) + ms
+        return totals
+
+
+def current():
+    """The trace open on this thread, or None"""
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def trace(sender, env=None, **attrs):
+    """Collect the spans of one notification and emit them when it ends
+
+    Inside an open trace this only adds attrs to it, so callers can open a trace
+    around code that opens one itself. A trace ending with attrs["sent"] False failed.
+    """
+    outer = current()
+    if outer is not None:
+        outer.attrs.update(attrs)
+        yield outer
+        return
+    active = Trace(sender, attrs)
+    _local.trace = active
+    error = None
+    try:
+        yield active
+    except SystemExit as e:
+        if e.code:
+            error = f"exit {e.code}"
+        raise
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _local.trace = None
+        total = (time.perf_counter() - active.started) * 1000
+        if error is None and active.attrs.get("sent") is False:
+            error = "not sent"
+        try:
+            emit(active, total, error, os.environ if env is None else env)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write timing data: {e}")
+
+
+@contextmanager
+def span(phase, **attrs):
+    """Time one phase of the open trace; the yielded dict takes attributes known only later"""
+    active = current()
+    if active is None:
+        yield attrs
+        return
+    parent = active.stack[-1] if active.stack else None
+    active.stack.append(phase)
+    wall = time.time()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        active.stack.pop()
+        active.spans.append((phase, parent, wall, (time.perf_counter() - started) * 1000, error, attrs))
+
+
+def _records(active, total, error):
+    """JSON-serializable span records of a finished trace, the trace total last"""
+    base = {"trace": active.id, "sender": active.sender, "pid": os.getpid()}
+    records = []
+    for phase, parent, wall, ms, span_error, attrs in active.spans:
+        record = dict(base, phase=phase, parent=parent, ts=round(wall, 3), ms=round(ms, 3), ok=span_error is None)
+        if span_error:
+            record["error"] = span_error
+        record.update(attrs)
+        records.append(record)
+    record = dict(base, phase="total", parent=None, ts=round(active.wall, 3), ms=round(total, 3), ok=error is None)
+    if error:
+        record["error"] = error
+    record.update(active.attrs)
+    records.append(record)
+    return records
+
+
+def _prom_escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def write_prom(path, active, total, error):
+    """Replace this sender's samples in the textfile, keeping every other sender's"""
+    sender = _prom_escape(active.sender)
+    labels = f'sender="{sender}"'
+    ours = [("quikapp_notify_phase_seconds", f'{{{labels},phase="{_prom_escape(phase)}"}}', round(ms / 1000, 6))
+            for phase, ms in active.phases().items()]
+    ours += [
+        ("quikapp_notify_duration_seconds", f"{{{labels}}}", round(total / 1000, 6)),
+        ("quikapp_notify_success", f"{{{labels}}}", 0 if error else 1),
+        ("quikapp_notify_last_run_timestamp_seconds", f"{{{labels}}}", round(time.time(), 3)),
+    ]
+
+    # Senders run in separate processes; the lock keeps their read-modify-write from interleaving
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        samples = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    match = _SAMPLE_RE.match(line.strip())
+                    if match and match.group(1) in METRICS:
+                        other = _SENDER_RE.search(match.group(2) or "")
+                        if not other or other.group(1) != sender:
+                            samples.append((match.group(1), match.group(2) or "", match.group(3)))
+        except FileNotFoundError:
+            pass
+        samples += [(name, label_set, repr(value)) for name, label_set, value in ours]
+
+        lines = []
+        for name, help_text in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{label_set} {value}" for sample, label_set, value in samples if sample == name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+
+def emit(active, total, error, env):
+    """Log the summary line and write the configured JSON lines and Prometheus outputs"""
+    phases = " · ".join(f"{phase} {ms:.1f}ms" for phase, ms in active.phases().items())
+    logger.info(f"⏱️ {active.sender} {total:.1f}ms{' (' + error + ')' if error else ''}: {phases or 'no phases'}")
+
+    path = env.get("QUIKAPP_TIMING_FILE")
+    if path:
+        data = "".join(json.dumps(record, default=str) + "\n" for record in _records(active, total, error))
+        if path == "-":
+            sys.stderr.write(data)
+        else:
+            # One append per trace, so concurrent senders never interleave inside a line
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(data)
+
+    prom_path = env.get("QUIKAPP_TIMING_PROM")
+    if prom_path:
+        write_prom(prom_path, active, total, error)
+
+
+def summarize(path):
+    """{(sender, phase): {count, median_ms, p95_ms, max_ms}} over the traces in a JSON lines file"""
+    import statistics
+
+    # Phase totals per trace first, so a phase timed twice in one notification counts once
+    per_trace = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            key = (record.get("trace"), record.get("sender"), record.get("phase"))
+            per_trace[key] = per_trace.get(key, 0.0) + record.get("ms", 0.0)
+    durations = {}
+    for (_, sender, phase), ms in per_trace.items():
+        durations.setdefault((sender, phase), []).append(ms)
+    summary = {}
+    for key, values in durations.items():
+        values.sort()
+        summary[key] = {
+            "count": len(values),
+            "median_ms": statistics.median(values),
+            "p95_ms": values[min(len(values) - 1, int(len(values) * 0.95))],
+            "max_ms": values[-1],
+        }
+    return summary
+
+
+def main():
+    """Main function to handle command line arguments"""
+    if len(sys.argv) != 2:
+        print("Usage: python -m quikapp_notify.timing <spans.jsonl>")
+        return 1
+    try:
+        summary = summarize(sys.argv[1])
+    except OSError as e:
+        print(f"Cannot read {sys.argv[1]}: {e}")
+        return 1
+    print(f"{'sender':<16}{'phase':<12}{'count':>7}{'median ms':>11}{'p95 ms':>10}{'max ms':>10}")
+    for (sender, phase), row in sorted(summary.items(), key=lambda item: (str(item[0][0]), item[0][1] != "total",
+                                                                          -item[1]["median_ms"])):
+        print(f"{sender:<16}{phase:<12}{row['count']:>7}{row['median_ms']:>11.1f}{row['p95_ms']:>10.1f}"
+              f"{row['max_ms']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,39 +16,41 @@ fi
 STATUS=$1
 MESSAGE=$2
 
-# Email configuration with provided Gmail credentials
-EMAIL_SMTP_SERVER="smtp.gmail.com"
-EMAIL_SMTP_PORT="587"
-EMAIL_SMTP_USER="prasannasrie@gmail.com"
-EMAIL_SMTP_PASS="lrnu krfm aarp urux"
-EMAIL_ID=${EMAIL_ID:-"prasannasrie@gmail.com"}  # Default to sender if not set
-ENABLE_EMAIL_NOTIFICATIONS=${ENABLE_EMAIL_NOTIFICATIONS:-"true"}  # Enable by default
-
-# App Information
-APP_NAME=${APP_NAME:-"Unknown App"}
-ORG_NAME=${ORG_NAME:-"Unknown Organization"}
-VERSION_NAME=${VERSION_NAME:-"1.0.0"}
-VERSION_CODE=${VERSION_CODE:-"1"}
-PKG_NAME=${PKG_NAME:-}
-BUNDLE_ID=${BUNDLE_ID:-}
-USER_NAME=${USER_NAME:-"Unknown User"}
-
-# Feature Flags
-PUSH_NOTIFY=${PUSH_NOTIFY:-"false"}
-IS_CHATBOT=${IS_CHATBOT:-"false"}
-IS_DOMAIN_URL=${IS_DOMAIN_URL:-"false"}
-IS_SPLASH=${IS_SPLASH:-"false"}
-IS_PULLDOWN=${IS_PULLDOWN:-"false"}
-IS_BOTTOMMENU=${IS_BOTTOMMENU:-"false"}
-IS_LOAD_IND=${IS_LOAD_IND:-"false"}
-IS_CAMERA=${IS_CAMERA:-"false"}
-IS_LOCATION=${IS_LOCATION:-"false"}
-IS_MIC=${IS_MIC:-"false"}
-IS_NOTIFICATION=${IS_NOTIFICATION:-"false"}
-IS_CONTACT=${IS_CONTACT:-"false"}
-IS_BIOMETRIC=${IS_BIOMETRIC:-"false"}
-IS_CALENDAR=${IS_CALENDAR:-"false"}
-IS_STORAGE=${IS_STORAGE:-"false"}
+# Notification settings shared with the Python senders: the environment first, then
+# lib/config/env.sh (see quikapp_notify/notify_config.py); only settings that are set are exported
+UTILS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# The Python senders are the quikapp_notify package in lib/scripts/utils. They run from the
+# zipapp (precompiled modules and templates) while it is newer than every package file;
+# otherwise from the package, with the zipapp rebuilt in the background for the next call.
+NOTIFY_DIR="$UTILS_DIR"
+[ -d "${NOTIFY_DIR}/quikapp_notify" ] || NOTIFY_DIR="$(cd "${UTILS_DIR}/../../lib/scripts/utils" && pwd)"
+NOTIFY_PYZ="${QUIKAPP_NOTIFY_PYZ:-${NOTIFY_DIR}/quikapp-notify.pyz}"
+quikapp_notify() {
+    if [ -f "$NOTIFY_PYZ" ] && [ -z "$(find "${NOTIFY_DIR}/quikapp_notify" \( -name '*.py' -o -name '*.html' \) -newer "$NOTIFY_PYZ" -print -quit 2>/dev/null)" ]; then
+        python3 "$NOTIFY_PYZ" "$@"
+        return
+    fi
+    if [ "${QUIKAPP_NOTIFY_ZIPAPP:-true}" != "false" ]; then
+        (PYTHONPATH="$NOTIFY_DIR" python3 -m quikapp_notify build_zipapp "$NOTIFY_PYZ" >/dev/null 2>&1 &)
+    fi
+    PYTHONPATH="${NOTIFY_DIR}${PYTHONPATH:+:${PYTHONPATH}}" python3 -m quikapp_notify "$@"
+}
+
+if command -v python3 >/dev/null 2>&1 && NOTIFY_CONFIG="$(quikapp_notify notify_config --shell)"; then
+    eval "$NOTIFY_CONFIG"
+else
+    echo "⚠️  quikapp_notify unavailable, using the environment as is"
+fi
+# Unset settings are empty (set -u), except the SMTP relay, which keeps the Python senders' default
+EMAIL_SMTP_SERVER=${EMAIL_SMTP_SERVER:-smtp.gmail.com}
+EMAIL_SMTP_PORT=${EMAIL_SMTP_PORT:-587}
+for var in EMAIL_SMTP_SERVER EMAIL_SMTP_PORT EMAIL_SMTP_USER EMAIL_SMTP_PASS EMAIL_ID ENABLE_EMAIL_NOTIFICATIONS \
+           APP_NAME ORG_NAME VERSION_NAME VERSION_CODE PKG_NAME BUNDLE_ID USER_NAME WEB_URL \
+           PUSH_NOTIFY IS_CHATBOT IS_DOMAIN_URL IS_SPLASH IS_PULLDOWN IS_BOTTOMMENU IS_LOAD_IND \
+           IS_CAMERA IS_LOCATION IS_MIC IS_NOTIFICATION IS_CONTACT IS_BIOMETRIC IS_CALENDAR IS_STORAGE; do
+    export "$var=${!var:-}"
+done
 
 # Build info
 BUILD_DATE=$(date '+%Y-%m-%d %H:%M:%S')
@@ -738,8 +740,22 @@ send_notification_email() {
         export IS_CAMERA IS_LOCATION IS_MIC IS_NOTIFICATION IS_CONTACT IS_BIOMETRIC IS_CALENDAR IS_STORAGE
         export PKG_NAME BUNDLE_ID
         
-        # Run the Python email script
-        if python3 lib/scripts/utils/send_email.py "$email_type" "$platform" "$build_id" "$error_message"; then
+        # Hand off to the persistent notifier daemon when one is listening
+        local email_command="send_email"
+        if [ -S "${QUIKAPP_NOTIFY_SOCKET:-/tmp/quikapp-notify.sock}" ]; then
+            log "📡 Notification daemon detected, using fast client"
+            export QUIKAPP_NOTIFY_SOCKET QUIKAPP_NOTIFY_WAIT
+            email_command="notify_client"
+        fi
+        
+        # Pass extra arguments through so callers can use --error-file PATH (or - for stdin)
+        local extra_args=("$error_message")
+        if [ $# -gt 3 ]; then
+            extra_args=("${@:4}")
+        fi
+        
+        # Run the Python email sender
+        if quikapp_notify "$email_command" "$email_type" "$platform" "$build_id" "${extra_args[@]}"; then
             log "✅ Enhanced Python email sent successfully"
             return 0
         else
@@ -798,7 +814,7 @@ EOF
 # If script is called directly
 if [ "${BASH_SOURCE[0]}" == "${0}" ]; then
     if [ $# -lt 3 ]; then
-        echo "Usage: $0 <email_type> <platform> <build_id> [error_message]"
+        echo "Usage: $0 <email_type> <platform> <build_id> [error_message | --error-file PATH|-]"
         echo "Email types: build_started, build_success, build_failed"
         exit 1
     fi
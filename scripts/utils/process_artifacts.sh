@@ -15,14 +15,19 @@ else
     log "Environment configuration file not found, using system environment variables"
 fi
 
+# Directory of this file, also when it is sourced from another script, and of the
+# quikapp_notify package (lib/scripts/utils)
+ARTIFACTS_UTILS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+ARTIFACTS_NOTIFY_DIR="$ARTIFACTS_UTILS_DIR"
+[ -d "${ARTIFACTS_NOTIFY_DIR}/quikapp_notify" ] || ARTIFACTS_NOTIFY_DIR="$(cd "${ARTIFACTS_UTILS_DIR}/../../lib/scripts/utils" && pwd)"
+
 # process_artifacts: Processes Codemagic artifact links to generate download URLs
 #
 # This function reads the CM_ARTIFACT_LINKS environment variable, which contains
-# a JSON array of artifact objects. It uses `jq` to parse this JSON and extract
-# the public-facing download URL for each artifact.
-#
-# The URLs are then formatted into a single string, separated by newlines,
-# which can be passed to the email notification script.
+# a JSON array of artifact objects, and prints one download URL per artifact.
+# The JSON is parsed by quikapp_notify.artifact_links in a single python run (the
+# same code send_email uses for its download cards), which prefers each artifact's
+# non-expiring public_url over its private, expiring url.
 #
 # If CM_ARTIFACT_LINKS is not set or is empty, it logs a warning and returns
 # a "Not available" message.
@@ -40,26 +45,12 @@ process_artifacts() {
 
     log "Raw artifact JSON: $CM_ARTIFACT_LINKS"
 
-    # Try to extract public URLs first. These are non-expiring and accessible without login.
-    local public_urls
-    public_urls=$(echo "$CM_ARTIFACT_LINKS" | jq -r '.[] | .public_url | select(.)')
-
-    if [[ -n "$public_urls" ]]; then
-        log "Successfully extracted public artifact URLs."
-        export ARTIFACT_URLS="$public_urls"
-    else
-        # If no public URLs are found, fall back to private URLs and issue a warning.
-        log "WARNING: No public artifact URLs found. Falling back to private, expiring URLs."
-        log "         This will result in 'FORBIDDEN' errors when accessing links from email without being logged into Codemagic."
-        log "         To enable public links, a team admin must follow the guide at: docs/enabling_public_artifact_urls.md"
-        
-        local private_urls
-        private_urls=$(echo "$CM_ARTIFACT_LINKS" | jq -r '.[] | .url | select(.)')
-        export ARTIFACT_URLS="$private_urls"
-    fi
+    # Warnings about private URLs go to stderr; stdout is the URL list
+    ARTIFACT_URLS=$(PYTHONPATH="${ARTIFACTS_NOTIFY_DIR}${PYTHONPATH:+:${PYTHONPATH}}" python3 -m quikapp_notify.artifact_links)
+    export ARTIFACT_URLS
 
     # Final check to see if any URLs were found at all.
-    if [[ -z "$ARTIFACT_URLS" ]]; then
+    if [[ -z "$ARTIFACT_URLS" || "$ARTIFACT_URLS" == "Artifacts not available." ]]; then
         log "No artifact URLs could be parsed from the CM_ARTIFACT_LINKS variable. No artifacts to process."
         return 0
     fi
@@ -72,4 +63,4 @@ process_artifacts() {
 
     # Return the newline-separated list of URLs
     echo "$ARTIFACT_URLS"
-} 
\ No newline at end of file
+} 